@@ -4,6 +4,7 @@ from app.shared.container import container
 from app.shared.interfaces.file_storage import FileStorageInterface
 from app.shared.interfaces.authentication import AuthenticationInterface
 from app.shared.interfaces.task_queue import TaskQueueInterface
+from app.shared.interfaces.unit_of_work import UnitOfWorkInterface
 from app.domain.repositories.player_repository import PlayerRepositoryInterface
 from app.domain.repositories.video_repository import VideoRepositoryInterface
 from app.domain.repositories.vote_repository import VoteRepositoryInterface
@@ -17,41 +18,117 @@ def configure_container():
     if settings.FILE_STORAGE_TYPE == FileStorageType.LOCAL:
         from app.infrastructure.external_services.local_file_storage import LocalFileStorage
         # Crear instancia con parámetros y registrar
-        local_instance = LocalFileStorage(settings.UPLOAD_DIR)
+        local_instance = LocalFileStorage(settings.UPLOAD_DIR, chunk_size=settings.UPLOAD_CHUNK_SIZE)
         container._services[FileStorageInterface.__name__] = (lambda: local_instance, True)
         container._singletons[FileStorageInterface.__name__] = local_instance
     elif settings.FILE_STORAGE_TYPE == FileStorageType.S3:
         from app.infrastructure.external_services.s3_file_storage import S3FileStorage
+        from app.infrastructure.external_services.async_s3_file_storage import AsyncS3FileStorage
         # Crear instancia con parámetros requeridos y registrar
         # Si hay credenciales en .env, las usa (AWS Academy)
         # Si NO hay credenciales, usa IAM Role de la instancia EC2 (producción)
-        s3_instance = S3FileStorage(
+        s3_options = {}
+        s3_class = S3FileStorage
+        if settings.S3_ASYNC_CLIENT:
+            # Cliente no bloqueante: boto3 en un pool de threads con conexiones compartidas
+            s3_class = AsyncS3FileStorage
+            s3_options["max_workers"] = settings.S3_IO_MAX_WORKERS
+        s3_instance = s3_class(
             bucket_name=settings.S3_BUCKET_NAME,
             region=settings.AWS_REGION,
             access_key=settings.AWS_ACCESS_KEY_ID if settings.AWS_ACCESS_KEY_ID else None,
             secret_key=settings.AWS_SECRET_ACCESS_KEY if settings.AWS_SECRET_ACCESS_KEY else None,
-            session_token=settings.AWS_SESSION_TOKEN if settings.AWS_SESSION_TOKEN else None
+            session_token=settings.AWS_SESSION_TOKEN if settings.AWS_SESSION_TOKEN else None,
+            download_mode=settings.S3_DOWNLOAD_MODE,
+            presigned_expiration=settings.S3_PRESIGNED_URL_EXPIRATION,
+            part_size=settings.S3_MULTIPART_PART_SIZE,
+            upload_concurrency=settings.S3_MULTIPART_CONCURRENCY,
+            endpoint_url=settings.S3_ENDPOINT_URL if settings.S3_ENDPOINT_URL else None,
+            **s3_options
         )
         container._services[FileStorageInterface.__name__] = (lambda: s3_instance, True)
         container._singletons[FileStorageInterface.__name__] = s3_instance
     
     # Configurar autenticación
     from app.infrastructure.external_services.jwt_auth_service import JWTAuthService
-    container.register_singleton(AuthenticationInterface, JWTAuthService)
+    password_hasher = None
+    if settings.PASSWORD_HASH_WORKERS > 0:
+        # bcrypt en un pool acotado: un login no bloquea el event loop
+        from app.infrastructure.external_services.password_hasher import PasswordHasher
+        password_hasher = PasswordHasher(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            executor_type=settings.PASSWORD_HASH_EXECUTOR
+        )
+        container._services[PasswordHasher.__name__] = (lambda: password_hasher, True)
+        container._singletons[PasswordHasher.__name__] = password_hasher
+    auth_instance = JWTAuthService(password_hasher=password_hasher)
+    container._services[AuthenticationInterface.__name__] = (lambda: auth_instance, True)
+    container._singletons[AuthenticationInterface.__name__] = auth_instance
     
     # Configurar cola de tareas
     from app.infrastructure.external_services.celery_client import CeleryTaskQueue
     container.register_singleton(TaskQueueInterface, CeleryTaskQueue)
     
     
+    # Configurar unidad de trabajo (sesión compartida por los repositorios durante el request)
+    from app.infrastructure.database.unit_of_work import SqlAlchemyUnitOfWork
+    container.register_singleton(UnitOfWorkInterface, SqlAlchemyUnitOfWork)
+
     # Configurar repositorios
-    from app.infrastructure.repositories.player_repository import PlayerRepository
-    from app.infrastructure.repositories.video_repository import VideoRepository
-    from app.infrastructure.repositories.vote_repository import VoteRepository
-    
-    container.register_singleton(PlayerRepositoryInterface, PlayerRepository)
-    container.register_singleton(VideoRepositoryInterface, VideoRepository)
-    container.register_singleton(VoteRepositoryInterface, VoteRepository)
+    if settings.DATABASE_ASYNC:
+        # AsyncSession + asyncpg: las consultas no bloquean el event loop
+        from app.infrastructure.repositories.async_player_repository import AsyncPlayerRepository
+        from app.infrastructure.repositories.async_video_repository import AsyncVideoRepository
+        from app.infrastructure.repositories.async_vote_repository import AsyncVoteRepository
+
+        container.register_singleton(PlayerRepositoryInterface, AsyncPlayerRepository)
+        container.register_singleton(VideoRepositoryInterface, AsyncVideoRepository)
+        container.register_singleton(VoteRepositoryInterface, AsyncVoteRepository)
+    else:
+        from app.infrastructure.repositories.player_repository import PlayerRepository
+        from app.infrastructure.repositories.video_repository import VideoRepository
+        from app.infrastructure.repositories.vote_repository import VoteRepository
+
+        container.register_singleton(PlayerRepositoryInterface, PlayerRepository)
+        container.register_singleton(VideoRepositoryInterface, VideoRepository)
+        container.register_singleton(VoteRepositoryInterface, VoteRepository)
+
+
+    # Configurar caché de autenticación (tokens verificados y jugadores activos, por proceso)
+    if settings.AUTH_CACHE_ENABLED:
+        from app.services.auth_cache_service import AuthCacheService
+        auth_cache_instance = AuthCacheService(
+            max_size=settings.AUTH_CACHE_MAX_SIZE,
+            ttl=settings.AUTH_CACHE_TTL_SECONDS
+        )
+        container._services[AuthCacheService.__name__] = (lambda: auth_cache_instance, True)
+        container._singletons[AuthCacheService.__name__] = auth_cache_instance
+
+    # Configurar ranking en memoria (una instancia por proceso)
+    if settings.LEADERBOARD_ENABLED:
+        from app.services.leaderboard_service import LeaderboardService
+        leaderboard_instance = LeaderboardService(
+            player_repository=container.get(PlayerRepositoryInterface),
+            refresh_interval=settings.LEADERBOARD_REFRESH_SECONDS,
+            max_staleness=settings.LEADERBOARD_MAX_STALENESS_SECONDS
+        )
+        container._services[LeaderboardService.__name__] = (lambda: leaderboard_instance, True)
+        container._singletons[LeaderboardService.__name__] = leaderboard_instance
+
+    # Configurar buffer de votos (escritura diferida en lotes, una instancia por proceso)
+    if settings.VOTE_BUFFER_ENABLED:
+        from app.services.vote_buffer_service import VoteBufferService
+        vote_buffer_instance = VoteBufferService(
+            vote_repository=container.get(VoteRepositoryInterface),
+            video_repository=container.get(VideoRepositoryInterface),
+            flush_interval=settings.VOTE_BUFFER_FLUSH_MS / 1000,
+            max_batch=settings.VOTE_BUFFER_MAX_BATCH,
+            durable=settings.VOTE_BUFFER_DURABLE,
+            dedupe_size=settings.VOTE_BUFFER_DEDUPE_SIZE,
+            leaderboard=container.get_leaderboard_service()
+        )
+        container._services[VoteBufferService.__name__] = (lambda: vote_buffer_instance, True)
+        container._singletons[VoteBufferService.__name__] = vote_buffer_instance
 
 
 # Configurar el contenedor al importar el módulo
@@ -0,0 +1,36 @@
+from dataclasses import dataclass
+from typing import Optional
+from app.domain.entities.player import Player
+
+
+@dataclass
+class PlayerScore:
+    """Entidad de dominio para la posición de un jugador en el ranking"""
+    
+    player: Player
+    total_votes: int = 0
+    position: Optional[int] = None
+    
+    def __post_init__(self):
+        """Validaciones después de la inicialización"""
+        if self.total_votes < 0:
+            raise ValueError("El total de votos no puede ser negativo")
+    
+    def rank_key(self) -> tuple:
+        """Clave de orden del ranking: votos descendente, player_id como desempate"""
+        return (-self.total_votes, self.player_id)
+    
+    @property
+    def player_id(self) -> int:
+        """ID del jugador"""
+        return self.player.id
+    
+    @property
+    def username(self) -> str:
+        """Username del jugador"""
+        return self.player.username
+    
+    @property
+    def city(self) -> str:
+        """Ciudad del jugador"""
+        return self.player.city
@@ -22,6 +22,7 @@ class Video:
     processed_url: Optional[str] = None
     uploaded_at: Optional[datetime] = None
     processed_at: Optional[datetime] = None
+    votes_count: int = 0
     
     def __post_init__(self):
         """Validaciones después de la inicialización"""
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from app.domain.entities.player import Player
+from app.domain.entities.player_score import PlayerScore
 from app.domain.value_objects.email import Email
 
 
@@ -33,6 +34,29 @@ class PlayerRepositoryInterface(ABC):
         pass
     
     @abstractmethod
-    async def get_rankings(self, city: Optional[str] = None) -> List[Player]:
-        """Obtiene el ranking de jugadores"""
+    async def get_rankings(
+        self,
+        city: Optional[str] = None,
+        limit: Optional[int] = 100,
+        after: Optional[Tuple[int, int]] = None
+    ) -> List[PlayerScore]:
+        """
+        Obtiene el ranking de jugadores ordenado por votos (descendente); limit=None trae todos.
+        after=(total_votes, player_id) retorna las posiciones siguientes a esa fila (keyset).
+        """
+        pass
+    
+    @abstractmethod
+    async def get_rankings_from_votes(self, city: Optional[str] = None, limit: Optional[int] = None) -> List[PlayerScore]:
+        """Calcula el ranking agregando los votos en una sola consulta (sin la tabla materializada)"""
+        pass
+    
+    @abstractmethod
+    async def sync_scores_from_votes(self) -> int:
+        """Corrige la tabla materializada del ranking desde el conteo de votos; retorna las filas corregidas"""
+        pass
+    
+    @abstractmethod
+    async def get_player_rank(self, player_id: int, city: Optional[str] = None) -> Optional[PlayerScore]:
+        """Obtiene la posición de un jugador en el ranking sin materializar la lista"""
         pass
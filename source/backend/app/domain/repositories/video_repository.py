@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 from app.domain.entities.video import Video
 
 
@@ -22,8 +23,21 @@ class VideoRepositoryInterface(ABC):
         pass
     
     @abstractmethod
-    async def get_public_videos(self, skip: int = 0, limit: int = 100) -> List[Video]:
-        """Obtiene videos públicos para votación con paginación"""
+    async def get_public_videos(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Video]:
+        """
+        Obtiene videos públicos para votación ordenados por (uploaded_at, id) descendente.
+        after=(uploaded_at, id) continúa después de ese video (keyset, sin OFFSET).
+        """
+        pass
+    
+    @abstractmethod
+    async def get_votes_count(self, video_id: int) -> Optional[int]:
+        """Obtiene el contador de votos de un video (None si no existe)"""
         pass
     
     @abstractmethod
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from app.domain.entities.vote import Vote
 
 
@@ -11,6 +11,23 @@ class VoteRepositoryInterface(ABC):
         """Crea un nuevo voto"""
         pass
     
+    @abstractmethod
+    async def cast_vote(self, video_id: int, player_id: int) -> Optional[int]:
+        """
+        Registra el voto de forma atómica solo si el video es votable, no es del
+        votante y no existía el voto. Retorna el ID del dueño del video (cuyo
+        puntaje aumentó) o None si el voto no se registró.
+        """
+        pass
+    
+    @abstractmethod
+    async def cast_votes_batch(self, votes: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """
+        Inserta un lote de votos (video_id, player_id) ya validados en una sola
+        transacción, ignorando duplicados. Retorna los pares efectivamente insertados.
+        """
+        pass
+    
     @abstractmethod
     async def get_by_id(self, vote_id: int) -> Optional[Vote]:
         """Obtiene un voto por ID"""
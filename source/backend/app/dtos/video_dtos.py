@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime
 
 
@@ -9,6 +9,21 @@ class VideoUploadResponseDTO(BaseModel):
     task_id: str
 
 
+class VideoPresignedUploadRequestDTO(BaseModel):
+    """DTO de solicitud de subida directa a S3"""
+    title: str
+    filename: str
+    content_type: str = "video/mp4"
+
+
+class VideoPresignedUploadResponseDTO(BaseModel):
+    """DTO con el formulario presignado para subir el video directo al bucket"""
+    video_id: int
+    upload_url: str
+    fields: Dict[str, str]
+    expires_in: int
+
+
 class VideoListItemDTO(BaseModel):
     """DTO para item de lista de videos"""
     video_id: int
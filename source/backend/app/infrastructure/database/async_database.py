@@ -0,0 +1,33 @@
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.infrastructure.database.database import DATABASE_URL
+
+
+def to_async_url(url: str) -> str:
+    """Convierte la URL síncrona de la base de datos a su driver async equivalente"""
+    if url.startswith("postgresql://") or url.startswith("postgresql+psycopg2://"):
+        return "postgresql+asyncpg://" + url.split("://", 1)[1]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url.split("://", 1)[1]
+    return url
+
+
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+
+# Mismo dimensionamiento del pool que el motor síncrono (SQLite no usa pool de conexiones)
+_engine_options = {"pool_pre_ping": True, "pool_recycle": 3600, "echo": False}
+if not ASYNC_DATABASE_URL.startswith("sqlite"):
+    _engine_options.update({"pool_size": 20, "max_overflow": 40})
+
+# Motor async (asyncpg): las consultas no bloquean el event loop
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_engine_options)
+
+# expire_on_commit=False: los modelos siguen legibles después del commit sin otra consulta
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
+# Dependencia para obtener la sesión async de la base de datos
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
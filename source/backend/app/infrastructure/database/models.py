@@ -1,6 +1,6 @@
 """Modelos SQLAlchemy para la base de datos"""
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Enum, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.infrastructure.database.database import Base
@@ -43,6 +43,8 @@ class VideoModel(Base):
     processed_url = Column(String(500))
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     processed_at = Column(DateTime(timezone=True), nullable=True)
+    # Contador desnormalizado: lo mantiene el repositorio de votos en la misma transacción del voto
+    votes_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Relaciones
     player = relationship("PlayerModel", back_populates="videos")
@@ -62,8 +64,27 @@ class VoteModel(Base):
     video = relationship("VideoModel", back_populates="votes")
     player = relationship("PlayerModel", back_populates="votes")
 
-    # Constraint para evitar votos duplicados e índice compuesto para optimizar queries
+    # Constraint para evitar votos duplicados (también es el árbitro del ON CONFLICT al votar)
     __table_args__ = (
+        UniqueConstraint('video_id', 'player_id', name='unique_vote'),
         {'sqlite_autoincrement': True},
     )
 
+
+class PlayerScoreModel(Base):
+    """
+    Modelo SQLAlchemy para el ranking materializado de jugadores.
+    Se actualiza en la misma transacción que cada voto (ver VoteRepository).
+    """
+    __tablename__ = "player_scores"
+
+    player_id = Column(Integer, ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    city = Column(String(100), nullable=False)
+    total_votes = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        # ORDER BY total_votes DESC LIMIT n (global y por ciudad) sin ordenar toda la tabla
+        Index('idx_player_scores_total_votes', total_votes.desc(), player_id),
+        Index('idx_player_scores_city_total_votes', city, total_votes.desc(), player_id),
+    )
@@ -0,0 +1,98 @@
+"""Sesión de base de datos por request (unidad de trabajo)"""
+
+import logging
+from contextvars import ContextVar
+from typing import Callable, Optional, Union
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.shared.interfaces.unit_of_work import UnitOfWorkInterface
+
+logger = logging.getLogger(__name__)
+
+# Sesión del request en curso: los repositorios (singletons) la toman de aquí
+_current_session: ContextVar[Optional[Union[Session, AsyncSession]]] = ContextVar(
+    "current_db_session", default=None
+)
+
+
+def current_session() -> Optional[Union[Session, AsyncSession]]:
+    """Retorna la sesión del request en curso, o None fuera de un request"""
+    return _current_session.get()
+
+
+async def _finish(session: Union[Session, AsyncSession], commit: bool) -> None:
+    """Confirma o descarta la transacción del request y libera la conexión"""
+    if isinstance(session, AsyncSession):
+        try:
+            if commit:
+                await session.commit()
+            else:
+                await session.rollback()
+        finally:
+            await session.close()
+    else:
+        try:
+            if commit:
+                session.commit()
+            else:
+                session.rollback()
+        finally:
+            session.close()
+
+
+def unit_of_work_middleware(session_factory: Optional[Callable[[], Union[Session, AsyncSession]]] = None):
+    """
+    Crea el middleware que abre una sesión por request y la comparte con todos los repositorios.
+
+    - Los repositorios hacen flush (no commit) sobre esta sesión: una sola transacción
+      y un solo checkout del pool por request.
+    - Respuesta < 400: commit al final. Error o respuesta >= 400: rollback.
+    - La sesión no toma conexión hasta la primera consulta (requests sin BD no cuestan nada).
+    """
+    if session_factory is None:
+        from app.config.settings import settings
+        if settings.DATABASE_ASYNC:
+            from app.infrastructure.database.async_database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+        else:
+            from app.infrastructure.database.database import SessionLocal
+            session_factory = SessionLocal
+
+    async def middleware(request: Request, call_next):
+        session = session_factory()
+        token = _current_session.set(session)
+        try:
+            response = await call_next(request)
+        except Exception:
+            await _finish(session, commit=False)
+            raise
+        finally:
+            _current_session.reset(token)
+
+        await _finish(session, commit=response.status_code < 400)
+        return response
+
+    return middleware
+
+
+class SqlAlchemyUnitOfWork(UnitOfWorkInterface):
+    """Unidad de trabajo sobre la sesión del request en curso (no-op fuera de un request)"""
+
+    async def commit(self) -> None:
+        session = current_session()
+        if session is None:
+            return
+        if isinstance(session, AsyncSession):
+            await session.commit()
+        else:
+            session.commit()
+
+    async def rollback(self) -> None:
+        session = current_session()
+        if session is None:
+            return
+        if isinstance(session, AsyncSession):
+            await session.rollback()
+        else:
+            session.rollback()
@@ -0,0 +1,33 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from botocore.config import Config
+from app.infrastructure.external_services.s3_file_storage import S3FileStorage
+
+
+class AsyncS3FileStorage(S3FileStorage):
+    """
+    Implementación no bloqueante del almacenamiento en S3.
+
+    Todas las llamadas a boto3 se ejecutan en un pool de threads acotado con un
+    único cliente compartido (boto3 clients son thread-safe), cuyo pool de
+    conexiones HTTP se dimensiona al número de threads. Así una transferencia
+    lenta no bloquea el event loop ni al resto de requests del worker.
+    """
+
+    def __init__(self, bucket_name: str, max_workers: int = 32, **kwargs):
+        self.max_workers = max(1, max_workers)
+        # Una conexión por thread: ninguna llamada espera por una conexión libre del pool
+        kwargs.setdefault("client_config", Config(
+            max_pool_connections=self.max_workers,
+            retries={"max_attempts": 3, "mode": "standard"}
+        ))
+        super().__init__(bucket_name, **kwargs)
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="s3-io"
+        )
+
+    async def _call(self, func, **kwargs):
+        """Ejecuta la llamada de boto3 en el pool de threads sin bloquear el event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_executor, functools.partial(func, **kwargs))
@@ -1,30 +1,33 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from app.shared.interfaces.authentication import AuthenticationInterface
 from app.domain.entities.player import Player
 from app.config.settings import settings
-
-# Contexto para hash de contraseñas
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.infrastructure.external_services.password_hasher import PasswordHasher, hash_password, verify_password
 
 
 class JWTAuthService(AuthenticationInterface):
     """Implementación de autenticación con JWT"""
     
-    def __init__(self):
+    def __init__(self, password_hasher: Optional[PasswordHasher] = None):
         self.secret_key = settings.SECRET_KEY
         self.algorithm = settings.ALGORITHM
         self.access_token_expire_minutes = settings.ACCESS_TOKEN_EXPIRE_MINUTES
+        # Sin pool, bcrypt se ejecuta en el event loop
+        self.password_hasher = password_hasher
     
     async def hash_password(self, password: str) -> str:
         """Genera el hash de la contraseña"""
-        return pwd_context.hash(password)
+        if self.password_hasher:
+            return await self.password_hasher.hash(password)
+        return hash_password(password)
     
     async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verifica si la contraseña coincide con el hash"""
-        return pwd_context.verify(plain_password, hashed_password)
+        if self.password_hasher:
+            return await self.password_hasher.verify(plain_password, hashed_password)
+        return verify_password(plain_password, hashed_password)
     
     async def create_access_token(self, data: dict) -> str:
         """Crea un token JWT de acceso"""
@@ -1,16 +1,22 @@
 import os
 import glob
-from typing import Optional, Literal
+import hashlib
+import uuid
+from datetime import datetime, timezone
+from typing import Iterator, Optional, Literal
 from fastapi import UploadFile
-from app.shared.interfaces.file_storage import FileStorageInterface, LocationType
+from app.shared.interfaces.file_storage import (
+    FileStorageInterface, LocationType, StoredFile, ensure_within_limit
+)
 
 
 class LocalFileStorage(FileStorageInterface):
     """Implementación local del almacenamiento de archivos"""
     
-    def __init__(self, upload_dir: str = None):
+    def __init__(self, upload_dir: str = None, chunk_size: int = 1024 * 1024):
         # Usar variable de entorno o ruta por defecto
         self.upload_dir = upload_dir or os.getenv("UPLOAD_DIR", "/app/uploads")
+        self.chunk_size = chunk_size
         self._ensure_upload_directories()
     
     def _ensure_upload_directories(self):
@@ -23,13 +29,29 @@ class LocalFileStorage(FileStorageInterface):
         """Obtiene la ruta completa del archivo basada en la ubicación"""
         return os.path.join(self.upload_dir, location, filename)
     
-    async def save_file(self, file: UploadFile, filename: str, location: LocationType = "original") -> str:
-        """Guarda un archivo en el sistema local"""
+    async def save_file(
+        self, file: UploadFile, filename: str, location: LocationType = "original",
+        max_size: Optional[int] = None
+    ) -> str:
+        """Guarda un archivo en el sistema local copiándolo por chunks"""
         file_path = self._get_file_path(filename, location)
-        
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        # Escribir a un temporal y renombrar: nunca queda un archivo a medias en la ruta final
+        tmp_path = f"{file_path}.{uuid.uuid4().hex}.part"
+        total_bytes = 0
+
+        try:
+            with open(tmp_path, "wb") as buffer:
+                while True:
+                    chunk = await file.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    total_bytes += len(chunk)
+                    ensure_within_limit(total_bytes, max_size)
+                    buffer.write(chunk)
+            os.replace(tmp_path, file_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
         
         return file_path
     
@@ -64,25 +86,62 @@ class LocalFileStorage(FileStorageInterface):
         except OSError:
             return None
     
-    async def get_file_content(self, filename: str, location: LocationType = "original") -> bytes:
-        """Obtiene el contenido del archivo como bytes (busca por patrón si no tiene extensión)"""
+    def _resolve_file_path(self, filename: str, location: LocationType) -> str:
+        """Resuelve la ruta real del archivo (exacta o buscando por patrón si no tiene extensión)"""
+        file_path = self._get_file_path(filename, location)
+        if os.path.isfile(file_path):
+            return file_path
+
         directory = os.path.join(self.upload_dir, location)
+        if not os.path.exists(directory):
+            raise FileNotFoundError(f"Directorio no encontrado: {location}")
 
+        matching_files = [f for f in os.listdir(directory) if f.startswith(f"{filename}.")]
+        if not matching_files:
+            raise FileNotFoundError(f"Archivo no encontrado: {filename} en ubicación {location}")
+
+        # Tomar el primer archivo que coincida
+        return os.path.join(directory, matching_files[0])
+
+    async def get_file_content(self, filename: str, location: LocationType = "original") -> bytes:
+        """Obtiene el contenido del archivo como bytes (busca por patrón si no tiene extensión)"""
         try:
-            if os.path.exists(directory):
-                files = os.listdir(directory)
-                matching_files = [f for f in files if f.startswith(f"{filename}.")]
-                
-                if matching_files:
-                    # Tomar el primer archivo que coincida
-                    actual_filename = matching_files[0]
-                    file_path = os.path.join(directory, actual_filename)
-                    
-                    with open(file_path, "rb") as file:
-                        return file.read()
-                else:
-                    raise FileNotFoundError(f"Archivo no encontrado: {filename} en ubicación {location}")
-            else:
-                raise FileNotFoundError(f"Directorio no encontrado: {location}")
+            file_path = self._resolve_file_path(filename, location)
+            with open(file_path, "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            raise
         except OSError as e:
-            raise FileNotFoundError(f"Error al leer archivo: {filename} en ubicación {location}")    
+            raise FileNotFoundError(f"Error al leer archivo: {filename} en ubicación {location}")
+
+    async def get_stored_file(self, filename: str, location: LocationType = "original") -> StoredFile:
+        """Obtiene el descriptor del archivo local (se sirve desde disco sin cargarlo en memoria)"""
+        file_path = self._resolve_file_path(filename, location)
+        stat = os.stat(file_path)
+        # ETag derivado de mtime + tamaño: cambia si el worker reescribe el archivo
+        etag = hashlib.md5(f"{stat.st_mtime_ns}-{stat.st_size}".encode()).hexdigest()
+        return StoredFile(
+            filename=filename,
+            location=location,
+            size=stat.st_size,
+            path=file_path,
+            etag=f'"{etag}"',
+            last_modified=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+        )
+
+    def iter_file_content(
+        self, filename: str, location: LocationType = "original", chunk_size: int = 1024 * 1024,
+        start: int = 0, end: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """Itera el contenido del archivo local (o el rango inclusivo start-end) en bloques"""
+        file_path = self._resolve_file_path(filename, location)
+        with open(file_path, "rb") as file:
+            file.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = file.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
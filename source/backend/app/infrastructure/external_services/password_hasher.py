@@ -0,0 +1,88 @@
+import asyncio
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict
+from passlib.context import CryptContext
+
+# Contexto para hash de contraseñas
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def hash_password(password: str) -> str:
+    """Genera el hash bcrypt de la contraseña (CPU: ~100-300 ms)"""
+    return pwd_context.hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verifica si la contraseña coincide con el hash bcrypt"""
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Ejecuta bcrypt en un pool acotado para no bloquear el event loop.
+
+    Con "thread" (por defecto) bcrypt libera el GIL durante el hash, así que los
+    threads corren en paralelo sin el costo de serializar argumentos entre procesos;
+    "process" aísla además el trabajo de CPU en procesos separados.
+    Las métricas cuentan las operaciones en curso y la cola de espera del pool.
+    """
+
+    EXECUTOR_TYPES = ("thread", "process")
+
+    def __init__(self, max_workers: int = 4, executor_type: str = "thread"):
+        if executor_type not in self.EXECUTOR_TYPES:
+            raise ValueError(f"Tipo de executor no soportado: {executor_type}")
+        self.max_workers = max(1, max_workers)
+        self.executor_type = executor_type
+        self._executor: Executor = (
+            ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+            if executor_type == "thread"
+            else ProcessPoolExecutor(max_workers=self.max_workers)
+        )
+        self._pending = 0
+        self._peak_queue_depth = 0
+        self._completed = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Operaciones enviadas que esperan un worker libre"""
+        return max(self._pending - self.max_workers, 0)
+
+    async def hash(self, password: str) -> str:
+        """Genera el hash de la contraseña en el pool"""
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verifica la contraseña en el pool"""
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> Dict[str, object]:
+        """Estado actual del pool para métricas"""
+        return {
+            "executor": self.executor_type,
+            "workers": self.max_workers,
+            "in_flight": self._pending,
+            "queue_depth": self.queue_depth,
+            "peak_queue_depth": self._peak_queue_depth,
+            "completed": self._completed,
+        }
+
+    def reset_peak_queue_depth(self) -> int:
+        """Retorna la cola máxima observada desde la última lectura y la reinicia"""
+        peak, self._peak_queue_depth = self._peak_queue_depth, self.queue_depth
+        return peak
+
+    def shutdown(self) -> None:
+        """Libera los workers del pool"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, func: Callable, *args):
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        self._peak_queue_depth = max(self._peak_queue_depth, self.queue_depth)
+        try:
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+        finally:
+            self._pending -= 1
+            self._completed += 1
@@ -1,16 +1,39 @@
+import asyncio
 import boto3
-from typing import Optional
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
 from fastapi import UploadFile
-from app.shared.interfaces.file_storage import FileStorageInterface, LocationType
+from app.shared.interfaces.file_storage import (
+    FileStorageInterface, FileTooLargeError, LocationType, StoredFile, ensure_within_limit
+)
+
+# Tamaño mínimo de parte que acepta S3 (excepto la última)
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
 
 
 class S3FileStorage(FileStorageInterface):
     """Implementación de almacenamiento de archivos en AWS S3"""
 
+    supports_direct_upload = True
+
     def __init__(self, bucket_name: str, region: str = "us-east-1",
-                 access_key: str = None, secret_key: str = None, session_token: str = None):
+                 access_key: str = None, secret_key: str = None, session_token: str = None,
+                 download_mode: str = "redirect", presigned_expiration: int = 3600,
+                 part_size: int = 8 * 1024 * 1024, upload_concurrency: int = 4,
+                 endpoint_url: str = None, client_config: Optional[Config] = None):
         self.bucket_name = bucket_name
         self.region = region
+        self.part_size = max(part_size, S3_MIN_PART_SIZE)
+        # Partes en vuelo por upload: acota la memoria a part_size * upload_concurrency
+        self.upload_concurrency = max(1, upload_concurrency)
+        self._upload_executor = ThreadPoolExecutor(
+            max_workers=self.upload_concurrency * 4, thread_name_prefix="s3-upload"
+        )
+        # "redirect": 302 a URL presignada | "stream": passthrough por chunks desde el backend
+        self.download_mode = download_mode
+        self.presigned_expiration = presigned_expiration
 
         # Configurar cliente S3
         # Prioridad:
@@ -25,37 +48,162 @@ class S3FileStorage(FileStorageInterface):
                 region_name=region,
                 aws_access_key_id=access_key,
                 aws_secret_access_key=secret_key,
-                aws_session_token=session_token
+                aws_session_token=session_token,
+                endpoint_url=endpoint_url,
+                config=client_config
             )
         else:
             # Opción 2: IAM Role (instancia EC2 con LabRole)
             # boto3 automáticamente usa el Instance Profile
-            self.s3_client = boto3.client('s3', region_name=region)
+            self.s3_client = boto3.client(
+                's3', region_name=region, endpoint_url=endpoint_url, config=client_config
+            )
     
     def _get_s3_key(self, filename: str, location: LocationType) -> str:
         """Obtiene la clave S3 basada en la ubicación"""
         return f"{location}/{filename}"
     
-    async def save_file(self, file: UploadFile, filename: str, location: LocationType = "original") -> str:
-        """Guarda un archivo en S3"""
+    async def save_file(
+        self, file: UploadFile, filename: str, location: LocationType = "original",
+        max_size: Optional[int] = None
+    ) -> str:
+        """
+        Guarda un archivo en S3 por chunks:
+        - Si cabe en una sola parte: put_object
+        - Si no: multipart upload con hasta upload_concurrency partes en paralelo
+        """
+        s3_key = self._get_s3_key(filename, location)
+        content_type = file.content_type or 'video/mp4'
+
         try:
-            content = await file.read()
-            s3_key = self._get_s3_key(filename, location)
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=content,
-                ContentType=file.content_type or 'video/mp4'
-            )
+            first_part = await file.read(self.part_size)
+            ensure_within_limit(len(first_part), max_size)
+
+            if len(first_part) < self.part_size:
+                # Archivo pequeño: una sola petición
+                await self._run_upload(
+                    self.s3_client.put_object,
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    Body=first_part,
+                    ContentType=content_type
+                )
+            else:
+                await self._multipart_upload(file, s3_key, content_type, first_part, max_size)
+
             return f"s3://{self.bucket_name}/{s3_key}"
+        except FileTooLargeError:
+            raise
         except Exception as e:
             raise Exception(f"Error al subir archivo a S3: {str(e)}")
+
+    async def _call(self, func, **kwargs):
+        """Ejecuta una llamada de boto3 (síncrona en esta implementación)"""
+        return func(**kwargs)
+
+    async def _run_upload(self, func, **kwargs):
+        """Ejecuta una llamada de boto3 en el pool de uploads sin bloquear el event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._upload_executor, lambda: func(**kwargs))
+
+    async def _multipart_upload(
+        self, file: UploadFile, s3_key: str, content_type: str, first_part: bytes, max_size: Optional[int]
+    ) -> None:
+        """Sube el archivo en partes de part_size, abortando el upload si algo falla"""
+        upload = await self._run_upload(
+            self.s3_client.create_multipart_upload,
+            Bucket=self.bucket_name,
+            Key=s3_key,
+            ContentType=content_type
+        )
+        upload_id = upload['UploadId']
+        pending = set()
+        parts: List[dict] = []
+
+        async def upload_part(part_number: int, body: bytes) -> dict:
+            response = await self._run_upload(
+                self.s3_client.upload_part,
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=body
+            )
+            return {'PartNumber': part_number, 'ETag': response['ETag']}
+
+        try:
+            part_number = 1
+            total_bytes = len(first_part)
+            chunk = first_part
+
+            while chunk:
+                # Esperar a que termine alguna parte antes de leer más (memoria acotada)
+                if len(pending) >= self.upload_concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    parts.extend(task.result() for task in done)
+
+                pending.add(asyncio.ensure_future(upload_part(part_number, chunk)))
+                part_number += 1
+
+                chunk = await file.read(self.part_size)
+                total_bytes += len(chunk)
+                ensure_within_limit(total_bytes, max_size)
+
+            if pending:
+                done, pending = await asyncio.wait(pending)
+                parts.extend(task.result() for task in done)
+
+            await self._run_upload(
+                self.s3_client.complete_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                UploadId=upload_id,
+                MultipartUpload={'Parts': sorted(parts, key=lambda part: part['PartNumber'])}
+            )
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            try:
+                await self._run_upload(
+                    self.s3_client.abort_multipart_upload,
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    UploadId=upload_id
+                )
+            except Exception:
+                # Las partes huérfanas las limpia la lifecycle rule del bucket
+                pass
+            raise
     
+    async def create_upload_target(
+        self, filename: str, location: LocationType = "original",
+        content_type: str = "video/mp4", max_size: Optional[int] = None
+    ) -> Optional[Dict]:
+        """
+        Genera un POST presignado para que el cliente suba directo al bucket.
+        S3 rechaza el upload si el tamaño o el Content-Type no cumplen las condiciones.
+        """
+        s3_key = self._get_s3_key(filename, location)
+        conditions = [{"Content-Type": content_type}]
+        if max_size is not None:
+            conditions.append(["content-length-range", 1, max_size])
+
+        return self.s3_client.generate_presigned_post(
+            Bucket=self.bucket_name,
+            Key=s3_key,
+            Fields={"Content-Type": content_type},
+            Conditions=conditions,
+            ExpiresIn=self.presigned_expiration
+        )
+
     async def delete_file(self, filename: str, location: LocationType = "original") -> bool:
         """Elimina un archivo de S3"""
         try:
             s3_key = self._get_s3_key(filename, location)
-            self.s3_client.delete_object(
+            await self._call(
+                self.s3_client.delete_object,
                 Bucket=self.bucket_name,
                 Key=s3_key
             )
@@ -70,7 +218,7 @@ class S3FileStorage(FileStorageInterface):
             url = self.s3_client.generate_presigned_url(
                 'get_object',
                 Params={'Bucket': self.bucket_name, 'Key': s3_key},
-                ExpiresIn=3600  # 1 hora
+                ExpiresIn=self.presigned_expiration
             )
             return url
         except Exception as e:
@@ -80,7 +228,7 @@ class S3FileStorage(FileStorageInterface):
         """Verifica si un archivo existe en S3"""
         try:
             s3_key = self._get_s3_key(filename, location)
-            self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
+            await self._call(self.s3_client.head_object, Bucket=self.bucket_name, Key=s3_key)
             return True
         except:
             return False
@@ -89,7 +237,7 @@ class S3FileStorage(FileStorageInterface):
         """Obtiene el tamaño de un archivo en S3"""
         try:
             s3_key = self._get_s3_key(filename, location)
-            response = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
+            response = await self._call(self.s3_client.head_object, Bucket=self.bucket_name, Key=s3_key)
             return response['ContentLength']
         except:
             return None
@@ -98,7 +246,50 @@ class S3FileStorage(FileStorageInterface):
         """Obtiene el contenido del archivo como bytes desde S3"""
         try:
             s3_key = self._get_s3_key(filename, location)
-            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=s3_key)
-            return response['Body'].read()
+            response = await self._call(self.s3_client.get_object, Bucket=self.bucket_name, Key=s3_key)
+            return await self._call(response['Body'].read)
         except Exception as e:
             raise FileNotFoundError(f"Archivo no encontrado: {filename} en ubicación {location}")
+
+    async def get_stored_file(self, filename: str, location: LocationType = "original") -> StoredFile:
+        """Obtiene el descriptor del objeto en S3 (URL presignada en modo redirect)"""
+        s3_key = self._get_s3_key(filename, location)
+        try:
+            response = await self._call(self.s3_client.head_object, Bucket=self.bucket_name, Key=s3_key)
+        except ClientError as e:
+            raise FileNotFoundError(f"Archivo no encontrado: {filename} en ubicación {location}") from e
+
+        url = None
+        if self.download_mode == "redirect":
+            url = await self.get_file_url(filename, location)
+
+        return StoredFile(
+            filename=filename,
+            location=location,
+            size=response['ContentLength'],
+            url=url,
+            etag=response.get('ETag'),
+            last_modified=response.get('LastModified')
+        )
+
+    def iter_file_content(
+        self, filename: str, location: LocationType = "original", chunk_size: int = 1024 * 1024,
+        start: int = 0, end: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """Itera el cuerpo del objeto S3 (o el rango inclusivo start-end) en bloques sin descargarlo completo"""
+        s3_key = self._get_s3_key(filename, location)
+        params = {'Bucket': self.bucket_name, 'Key': s3_key}
+        if start or end is not None:
+            # S3 resuelve el rango: solo viajan los bytes pedidos
+            params['Range'] = f"bytes={start}-{'' if end is None else end}"
+        try:
+            response = self.s3_client.get_object(**params)
+        except ClientError as e:
+            raise FileNotFoundError(f"Archivo no encontrado: {filename} en ubicación {location}") from e
+
+        body = response['Body']
+        try:
+            for chunk in body.iter_chunks(chunk_size):
+                yield chunk
+        finally:
+            body.close()
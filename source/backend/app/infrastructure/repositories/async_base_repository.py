@@ -0,0 +1,36 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.database.unit_of_work import current_session
+
+
+class AsyncBaseRepository:
+    """Base para repositorios con AsyncSession"""
+
+    def __init__(self, db: AsyncSession = None, session_factory: Optional[Callable[[], AsyncSession]] = None):
+        self._db = db
+        if session_factory is None and db is None:
+            # Import diferido: el motor async solo se crea si se usan estos repositorios
+            from app.infrastructure.database.async_database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+        self._session_factory = session_factory
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[AsyncSession]:
+        """Usa la sesión inyectada, la del request en curso, o abre una propia que se cierra al terminar"""
+        if self._db:
+            yield self._db
+            return
+        session = current_session()
+        if isinstance(session, AsyncSession):
+            yield session
+            return
+        async with self._session_factory() as db:
+            yield db
+
+    async def _commit(self, db: AsyncSession) -> None:
+        """Dentro de un request solo hace flush: la unidad de trabajo confirma al final"""
+        if db is current_session():
+            await db.flush()
+        else:
+            await db.commit()
@@ -0,0 +1,102 @@
+from typing import List, Optional, Tuple
+from sqlalchemy import select
+from app.domain.entities.player import Player
+from app.domain.entities.player_score import PlayerScore
+from app.domain.value_objects.email import Email
+from app.infrastructure.database.models import PlayerModel
+from app.infrastructure.repositories.async_base_repository import AsyncBaseRepository
+from app.infrastructure.repositories.player_repository import PlayerRepository
+from app.infrastructure.repositories.player_score_statements import (
+    count_ranked_ahead,
+    player_score,
+    ranking_from_votes,
+    ranking_page,
+    sync_score_city,
+    sync_scores_from_votes,
+)
+
+
+class AsyncPlayerRepository(AsyncBaseRepository, PlayerRepository):
+    """Implementación async del repositorio de jugadores (AsyncSession + asyncpg)"""
+
+    async def create(self, player: Player) -> Player:
+        """Crea un nuevo jugador"""
+        async with self._session() as db:
+            model = self._to_model(player)
+            db.add(model)
+            await self._commit(db)
+            await db.refresh(model)
+            return self._to_domain(model)
+
+    async def get_by_id(self, player_id: int) -> Optional[Player]:
+        """Obtiene un jugador por ID"""
+        async with self._session() as db:
+            model = await db.get(PlayerModel, player_id)
+            return self._to_domain(model) if model else None
+
+    async def get_by_email(self, email: Email) -> Optional[Player]:
+        """Obtiene un jugador por email"""
+        async with self._session() as db:
+            result = await db.execute(select(PlayerModel).where(PlayerModel.email == email.value))
+            model = result.scalars().first()
+            return self._to_domain(model) if model else None
+
+    async def update(self, player: Player) -> Player:
+        """Actualiza un jugador"""
+        async with self._session() as db:
+            model = await db.get(PlayerModel, player.id)
+            if model:
+                model.first_name = player.first_name
+                model.last_name = player.last_name
+                model.city = player.city
+                model.country = player.country
+                model.is_active = player.is_active
+                await db.execute(sync_score_city(player.id, player.city))
+                await self._commit(db)
+                await db.refresh(model)
+                return self._to_domain(model)
+            return player
+
+    async def delete(self, player_id: int) -> bool:
+        """Elimina un jugador"""
+        async with self._session() as db:
+            model = await db.get(PlayerModel, player_id)
+            if model:
+                await db.delete(model)
+                await self._commit(db)
+                return True
+            return False
+
+    async def get_rankings(
+        self,
+        city: Optional[str] = None,
+        limit: Optional[int] = 100,
+        after: Optional[Tuple[int, int]] = None
+    ) -> List[PlayerScore]:
+        """Obtiene el ranking desde la tabla materializada player_scores"""
+        async with self._session() as db:
+            result = await db.execute(ranking_page(city, limit, after))
+            return [PlayerScore(player=self._to_domain(model), total_votes=total_votes) for model, total_votes in result.all()]
+
+    async def get_rankings_from_votes(self, city: Optional[str] = None, limit: Optional[int] = None) -> List[PlayerScore]:
+        """Calcula el ranking desde los votos con un solo JOIN agrupado (un round-trip)"""
+        async with self._session() as db:
+            result = await db.execute(ranking_from_votes(city, limit))
+            return [PlayerScore(player=self._to_domain(model), total_votes=total_votes) for model, total_votes in result.all()]
+
+    async def sync_scores_from_votes(self) -> int:
+        """Reescribe en player_scores los totales que difieren del conteo de votos (una sentencia)"""
+        async with self._session() as db:
+            result = await db.execute(sync_scores_from_votes(db.get_bind().dialect.name))
+            await self._commit(db)
+            return result.rowcount
+
+    async def get_player_rank(self, player_id: int, city: Optional[str] = None) -> Optional[PlayerScore]:
+        """Obtiene la posición de un jugador contando solo los que tiene por delante"""
+        async with self._session() as db:
+            row = (await db.execute(player_score(player_id, city))).first()
+            if not row:
+                return None
+            model, total_votes = row
+            ahead = (await db.execute(count_ranked_ahead(total_votes, player_id, city))).scalar_one()
+            return PlayerScore(player=self._to_domain(model), total_votes=total_votes, position=ahead + 1)
@@ -0,0 +1,91 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import select, tuple_
+from app.domain.entities.video import Video, VideoStatus
+from app.infrastructure.database.models import VideoModel, VideoStatusEnum
+from app.infrastructure.repositories.async_base_repository import AsyncBaseRepository
+from app.infrastructure.repositories.player_score_statements import seed_player_score
+from app.infrastructure.repositories.video_repository import VideoRepository
+
+
+class AsyncVideoRepository(AsyncBaseRepository, VideoRepository):
+    """Implementación async del repositorio de videos (AsyncSession + asyncpg)"""
+
+    async def create(self, video: Video) -> Video:
+        """Crea un nuevo video"""
+        async with self._session() as db:
+            model = self._to_model(video)
+            db.add(model)
+            await self._commit(db)
+            await db.refresh(model)
+            return self._to_domain(model)
+
+    async def get_by_id(self, video_id: int) -> Optional[Video]:
+        """Obtiene un video por ID"""
+        async with self._session() as db:
+            model = await db.get(VideoModel, video_id)
+            return self._to_domain(model) if model else None
+
+    async def get_by_player(self, player_id: int) -> List[Video]:
+        """Obtiene todos los videos de un jugador"""
+        async with self._session() as db:
+            result = await db.execute(select(VideoModel).where(VideoModel.player_id == player_id))
+            return [self._to_domain(model) for model in result.scalars().all()]
+
+    async def get_public_videos(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Video]:
+        """Obtiene videos públicos para votación con paginación a nivel de BD (keyset con after)"""
+        async with self._session() as db:
+            query = select(VideoModel).where(VideoModel.status == 'processed')
+            if after is not None:
+                query = query.where(tuple_(VideoModel.uploaded_at, VideoModel.id) < tuple_(*after))
+            elif skip:
+                query = query.offset(skip)
+            result = await db.execute(
+                query.order_by(VideoModel.uploaded_at.desc(), VideoModel.id.desc()).limit(limit)
+            )
+            return [self._to_domain(model) for model in result.scalars().all()]
+
+    async def get_votes_count(self, video_id: int) -> Optional[int]:
+        """Lee el contador desnormalizado de votos (sin COUNT(*) sobre votes)"""
+        async with self._session() as db:
+            result = await db.execute(select(VideoModel.votes_count).where(VideoModel.id == video_id))
+            return result.scalar()
+
+    async def update(self, video: Video) -> Video:
+        """Actualiza un video"""
+        async with self._session() as db:
+            model = await db.get(VideoModel, video.id)
+            if model:
+                # Convertir el enum de dominio al enum de SQLAlchemy
+                status_map = {
+                    VideoStatus.UPLOADED: VideoStatusEnum.UPLOADED,
+                    VideoStatus.PROCESSED: VideoStatusEnum.PROCESSED,
+                }
+
+                model.title = video.title
+                model.status = status_map.get(video.status, VideoStatusEnum.UPLOADED)
+                model.original_url = video.original_url
+                model.processed_url = video.processed_url
+                model.processed_at = video.processed_at
+                if model.status == VideoStatusEnum.PROCESSED:
+                    # El jugador entra al ranking (con 0 votos) al publicar un video
+                    await db.execute(seed_player_score(db.get_bind().dialect.name, model.player_id))
+                await self._commit(db)
+                await db.refresh(model)
+                return self._to_domain(model)
+            return video
+
+    async def delete(self, video_id: int) -> bool:
+        """Elimina un video"""
+        async with self._session() as db:
+            model = await db.get(VideoModel, video_id)
+            if model:
+                await db.delete(model)
+                await self._commit(db)
+                return True
+            return False
@@ -0,0 +1,136 @@
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func, select
+from app.domain.entities.vote import Vote
+from app.infrastructure.database.models import VoteModel
+from app.infrastructure.repositories.async_base_repository import AsyncBaseRepository
+from app.infrastructure.repositories.player_score_statements import (
+    add_vote_to_score,
+    add_votes_to_scores,
+    add_votes_to_videos,
+    adjust_video_votes_count,
+    cast_vote_in_one_statement,
+    insert_vote_if_eligible,
+    insert_votes_batch,
+    remove_vote_from_score,
+    video_owners,
+)
+from app.infrastructure.repositories.vote_repository import VoteRepository
+
+
+class AsyncVoteRepository(AsyncBaseRepository, VoteRepository):
+    """Implementación async del repositorio de votos (AsyncSession + asyncpg)"""
+
+    async def create(self, vote: Vote) -> Vote:
+        """Crea un nuevo voto y suma el punto al ranking y al contador del video en la misma transacción"""
+        async with self._session() as db:
+            model = self._to_model(vote)
+            db.add(model)
+            await db.flush()
+            await db.execute(add_vote_to_score(db.get_bind().dialect.name, vote.video_id))
+            await db.execute(adjust_video_votes_count(vote.video_id, 1))
+            await self._commit(db)
+            await db.refresh(model)
+            return self._to_domain(model)
+
+    async def cast_vote(self, video_id: int, player_id: int) -> Optional[int]:
+        """Registra el voto con un INSERT condicional y suma el punto al ranking y al contador del video en la misma transacción"""
+        async with self._session() as db:
+            dialect_name = db.get_bind().dialect.name
+            if dialect_name == "postgresql":
+                # Un solo round-trip: voto, ranking y contador encadenados en CTEs
+                owner_id = (await db.execute(cast_vote_in_one_statement(video_id, player_id))).scalar()
+                if owner_id is not None:
+                    await self._commit(db)
+                return owner_id
+
+            # Otros dialectos (SQLite en tests) no soportan DML dentro de CTEs
+            vote_id = (await db.execute(insert_vote_if_eligible(dialect_name, video_id, player_id))).scalar()
+            if vote_id is None:
+                return None
+            owner_id = (await db.execute(add_vote_to_score(dialect_name, video_id))).scalar()
+            await db.execute(adjust_video_votes_count(video_id, 1))
+            await self._commit(db)
+            return owner_id
+
+    async def cast_votes_batch(self, votes: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Inserta un lote de votos con un INSERT multi-fila y un solo commit"""
+        if not votes:
+            return []
+        async with self._session() as db:
+            dialect_name = db.get_bind().dialect.name
+            result = await db.execute(insert_votes_batch(dialect_name, votes))
+            inserted = [tuple(row) for row in result.all()]
+            if inserted:
+                owners = {
+                    row.id: (row.player_id, row.city)
+                    for row in await db.execute(video_owners({v for v, _ in inserted}))
+                }
+                await db.execute(add_votes_to_scores(dialect_name, self._score_totals(inserted, owners)))
+                await db.execute(add_votes_to_videos(self._video_totals(inserted)))
+            await self._commit(db)
+            return inserted
+
+    async def get_by_id(self, vote_id: int) -> Optional[Vote]:
+        """Obtiene un voto por ID"""
+        async with self._session() as db:
+            model = await db.get(VoteModel, vote_id)
+            return self._to_domain(model) if model else None
+
+    async def get_by_video(self, video_id: int) -> List[Vote]:
+        """Obtiene todos los votos de un video"""
+        async with self._session() as db:
+            result = await db.execute(select(VoteModel).where(VoteModel.video_id == video_id))
+            return [self._to_domain(model) for model in result.scalars().all()]
+
+    async def get_by_voter(self, player_id: int) -> List[Vote]:
+        """Obtiene todos los votos de un votante"""
+        async with self._session() as db:
+            result = await db.execute(select(VoteModel).where(VoteModel.player_id == player_id))
+            return [self._to_domain(model) for model in result.scalars().all()]
+
+    async def has_user_voted(self, video_id: int, player_id: int) -> bool:
+        """Verifica si un usuario ya votó por un video"""
+        async with self._session() as db:
+            result = await db.execute(
+                select(VoteModel.id).where(
+                    VoteModel.video_id == video_id,
+                    VoteModel.player_id == player_id
+                ).limit(1)
+            )
+            return result.first() is not None
+
+    async def count_votes_for_video(self, video_id: int) -> int:
+        """Cuenta el número de votos para un video"""
+        async with self._session() as db:
+            result = await db.execute(
+                select(func.count(VoteModel.id)).where(VoteModel.video_id == video_id)
+            )
+            return result.scalar_one()
+
+    async def delete(self, vote_id: int) -> bool:
+        """Elimina un voto y descuenta el punto del ranking y del contador del video en la misma transacción"""
+        async with self._session() as db:
+            model = await db.get(VoteModel, vote_id)
+            if model:
+                await db.delete(model)
+                await db.execute(remove_vote_from_score(model.video_id))
+                await db.execute(adjust_video_votes_count(model.video_id, -1))
+                await self._commit(db)
+                return True
+            return False
+
+    async def get_votes_by_videos(self, video_ids: List[int]) -> Dict[int, int]:
+        """Obtiene el conteo de votos para múltiples videos"""
+        async with self._session() as db:
+            result = await db.execute(
+                select(VoteModel.video_id, func.count(VoteModel.id).label('vote_count'))
+                .where(VoteModel.video_id.in_(video_ids))
+                .group_by(VoteModel.video_id)
+            )
+
+            # Crear diccionario con conteos
+            vote_counts = {video_id: 0 for video_id in video_ids}
+            for row in result:
+                vote_counts[row.video_id] = row.vote_count
+
+            return vote_counts
@@ -0,0 +1,34 @@
+from sqlalchemy.orm import Session
+from app.infrastructure.database.database import get_db
+from app.infrastructure.database.unit_of_work import current_session
+
+
+class BaseRepository:
+    """Base para repositorios con Session síncrona"""
+
+    def __init__(self, db: Session = None):
+        self._db = db
+
+    def _get_db(self) -> Session:
+        """Obtiene la sesión: la inyectada, la del request en curso o una nueva"""
+        if self._db:
+            return self._db
+        session = current_session()
+        if isinstance(session, Session):
+            return session
+        return next(get_db())
+
+    def _commit(self, db: Session) -> None:
+        """
+        Dentro de un request solo hace flush: la unidad de trabajo confirma
+        todo junto al final. Fuera de un request confirma de inmediato.
+        """
+        if db is current_session():
+            db.flush()
+        else:
+            db.commit()
+
+    def _release(self, db: Session) -> None:
+        """Cierra la sesión solo si la abrió este repositorio"""
+        if db is not self._db and db is not current_session():
+            db.close()
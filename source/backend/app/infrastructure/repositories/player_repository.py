@@ -1,26 +1,26 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 from app.domain.entities.player import Player
+from app.domain.entities.player_score import PlayerScore
 from app.domain.value_objects.email import Email
 from app.domain.value_objects.password import Password
 from app.domain.repositories.player_repository import PlayerRepositoryInterface
-from app.infrastructure.database.database import get_db
+from app.infrastructure.repositories.base_repository import BaseRepository
 from app.infrastructure.database.models import PlayerModel
+from app.infrastructure.repositories.player_score_statements import (
+    count_ranked_ahead,
+    player_score,
+    ranking_from_votes,
+    ranking_page,
+    sync_score_city,
+    sync_scores_from_votes,
+)
 from datetime import datetime
 
 
-class PlayerRepository(PlayerRepositoryInterface):
+class PlayerRepository(BaseRepository, PlayerRepositoryInterface):
     """Implementación del repositorio de jugadores usando PostgreSQL"""
     
-    def __init__(self, db: Session = None):
-        self._db = db
-    
-    def _get_db(self) -> Session:
-        """Obtiene la sesión de base de datos"""
-        if self._db:
-            return self._db
-        return next(get_db())
-    
     def _to_domain(self, model: PlayerModel) -> Player:
         """Convierte un modelo SQLAlchemy a entidad de dominio"""
         return Player(
@@ -67,12 +67,11 @@ class PlayerRepository(PlayerRepositoryInterface):
         try:
             model = self._to_model(player)
             db.add(model)
-            db.commit()
+            self._commit(db)
             db.refresh(model)
             return self._to_domain(model)
         finally:
-            if not self._db:
-                db.close()
+            self._release(db)
     
     async def get_by_id(self, player_id: int) -> Optional[Player]:
         """Obtiene un jugador por ID"""
@@ -81,8 +80,7 @@ class PlayerRepository(PlayerRepositoryInterface):
             model = db.query(PlayerModel).filter(PlayerModel.id == player_id).first()
             return self._to_domain(model) if model else None
         finally:
-            if not self._db:
-                db.close()
+            self._release(db)
     
     async def get_by_email(self, email: Email) -> Optional[Player]:
         """Obtiene un jugador por email"""
@@ -91,8 +89,7 @@ class PlayerRepository(PlayerRepositoryInterface):
             model = db.query(PlayerModel).filter(PlayerModel.email == email.value).first()
             return self._to_domain(model) if model else None
         finally:
-            if not self._db:
-                db.close()
+            self._release(db)
     
     async def update(self, player: Player) -> Player:
         """Actualiza un jugador"""
@@ -105,13 +102,13 @@ class PlayerRepository(PlayerRepositoryInterface):
                 model.city = player.city
                 model.country = player.country
                 model.is_active = player.is_active
-                db.commit()
+                db.execute(sync_score_city(player.id, player.city))
+                self._commit(db)
                 db.refresh(model)
                 return self._to_domain(model)
             return player
         finally:
-            if not self._db:
-                db.close()
+            self._release(db)
     
     async def delete(self, player_id: int) -> bool:
         """Elimina un jugador"""
@@ -120,23 +117,57 @@ class PlayerRepository(PlayerRepositoryInterface):
             model = db.query(PlayerModel).filter(PlayerModel.id == player_id).first()
             if model:
                 db.delete(model)
-                db.commit()
+                self._commit(db)
                 return True
             return False
         finally:
-            if not self._db:
-                db.close()
+            self._release(db)
+    
+    async def get_rankings(
+        self,
+        city: Optional[str] = None,
+        limit: Optional[int] = 100,
+        after: Optional[Tuple[int, int]] = None
+    ) -> List[PlayerScore]:
+        """
+        Obtiene el ranking desde la tabla materializada player_scores:
+        ORDER BY total_votes DESC LIMIT n sobre un índice, sin contar votos.
+        """
+        db = self._get_db()
+        try:
+            rows = db.execute(ranking_page(city, limit, after)).all()
+            return [PlayerScore(player=self._to_domain(model), total_votes=total_votes) for model, total_votes in rows]
+        finally:
+            self._release(db)
+    
+    async def get_rankings_from_votes(self, city: Optional[str] = None, limit: Optional[int] = None) -> List[PlayerScore]:
+        """Calcula el ranking desde los votos con un solo JOIN agrupado (un round-trip)"""
+        db = self._get_db()
+        try:
+            rows = db.execute(ranking_from_votes(city, limit)).all()
+            return [PlayerScore(player=self._to_domain(model), total_votes=total_votes) for model, total_votes in rows]
+        finally:
+            self._release(db)
+    
+    async def sync_scores_from_votes(self) -> int:
+        """Reescribe en player_scores los totales que difieren del conteo de votos (una sentencia)"""
+        db = self._get_db()
+        try:
+            corrected = db.execute(sync_scores_from_votes(db.get_bind().dialect.name)).rowcount
+            self._commit(db)
+            return corrected
+        finally:
+            self._release(db)
     
-    async def get_rankings(self, city: Optional[str] = None) -> List[Player]:
-        """Obtiene el ranking de jugadores"""
+    async def get_player_rank(self, player_id: int, city: Optional[str] = None) -> Optional[PlayerScore]:
+        """Obtiene la posición de un jugador contando solo los que tiene por delante"""
         db = self._get_db()
         try:
-            query = db.query(PlayerModel)
-            if city:
-                query = query.filter(PlayerModel.city == city)
-            # TODO: Ordenar por votos totales
-            models = query.all()
-            return [self._to_domain(model) for model in models]
+            row = db.execute(player_score(player_id, city)).first()
+            if not row:
+                return None
+            model, total_votes = row
+            ahead = db.execute(count_ranked_ahead(total_votes, player_id, city)).scalar_one()
+            return PlayerScore(player=self._to_domain(model), total_votes=total_votes, position=ahead + 1)
         finally:
-            if not self._db:
-                db.close()
+            self._release(db)
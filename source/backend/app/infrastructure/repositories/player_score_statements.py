@@ -0,0 +1,293 @@
+"""Sentencias para mantener los conteos de votos materializados (player_scores y videos.votes_count)"""
+
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import and_, case, func, literal, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from app.infrastructure.database.models import PlayerModel, PlayerScoreModel, VideoModel, VideoStatusEnum, VoteModel
+
+
+# INSERT ... ON CONFLICT depende del dialecto (PostgreSQL en producción, SQLite en tests)
+_DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def dialect_insert(dialect_name: str):
+    """Construcción INSERT con soporte de ON CONFLICT para el dialecto de la sesión"""
+    return _DIALECT_INSERTS.get(dialect_name, postgresql.insert)
+
+
+def _score_city():
+    """
+    Ciudad a copiar en player_scores.city (NOT NULL): players.city admite NULL en
+    registros heredados (init.sql), igual que COALESCE(city, '') en las migraciones
+    """
+    return func.coalesce(PlayerModel.city, "").label("city")
+
+
+def add_vote_to_score(dialect_name: str, video_id: int):
+    """
+    Suma un voto al dueño del video en una sola sentencia atómica
+    (INSERT ... SELECT ... ON CONFLICT DO UPDATE), sin carrera entre
+    dos requests que registran el primer voto del mismo jugador.
+    Retorna (RETURNING) el player_id del dueño.
+    """
+    insert = dialect_insert(dialect_name)
+    owner = (
+        select(VideoModel.player_id, _score_city(), literal(1))
+        .join(PlayerModel, PlayerModel.id == VideoModel.player_id)
+        .where(VideoModel.id == video_id)
+    )
+    statement = insert(PlayerScoreModel).from_select(
+        ["player_id", "city", "total_votes"], owner
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[PlayerScoreModel.player_id],
+        set_={
+            "total_votes": PlayerScoreModel.total_votes + 1,
+            "updated_at": func.now(),
+        }
+    ).returning(PlayerScoreModel.player_id)
+
+
+def seed_player_score(dialect_name: str, player_id: int):
+    """
+    Crea la fila del jugador en player_scores con 0 votos si aún no existe
+    (al publicarse su primer video), para que aparezca en el ranking sin votos.
+    """
+    insert = dialect_insert(dialect_name)
+    player = select(PlayerModel.id, _score_city(), literal(0)).where(PlayerModel.id == player_id)
+    return (
+        insert(PlayerScoreModel)
+        .from_select(["player_id", "city", "total_votes"], player)
+        .on_conflict_do_nothing(index_elements=[PlayerScoreModel.player_id])
+    )
+
+
+def insert_vote_if_eligible(dialect_name: str, video_id: int, player_id: int):
+    """
+    Registra un voto en una sola sentencia, sin check-then-insert:
+    INSERT ... SELECT ... WHERE status='processed' AND dueño <> votante
+    ON CONFLICT (video_id, player_id) DO NOTHING RETURNING id.
+    No retorna filas si el video no existe, no es votable, es propio o el voto ya existía.
+    """
+    insert = dialect_insert(dialect_name)
+    eligible_video = select(VideoModel.id, literal(player_id)).where(
+        VideoModel.id == video_id,
+        VideoModel.status == VideoStatusEnum.PROCESSED,
+        VideoModel.player_id != player_id
+    )
+    return (
+        insert(VoteModel)
+        .from_select(["video_id", "player_id"], eligible_video)
+        .on_conflict_do_nothing(index_elements=[VoteModel.video_id, VoteModel.player_id])
+        .returning(VoteModel.id)
+    )
+
+
+def cast_vote_in_one_statement(video_id: int, player_id: int):
+    """
+    Voto completo en un solo round-trip (solo PostgreSQL, CTEs que modifican datos):
+
+        WITH vote AS (INSERT INTO votes ... ON CONFLICT DO NOTHING RETURNING video_id),
+             score AS (INSERT INTO player_scores ... SELECT ... FROM vote ... ON CONFLICT DO UPDATE)
+        UPDATE videos SET votes_count = votes_count + 1 FROM vote
+        WHERE videos.id = vote.video_id RETURNING videos.player_id
+
+    Retorna el dueño del video, o ninguna fila si el voto no se registró
+    (en ese caso score y el UPDATE no tocan filas).
+    """
+    vote = (
+        insert_vote_if_eligible("postgresql", video_id, player_id)
+        .returning(VoteModel.video_id)
+        .cte("vote")
+    )
+    owner = (
+        select(VideoModel.player_id, _score_city(), literal(1))
+        .select_from(vote)
+        .join(VideoModel, VideoModel.id == vote.c.video_id)
+        .join(PlayerModel, PlayerModel.id == VideoModel.player_id)
+    )
+    score = postgresql.insert(PlayerScoreModel).from_select(
+        ["player_id", "city", "total_votes"], owner
+    )
+    score = score.on_conflict_do_update(
+        index_elements=[PlayerScoreModel.player_id],
+        set_={
+            "total_votes": PlayerScoreModel.total_votes + 1,
+            "updated_at": func.now(),
+        }
+    ).cte("score")
+    return (
+        update(VideoModel)
+        .where(VideoModel.id == vote.c.video_id)
+        .values(votes_count=VideoModel.votes_count + 1)
+        .returning(VideoModel.player_id)
+        .add_cte(score)
+    )
+
+
+def insert_votes_batch(dialect_name: str, votes: List[Tuple[int, int]]):
+    """
+    INSERT multi-fila de votos (video_id, player_id) ya validados, ignorando los
+    que violan unique_vote. Retorna (RETURNING) solo los pares insertados.
+    """
+    insert = dialect_insert(dialect_name)
+    return (
+        insert(VoteModel)
+        .values([{"video_id": video_id, "player_id": player_id} for video_id, player_id in votes])
+        .on_conflict_do_nothing(index_elements=[VoteModel.video_id, VoteModel.player_id])
+        .returning(VoteModel.video_id, VoteModel.player_id)
+    )
+
+
+def video_owners(video_ids: List[int]):
+    """SELECT del dueño y su ciudad para un conjunto de videos"""
+    return (
+        select(VideoModel.id, VideoModel.player_id, _score_city())
+        .join(PlayerModel, PlayerModel.id == VideoModel.player_id)
+        .where(VideoModel.id.in_(video_ids))
+    )
+
+
+def add_votes_to_scores(dialect_name: str, totals: Dict[int, Tuple[str, int]]):
+    """Suma en una sola sentencia los votos de un lote: {player_id: (city, votos)}"""
+    insert = dialect_insert(dialect_name)
+    statement = insert(PlayerScoreModel).values([
+        {"player_id": player_id, "city": city, "total_votes": votes}
+        for player_id, (city, votes) in totals.items()
+    ])
+    return statement.on_conflict_do_update(
+        index_elements=[PlayerScoreModel.player_id],
+        set_={
+            "total_votes": PlayerScoreModel.total_votes + statement.excluded.total_votes,
+            "updated_at": func.now(),
+        }
+    )
+
+
+def remove_vote_from_score(video_id: int):
+    """Resta un voto al dueño del video"""
+    owner_id = select(VideoModel.player_id).where(VideoModel.id == video_id).scalar_subquery()
+    return (
+        update(PlayerScoreModel)
+        .where(PlayerScoreModel.player_id == owner_id, PlayerScoreModel.total_votes > 0)
+        .values(total_votes=PlayerScoreModel.total_votes - 1, updated_at=func.now())
+    )
+
+
+def adjust_video_votes_count(video_id: int, delta: int):
+    """Suma (o resta) votos al contador desnormalizado del video, sin bajar de cero"""
+    return (
+        update(VideoModel)
+        .where(VideoModel.id == video_id, VideoModel.votes_count + delta >= 0)
+        .values(votes_count=VideoModel.votes_count + delta)
+    )
+
+
+def add_votes_to_videos(counts: Dict[int, int]):
+    """Suma en una sola sentencia los votos de un lote a cada video: {video_id: votos}"""
+    return (
+        update(VideoModel)
+        .where(VideoModel.id.in_(counts.keys()))
+        .values(votes_count=VideoModel.votes_count + case(counts, value=VideoModel.id, else_=0))
+    )
+
+
+def sync_score_city(player_id: int, city: str):
+    """Mantiene la ciudad desnormalizada cuando el jugador actualiza su perfil"""
+    return (
+        update(PlayerScoreModel)
+        .where(PlayerScoreModel.player_id == player_id, PlayerScoreModel.city != city)
+        .values(city=city)
+    )
+
+
+def ranking_page(city: Optional[str] = None, limit: Optional[int] = None, after: Optional[Tuple[int, int]] = None):
+    """
+    SELECT del ranking ordenado por (total_votes DESC, player_id) sobre los índices
+    de player_scores. after=(total_votes, player_id) continúa después de esa fila
+    (keyset), sin OFFSET.
+    """
+    query = select(PlayerModel, PlayerScoreModel.total_votes).join(
+        PlayerScoreModel, PlayerScoreModel.player_id == PlayerModel.id
+    )
+    if city:
+        query = query.where(PlayerScoreModel.city == city)
+    if after is not None:
+        total_votes, player_id = after
+        query = query.where(or_(
+            PlayerScoreModel.total_votes < total_votes,
+            and_(PlayerScoreModel.total_votes == total_votes, PlayerScoreModel.player_id > player_id)
+        ))
+    return query.order_by(PlayerScoreModel.total_votes.desc(), PlayerScoreModel.player_id).limit(limit)
+
+
+def player_score(player_id: int, city: Optional[str] = None):
+    """SELECT del puntaje de un jugador (opcionalmente dentro de una ciudad)"""
+    query = select(PlayerModel, PlayerScoreModel.total_votes).join(
+        PlayerScoreModel, PlayerScoreModel.player_id == PlayerModel.id
+    ).where(PlayerScoreModel.player_id == player_id)
+    if city:
+        query = query.where(PlayerScoreModel.city == city)
+    return query
+
+
+def count_ranked_ahead(total_votes: int, player_id: int, city: Optional[str] = None):
+    """Cuenta los jugadores por delante de (total_votes, player_id) usando el índice del ranking"""
+    query = select(func.count()).select_from(PlayerScoreModel).where(or_(
+        PlayerScoreModel.total_votes > total_votes,
+        and_(PlayerScoreModel.total_votes == total_votes, PlayerScoreModel.player_id < player_id)
+    ))
+    if city:
+        query = query.where(PlayerScoreModel.city == city)
+    return query
+
+
+def ranking_from_votes(city: Optional[str] = None, limit: Optional[int] = None):
+    """
+    Ranking calculado directamente desde los votos: un solo JOIN agrupado
+    players ⋈ videos ⟕ votes sobre todos los videos procesados (sin N+1 ni
+    truncar a una página de videos). Es la fuente de verdad de player_scores
+    (sync_scores_from_votes la escribe de vuelta); /public/rankings sigue leyendo
+    player_scores y esta consulta solo alimenta la reconciliación.
+    El LEFT JOIN conserva con 0 votos a los jugadores con videos procesados sin votar.
+    """
+    total_votes = func.count(VoteModel.id).label("total_votes")
+    query = (
+        select(PlayerModel, total_votes)
+        .join(VideoModel, VideoModel.player_id == PlayerModel.id)
+        .outerjoin(VoteModel, VoteModel.video_id == VideoModel.id)
+        .where(VideoModel.status == VideoStatusEnum.PROCESSED)
+    )
+    if city:
+        query = query.where(PlayerModel.city == city)
+    return query.group_by(PlayerModel.id).order_by(total_votes.desc(), PlayerModel.id).limit(limit)
+
+
+def sync_scores_from_votes(dialect_name: str):
+    """
+    Corrige el drift de player_scores con el mismo JOIN agrupado de ranking_from_votes:
+    INSERT ... SELECT ... ON CONFLICT DO UPDATE ... WHERE total_votes <> EXCLUDED.total_votes,
+    así solo se escriben las filas que difieren del conteo real de votos.
+    """
+    insert = dialect_insert(dialect_name)
+    totals = (
+        select(PlayerModel.id, _score_city(), func.count(VoteModel.id))
+        .join(VideoModel, VideoModel.player_id == PlayerModel.id)
+        .outerjoin(VoteModel, VoteModel.video_id == VideoModel.id)
+        .where(VideoModel.status == VideoStatusEnum.PROCESSED)
+        .group_by(PlayerModel.id)
+    )
+    statement = insert(PlayerScoreModel).from_select(
+        ["player_id", "city", "total_votes"], totals
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[PlayerScoreModel.player_id],
+        set_={
+            "total_votes": statement.excluded.total_votes,
+            "updated_at": func.now(),
+        },
+        where=PlayerScoreModel.total_votes != statement.excluded.total_votes
+    )
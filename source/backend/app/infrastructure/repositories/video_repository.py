@@ -1,24 +1,17 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 from app.domain.entities.video import Video, VideoStatus
 from app.domain.repositories.video_repository import VideoRepositoryInterface
-from app.infrastructure.database.database import get_db
+from app.infrastructure.repositories.base_repository import BaseRepository
 from app.infrastructure.database.models import VideoModel, VideoStatusEnum
+from app.infrastructure.repositories.player_score_statements import seed_player_score
 from datetime import datetime
 
 
-class VideoRepository(VideoRepositoryInterface):
+class VideoRepository(BaseRepository, VideoRepositoryInterface):
     """Implementación del repositorio de videos usando PostgreSQL"""
     
-    def __init__(self, db: Session = None):
-        self._db = db
-    
-    def _get_db(self) -> Session:
-        """Obtiene la sesión de base de datos"""
-        if self._db:
-            return self._db
-        return next(get_db())
-    
     def _to_domain(self, model: VideoModel) -> Video:
         """Convierte un modelo SQLAlchemy a entidad de dominio"""
         # Convertir el string de la BD al enum de dominio
@@ -37,7 +30,8 @@ class VideoRepository(VideoRepositoryInterface):
             original_url=model.original_url,
             processed_url=model.processed_url,
             uploaded_at=model.uploaded_at,
-            processed_at=model.processed_at
+            processed_at=model.processed_at,
+            votes_count=model.votes_count or 0
         )
     
     def _to_model(self, video: Video) -> VideoModel:
@@ -78,12 +72,11 @@ class VideoRepository(VideoRepositoryInterface):
         try:
             model = self._to_model(video)
             db.add(model)
-            db.commit()
+            self._commit(db)
             db.refresh(model)
             return self._to_domain(model)
         finally:
-            if not self._db:
-                db.close()
+            self._release(db)
     
     async def get_by_id(self, video_id: int) -> Optional[Video]:
         """Obtiene un video por ID"""
@@ -92,8 +85,7 @@ class VideoRepository(VideoRepositoryInterface):
             model = db.query(VideoModel).filter(VideoModel.id == video_id).first()
             return self._to_domain(model) if model else None
         finally:
-            if not self._db:
-                db.close()
+            self._release(db)
     
     async def get_by_player(self, player_id: int) -> List[Video]:
         """Obtiene todos los videos de un jugador"""
@@ -102,20 +94,38 @@ class VideoRepository(VideoRepositoryInterface):
             models = db.query(VideoModel).filter(VideoModel.player_id == player_id).all()
             return [self._to_domain(model) for model in models]
         finally:
-            if not self._db:
-                db.close()
+            self._release(db)
     
-    async def get_public_videos(self, skip: int = 0, limit: int = 100) -> List[Video]:
-        """Obtiene videos públicos para votación con paginación a nivel de BD"""
+    async def get_public_videos(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Video]:
+        """
+        Obtiene videos públicos para votación con paginación a nivel de BD.
+        Con after=(uploaded_at, id) la página se busca por keyset sobre
+        idx_videos_status_uploaded: el costo no crece con la profundidad.
+        """
         db = self._get_db()
         try:
-            models = db.query(VideoModel).filter(
-                VideoModel.status == 'processed'
-            ).order_by(VideoModel.uploaded_at.desc()).offset(skip).limit(limit).all()
+            query = db.query(VideoModel).filter(VideoModel.status == 'processed')
+            if after is not None:
+                query = query.filter(tuple_(VideoModel.uploaded_at, VideoModel.id) < tuple_(*after))
+            elif skip:
+                query = query.offset(skip)
+            models = query.order_by(VideoModel.uploaded_at.desc(), VideoModel.id.desc()).limit(limit).all()
             return [self._to_domain(model) for model in models]
         finally:
-            if not self._db:
-                db.close()
+            self._release(db)
+    
+    async def get_votes_count(self, video_id: int) -> Optional[int]:
+        """Lee el contador desnormalizado de votos (sin COUNT(*) sobre votes)"""
+        db = self._get_db()
+        try:
+            return db.query(VideoModel.votes_count).filter(VideoModel.id == video_id).scalar()
+        finally:
+            self._release(db)
     
     async def update(self, video: Video) -> Video:
         """Actualiza un video"""
@@ -134,13 +144,15 @@ class VideoRepository(VideoRepositoryInterface):
                 model.original_url = video.original_url
                 model.processed_url = video.processed_url
                 model.processed_at = video.processed_at
-                db.commit()
+                if model.status == VideoStatusEnum.PROCESSED:
+                    # El jugador entra al ranking (con 0 votos) al publicar un video
+                    db.execute(seed_player_score(db.get_bind().dialect.name, model.player_id))
+                self._commit(db)
                 db.refresh(model)
                 return self._to_domain(model)
             return video
         finally:
-            if not self._db:
-                db.close()
+            self._release(db)
     
     async def delete(self, video_id: int) -> bool:
         """Elimina un video"""
@@ -149,10 +161,9 @@ class VideoRepository(VideoRepositoryInterface):
             model = db.query(VideoModel).filter(VideoModel.id == video_id).first()
             if model:
                 db.delete(model)
-                db.commit()
+                self._commit(db)
                 return True
             return False
         finally:
-            if not self._db:
-                db.close()
+            self._release(db)
     
@@ -1,24 +1,26 @@
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from sqlalchemy.orm import Session
 from app.domain.entities.vote import Vote
 from app.domain.repositories.vote_repository import VoteRepositoryInterface
-from app.infrastructure.database.database import get_db
+from app.infrastructure.repositories.base_repository import BaseRepository
 from app.infrastructure.database.models import VoteModel
+from app.infrastructure.repositories.player_score_statements import (
+    add_vote_to_score,
+    add_votes_to_scores,
+    add_votes_to_videos,
+    adjust_video_votes_count,
+    cast_vote_in_one_statement,
+    insert_vote_if_eligible,
+    insert_votes_batch,
+    remove_vote_from_score,
+    video_owners,
+)
 from datetime import datetime
 
 
-class VoteRepository(VoteRepositoryInterface):
+class VoteRepository(BaseRepository, VoteRepositoryInterface):
     """Implementación del repositorio de votos usando PostgreSQL"""
     
-    def __init__(self, db: Session = None):
-        self._db = db
-    
-    def _get_db(self) -> Session:
-        """Obtiene la sesión de base de datos"""
-        if self._db:
-            return self._db
-        return next(get_db())
-    
     def _to_domain(self, model: VoteModel) -> Vote:
         """Convierte un modelo SQLAlchemy a entidad de dominio"""
         return Vote(
@@ -50,17 +52,76 @@ class VoteRepository(VoteRepositoryInterface):
         return VoteModel(**model_data)
     
     async def create(self, vote: Vote) -> Vote:
-        """Crea un nuevo voto"""
+        """Crea un nuevo voto y suma el punto al ranking y al contador del video en la misma transacción"""
         db = self._get_db()
         try:
             model = self._to_model(vote)
             db.add(model)
-            db.commit()
+            db.flush()
+            db.execute(add_vote_to_score(db.get_bind().dialect.name, vote.video_id))
+            db.execute(adjust_video_votes_count(vote.video_id, 1))
+            self._commit(db)
             db.refresh(model)
             return self._to_domain(model)
         finally:
-            if not self._db:
-                db.close()
+            self._release(db)
+    
+    async def cast_vote(self, video_id: int, player_id: int) -> Optional[int]:
+        """Registra el voto con un INSERT condicional y suma el punto al ranking y al contador del video en la misma transacción"""
+        db = self._get_db()
+        try:
+            dialect_name = db.get_bind().dialect.name
+            if dialect_name == "postgresql":
+                # Un solo round-trip: voto, ranking y contador encadenados en CTEs
+                owner_id = db.execute(cast_vote_in_one_statement(video_id, player_id)).scalar()
+                if owner_id is not None:
+                    self._commit(db)
+                return owner_id
+
+            # Otros dialectos (SQLite en tests) no soportan DML dentro de CTEs
+            vote_id = db.execute(insert_vote_if_eligible(dialect_name, video_id, player_id)).scalar()
+            if vote_id is None:
+                return None
+            owner_id = db.execute(add_vote_to_score(dialect_name, video_id)).scalar()
+            db.execute(adjust_video_votes_count(video_id, 1))
+            self._commit(db)
+            return owner_id
+        finally:
+            self._release(db)
+    
+    async def cast_votes_batch(self, votes: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Inserta un lote de votos con un INSERT multi-fila y un solo commit"""
+        if not votes:
+            return []
+        db = self._get_db()
+        try:
+            dialect_name = db.get_bind().dialect.name
+            inserted = [tuple(row) for row in db.execute(insert_votes_batch(dialect_name, votes)).all()]
+            if inserted:
+                owners = {row.id: (row.player_id, row.city) for row in db.execute(video_owners({v for v, _ in inserted}))}
+                db.execute(add_votes_to_scores(dialect_name, self._score_totals(inserted, owners)))
+                db.execute(add_votes_to_videos(self._video_totals(inserted)))
+            self._commit(db)
+            return inserted
+        finally:
+            self._release(db)
+    
+    @staticmethod
+    def _score_totals(inserted: List[Tuple[int, int]], owners: Dict[int, Tuple[int, str]]) -> Dict[int, Tuple[str, int]]:
+        """Agrupa los votos insertados por dueño del video: {player_id: (city, votos)}"""
+        totals: Dict[int, Tuple[str, int]] = {}
+        for video_id, _ in inserted:
+            owner_id, city = owners[video_id]
+            totals[owner_id] = (city, totals.get(owner_id, (city, 0))[1] + 1)
+        return totals
+    
+    @staticmethod
+    def _video_totals(inserted: List[Tuple[int, int]]) -> Dict[int, int]:
+        """Agrupa los votos insertados por video: {video_id: votos}"""
+        totals: Dict[int, int] = {}
+        for video_id, _ in inserted:
+            totals[video_id] = totals.get(video_id, 0) + 1
+        return totals
     
     async def get_by_id(self, vote_id: int) -> Optional[Vote]:
         """Obtiene un voto por ID"""
@@ -69,8 +130,7 @@ class VoteRepository(VoteRepositoryInterface):
             model = db.query(VoteModel).filter(VoteModel.id == vote_id).first()
             return self._to_domain(model) if model else None
         finally:
-            if not self._db:
-                db.close()
+            self._release(db)
     
     async def get_by_video(self, video_id: int) -> List[Vote]:
         """Obtiene todos los votos de un video"""
@@ -79,8 +139,7 @@ class VoteRepository(VoteRepositoryInterface):
             models = db.query(VoteModel).filter(VoteModel.video_id == video_id).all()
             return [self._to_domain(model) for model in models]
         finally:
-            if not self._db:
-                db.close()
+            self._release(db)
     
     async def get_by_voter(self, player_id: int) -> List[Vote]:
         """Obtiene todos los votos de un votante"""
@@ -89,8 +148,7 @@ class VoteRepository(VoteRepositoryInterface):
             models = db.query(VoteModel).filter(VoteModel.player_id == player_id).all()
             return [self._to_domain(model) for model in models]
         finally:
-            if not self._db:
-                db.close()
+            self._release(db)
     
     async def has_user_voted(self, video_id: int, player_id: int) -> bool:
         """Verifica si un usuario ya votó por un video"""
@@ -102,8 +160,7 @@ class VoteRepository(VoteRepositoryInterface):
             ).first()
             return vote is not None
         finally:
-            if not self._db:
-                db.close()
+            self._release(db)
     
     async def count_votes_for_video(self, video_id: int) -> int:
         """Cuenta el número de votos para un video"""
@@ -112,22 +169,22 @@ class VoteRepository(VoteRepositoryInterface):
             count = db.query(VoteModel).filter(VoteModel.video_id == video_id).count()
             return count
         finally:
-            if not self._db:
-                db.close()
+            self._release(db)
     
     async def delete(self, vote_id: int) -> bool:
-        """Elimina un voto"""
+        """Elimina un voto y descuenta el punto del ranking y del contador del video en la misma transacción"""
         db = self._get_db()
         try:
             model = db.query(VoteModel).filter(VoteModel.id == vote_id).first()
             if model:
                 db.delete(model)
-                db.commit()
+                db.execute(remove_vote_from_score(model.video_id))
+                db.execute(adjust_video_votes_count(model.video_id, -1))
+                self._commit(db)
                 return True
             return False
         finally:
-            if not self._db:
-                db.close()
+            self._release(db)
     
     async def get_votes_by_videos(self, video_ids: List[int]) -> Dict[int, int]:
         """Obtiene el conteo de votos para múltiples videos"""
@@ -148,5 +205,4 @@ class VoteRepository(VoteRepositoryInterface):
             
             return vote_counts
         finally:
-            if not self._db:
-                db.close()
+            self._release(db)
@@ -166,6 +166,10 @@ os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
 if settings.FILE_STORAGE_TYPE.value == "local":
     app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
 
+# Sesión de BD por request compartida por todos los repositorios (unidad de trabajo)
+from app.infrastructure.database.unit_of_work import unit_of_work_middleware
+app.middleware("http")(unit_of_work_middleware())
+
 # Incluir routers
 from app.routers import auth, videos, public
 
@@ -190,14 +194,27 @@ async def start_heartbeat_metrics():
                 await asyncio.sleep(300)  # Publicar cada 5 minutos (optimizado para costos)
 
                 # Solo publicar heartbeat para confirmar que el servicio está activo
+                metric_data = [{
+                    'MetricName': 'ServiceHeartbeat',
+                    'Value': 1,
+                    'Unit': MetricUnit.COUNT.value,
+                    'Dimensions': [{"Name": "MetricType", "Value": "Health"}]
+                }]
+
+                # Cola máxima del pool de bcrypt en el intervalo (detecta ráfagas de login)
+                from app.shared.container import container
+                password_hasher = container.get_password_hasher()
+                if password_hasher:
+                    metric_data.append({
+                        'MetricName': 'PasswordHashQueueDepth',
+                        'Value': password_hasher.reset_peak_queue_depth(),
+                        'Unit': MetricUnit.COUNT.value,
+                        'Dimensions': [{"Name": "MetricType", "Value": "Auth"}]
+                    })
+
                 cw_client.put_metric_data(
                     Namespace=CLOUDWATCH_NAMESPACE,
-                    MetricData=[{
-                        'MetricName': 'ServiceHeartbeat',
-                        'Value': 1,
-                        'Unit': MetricUnit.COUNT.value,
-                        'Dimensions': [{"Name": "MetricType", "Value": "Health"}]
-                    }]
+                    MetricData=metric_data
                 )
 
                 logger.debug(f"[HEARTBEAT] Service is alive")
@@ -209,6 +226,49 @@ async def start_heartbeat_metrics():
     asyncio.create_task(publish_heartbeat())
     logger.info("Heartbeat metrics background task started (5min interval - cost optimized)")
 
+# ===== RANKING EN MEMORIA (Background Task) =====
+@app.on_event("startup")
+async def start_leaderboard():
+    """Inicia la reconciliación periódica del ranking en memoria contra la BD"""
+    from app.shared.container import container
+    leaderboard = container.get_leaderboard_service()
+    if leaderboard:
+        leaderboard.start()
+
+@app.on_event("shutdown")
+async def stop_leaderboard():
+    """Detiene la reconciliación del ranking en memoria"""
+    from app.shared.container import container
+    leaderboard = container.get_leaderboard_service()
+    if leaderboard:
+        await leaderboard.stop()
+
+# ===== BUFFER DE VOTOS (Background Task) =====
+@app.on_event("startup")
+async def start_vote_buffer():
+    """Inicia la escritura periódica de votos en lotes"""
+    from app.shared.container import container
+    vote_buffer = container.get_vote_buffer_service()
+    if vote_buffer:
+        vote_buffer.start()
+
+@app.on_event("shutdown")
+async def stop_vote_buffer():
+    """Escribe los votos pendientes antes de apagar"""
+    from app.shared.container import container
+    vote_buffer = container.get_vote_buffer_service()
+    if vote_buffer:
+        await vote_buffer.stop()
+
+# ===== POOL DE HASHING DE CONTRASEÑAS =====
+@app.on_event("shutdown")
+async def stop_password_hasher():
+    """Libera los workers del pool de bcrypt"""
+    from app.shared.container import container
+    password_hasher = container.get_password_hasher()
+    if password_hasher:
+        password_hasher.shutdown()
+
 @app.get("/")
 def read_root():
     return {
@@ -225,11 +285,14 @@ async def metrics():
     Endpoint de compatibilidad con Prometheus (deprecado)
     Las métricas ahora se publican a CloudWatch automáticamente
     """
+    from app.shared.container import container
+    password_hasher = container.get_password_hasher()
     return {
         "message": "Metrics migrated to CloudWatch",
         "namespace": os.getenv("CLOUDWATCH_NAMESPACE", "ANB/Backend"),
         "service": "API",
-        "documentation": "Check AWS CloudWatch console for metrics"
+        "documentation": "Check AWS CloudWatch console for metrics",
+        "password_hashing": password_hasher.stats() if password_hasher else None
     }
 
 @app.get("/health")
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Annotated, List, Optional
 
@@ -7,6 +7,8 @@ from app.services.video_service import VideoService
 from app.services.player_service import PlayerService
 from app.shared.container import container
 from app.shared.dependencies.auth_dependencies import get_current_player_id
+from app.shared.exceptions.player_exceptions import PlayerNotFoundException
+from app.shared.utils.cursors import InvalidCursorError
 
 router = APIRouter(prefix="/public", tags=["endpoints públicos"])
 security = HTTPBearer()
@@ -24,19 +26,27 @@ def get_player_service() -> PlayerService:
 
 @router.get("/videos", response_model=List[VideoListItemDTO])
 async def list_videos_for_voting(
-    skip: int = Query(0, ge=0, description="Número de registros a saltar"),
+    response: Response,
+    skip: int = Query(0, ge=0, description="Número de registros a saltar (preferir cursor)"),
     limit: int = Query(50, ge=1, le=100, description="Número máximo de registros a retornar (máx: 100)"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (header X-Next-Cursor)"),
     video_service: Annotated[VideoService, Depends(get_video_service)] = None
 ):
     """
     Lista los videos públicos habilitados para votación con paginación.
     Este endpoint es público y no requiere autenticación.
     Solo retorna videos en estado 'processed'.
-    OPTIMIZADO: Incluye paginación para evitar cargar todos los videos de una vez.
+    OPTIMIZADO: Paginación por keyset sobre (uploaded_at, id): si hay más videos, el header
+    X-Next-Cursor trae el cursor de la página siguiente y cada página cuesta lo mismo
+    sin importar su profundidad (skip se mantiene por compatibilidad).
     """
     try:
         # La paginación se hace a nivel de base de datos para mejor performance
-        videos = await video_service.get_public_videos(skip=skip, limit=limit)
+        videos = await video_service.get_public_videos(skip=skip, limit=limit, cursor=cursor)
+
+        next_cursor = video_service.next_public_videos_cursor(videos, limit)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
 
         return [
             VideoListItemDTO(
@@ -49,6 +59,8 @@ async def list_videos_for_voting(
             )
             for video in videos
         ]
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
@@ -79,16 +91,21 @@ async def vote_for_video(
 
 @router.get("/rankings", response_model=List[RankingItemDTO])
 async def get_rankings(
+    response: Response,
     city: Optional[str] = Query(None, description="Filtrar por ciudad"),
-    player_service: Annotated[PlayerService, Depends(get_player_service)] = None,
-    video_service: Annotated[VideoService, Depends(get_video_service)] = None
+    limit: int = Query(100, ge=1, le=1000, description="Número máximo de posiciones a retornar (máx: 1000)"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (header X-Next-Cursor)"),
+    player_service: Annotated[PlayerService, Depends(get_player_service)] = None
 ):
     """
     Provee un ranking actualizado de los jugadores.
     - Organiza a los competidores por el número de votos obtenidos.
     - Puede incluir un parámetro de consulta 'city' para filtrar los resultados.
+    - Paginado: si hay más posiciones, el header X-Next-Cursor trae el cursor de la página siguiente.
     - Este endpoint es público.
-    OPTIMIZADO: Reduce N+1 queries usando batch loading de jugadores.
+    OPTIMIZADO: Lee la tabla materializada player_scores (ORDER BY total_votes DESC LIMIT n
+    sobre un índice), que se actualiza en la misma transacción de cada voto. La paginación
+    es por keyset (votos, player_id), sin OFFSET.
     """
     try:
         if city is not None and city.strip() == "":
@@ -97,55 +114,58 @@ async def get_rankings(
                 detail="Parámetro inválido en la consulta."
             )
 
-        # Obtener todos los videos con sus votos
-        videos_with_votes = await video_service.get_videos_with_votes()
-
-        # Agrupar por jugador y sumar votos
-        player_votes = {}
-        player_ids = set()
-        for video_data in videos_with_votes:
-            video = video_data["video"]
-            votes_count = video_data["votes_count"]
-            player_ids.add(video.player_id)
-            if video.player_id not in player_votes:
-                player_votes[video.player_id] = 0
-            player_votes[video.player_id] += votes_count
-
-        # OPTIMIZACIÓN: Obtener todos los jugadores en una sola query batch
-        players_dict = {}
-        for player_id in player_ids:
-            player = await player_service.get_player_by_id(player_id)
-            if player:
-                players_dict[player_id] = player
-
-        # Construir rankings filtrando por ciudad si es necesario
-        rankings = []
-        for player_id, total_votes in player_votes.items():
-            player = players_dict.get(player_id)
-            if player and (city is None or player.city == city):
-                rankings.append({
-                    "player_id": player.id,
-                    "username": player.username,
-                    "city": player.city,
-                    "votes": total_votes
-                })
-
-        # Ordenar por votos descendente
-        rankings.sort(key=lambda x: x["votes"], reverse=True)
-
-        # Asignar posiciones
-        result = []
-        for idx, ranking in enumerate(rankings, start=1):
-            result.append(RankingItemDTO(
-                position=idx,
+        rankings = await player_service.get_rankings(city=city, limit=limit, cursor=cursor)
+
+        next_cursor = player_service.next_rankings_cursor(rankings, limit)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+
+        return [
+            RankingItemDTO(
+                position=ranking["position"],
                 username=ranking["username"],
                 city=ranking["city"],
                 votes=ranking["votes"]
-            ))
-
-        return result
+            )
+            for ranking in rankings
+        ]
     except HTTPException:
         raise
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
+
+@router.get("/rankings/{player_id}", response_model=RankingItemDTO)
+async def get_player_rank(
+    player_id: int,
+    city: Optional[str] = Query(None, description="Posición dentro del ranking de una ciudad"),
+    player_service: Annotated[PlayerService, Depends(get_player_service)] = None
+):
+    """
+    Obtiene la posición de un jugador en el ranking (global o de su ciudad)
+    sin construir el ranking completo.
+    - Este endpoint es público.
+    """
+    try:
+        if city is not None and city.strip() == "":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Parámetro inválido en la consulta."
+            )
+
+        ranking = await player_service.get_player_rank(player_id, city=city)
+
+        return RankingItemDTO(
+            position=ranking["position"],
+            username=ranking["username"],
+            city=ranking["city"],
+            votes=ranking["votes"]
+        )
+    except HTTPException:
+        raise
+    except PlayerNotFoundException:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Jugador sin posición en el ranking.")
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
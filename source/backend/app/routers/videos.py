@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Response
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Request, Response
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Annotated, List
 import uuid
 
 from app.dtos.video_dtos import (
-    VideoUploadResponseDTO, VideoListItemDTO, VideoDetailDTO, VideoDeleteResponseDTO
+    VideoUploadResponseDTO, VideoListItemDTO, VideoDetailDTO, VideoDeleteResponseDTO,
+    VideoPresignedUploadRequestDTO, VideoPresignedUploadResponseDTO
 )
+from app.config.settings import settings
 from app.services.video_service import VideoService
 from app.shared.container import container
 from app.shared.dependencies.auth_dependencies import get_current_player_id
+from app.shared.interfaces.file_storage import StoredFile
+from app.shared.utils.http_ranges import (
+    RangeNotSatisfiableError, format_http_date, if_range_matches, is_not_modified, parse_range_header
+)
 from app.shared.exceptions.video_exceptions import (
     VideoNotFoundException, VideoNotOwnedException, VideoCannotBeDeletedException
 )
@@ -22,6 +29,78 @@ def get_video_service() -> VideoService:
     return container.get_video_service()
 
 
+def _build_video_response(
+    video_service: VideoService, stored_file: StoredFile, download_name: str, request: Request
+) -> Response:
+    """
+    Construye la respuesta de descarga sin cargar el video en memoria:
+    - URL presignada (S3 en modo redirect): 302; S3 atiende Range y condicionales directamente
+    - If-None-Match / If-Modified-Since coinciden: 304 sin cuerpo
+    - Header Range válido (y If-Range vigente): 206 con solo los bytes pedidos
+    - En otro caso: archivo completo (FileResponse en local, passthrough por chunks en S3)
+    """
+    if stored_file.url:
+        # La URL presignada expira: no cachear la redirección
+        return RedirectResponse(
+            url=stored_file.url,
+            status_code=status.HTTP_302_FOUND,
+            headers={"Cache-Control": "no-store"}
+        )
+
+    headers = {
+        "Content-Disposition": f"inline; filename={download_name}",
+        "Cache-Control": "public, max-age=3600",
+        "Accept-Ranges": "bytes"
+    }
+    if stored_file.etag:
+        headers["ETag"] = stored_file.etag
+    if stored_file.last_modified:
+        headers["Last-Modified"] = format_http_date(stored_file.last_modified)
+
+    if is_not_modified(
+        request.headers.get("if-none-match"),
+        request.headers.get("if-modified-since"),
+        stored_file.etag,
+        stored_file.last_modified
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    size = stored_file.size
+    range_header = request.headers.get("range")
+    if range_header and size is not None and if_range_matches(
+        request.headers.get("if-range"), stored_file.etag, stored_file.last_modified
+    ):
+        try:
+            byte_range = parse_range_header(range_header, size)
+        except RangeNotSatisfiableError:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={"Content-Range": f"bytes */{size}", "Accept-Ranges": "bytes"}
+            )
+
+        if byte_range:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            headers["Content-Length"] = str(end - start + 1)
+            return StreamingResponse(
+                video_service.iter_video_content(stored_file, start=start, end=end),
+                status_code=status.HTTP_206_PARTIAL_CONTENT,
+                media_type="video/mp4",
+                headers=headers
+            )
+
+    if stored_file.path:
+        return FileResponse(stored_file.path, media_type="video/mp4", headers=headers)
+
+    if size is not None:
+        headers["Content-Length"] = str(size)
+    return StreamingResponse(
+        video_service.iter_video_content(stored_file),
+        media_type="video/mp4",
+        headers=headers
+    )
+
+
 @router.post("/upload", response_model=VideoUploadResponseDTO, status_code=status.HTTP_201_CREATED)
 async def upload_video(
     title: str = Form(...),
@@ -70,6 +149,69 @@ async def upload_video(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+@router.post("/upload/presigned", response_model=VideoPresignedUploadResponseDTO, status_code=status.HTTP_201_CREATED)
+async def create_presigned_upload(
+    upload_request: VideoPresignedUploadRequestDTO,
+    player_id: int = Depends(get_current_player_id),
+    video_service: Annotated[VideoService, Depends(get_video_service)] = None
+):
+    """
+    Paso 1 de la subida directa a S3.
+    Registra el video y retorna un formulario POST presignado para subir el
+    archivo directo al bucket (original/{video_id}.mp4) sin pasar por la API.
+    Después de subirlo se debe llamar a POST /videos/{video_id}/finalize.
+    """
+    try:
+        video, upload_target = await video_service.create_direct_upload(
+            player_id=player_id,
+            title=upload_request.title,
+            filename=upload_request.filename,
+            content_type=upload_request.content_type
+        )
+
+        return VideoPresignedUploadResponseDTO(
+            video_id=video.id,
+            upload_url=upload_target["url"],
+            fields=upload_target["fields"],
+            expires_in=settings.S3_PRESIGNED_URL_EXPIRATION
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.post("/{video_id}/finalize", response_model=VideoUploadResponseDTO)
+async def finalize_presigned_upload(
+    video_id: int,
+    player_id: int = Depends(get_current_player_id),
+    video_service: Annotated[VideoService, Depends(get_video_service)] = None
+):
+    """
+    Paso 2 de la subida directa a S3.
+    Verifica que el archivo exista en el bucket e inicia el procesamiento asíncrono.
+    """
+    try:
+        await video_service.finalize_direct_upload(video_id, player_id)
+
+        return VideoUploadResponseDTO(
+            message="Video subido correctamente. Procesamiento en curso.",
+            task_id=str(uuid.uuid4())
+        )
+    except VideoNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except VideoNotOwnedException as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
 @router.get("", response_model=List[VideoListItemDTO])
 async def get_my_videos(
     player_id: int = Depends(get_current_player_id),
@@ -116,14 +258,11 @@ async def get_specific_video(
         
         video = await video_service.get_video(video_id, player_id)
         
-        # Obtener el conteo de votos dinámicamente
-        votes_count = await video_service.get_video_votes_count(video_id)
-        
         return VideoDetailDTO(
             video_id=video.id,
             title=video.title,
             status=video.status.value,
-            votes=votes_count,
+            votes=video.votes_count,
             original_url=video.original_url,
             processed_url=video.processed_url,
             uploaded_at=video.uploaded_at,
@@ -189,31 +328,21 @@ async def delete_video(
 @router.get("/original/{video_id}")
 async def get_original_video(
     video_id: int,
+    request: Request,
     player_id: int = Depends(get_current_player_id),
     video_service: Annotated[VideoService, Depends(get_video_service)] = None
 ):
     """
     Obtiene el video original del jugador.
-    Retorna el archivo de video en su formato original.
+    Retorna el archivo de video en su formato original por streaming
+    (o redirección 302 a una URL presignada si el almacenamiento es S3).
+    Soporta Range (206), ETag/Last-Modified e If-None-Match/If-Range.
     """
     try:
-        # Obtener el video para verificar permisos
-        video = await video_service.get_video(video_id, player_id)
+        # Verifica permisos y obtiene el descriptor del video original (sin leer su contenido)
+        stored_file = await video_service.get_original_video(video_id, player_id)
         
-        # Obtener el contenido del video original
-        video_content = await video_service.get_original_video(video_id, player_id)
-        
-        # Determinar el tipo de contenido basado en la extensión del archivo
-        content_type = "video/mp4"  # Default
-        
-        return Response(
-            content=video_content,
-            media_type=content_type,
-            headers={
-                "Content-Disposition": f"inline; filename={video.id}",
-                "Cache-Control": "public, max-age=3600"
-            }
-        )
+        return _build_video_response(video_service, stored_file, f"{video_id}", request)
     except VideoNotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except VideoNotOwnedException as e:
@@ -237,31 +366,21 @@ async def get_original_video(
 @router.get("/processed/{video_id}")
 async def get_processed_video(
     video_id: int,
+    request: Request,
     player_id: int = Depends(get_current_player_id),
     video_service: Annotated[VideoService, Depends(get_video_service)] = None
 ):
     """
     Obtiene el video procesado del jugador.
-    Retorna el archivo de video procesado.
+    Retorna el archivo de video procesado por streaming
+    (o redirección 302 a una URL presignada si el almacenamiento es S3).
+    Soporta Range (206), ETag/Last-Modified e If-None-Match/If-Range.
     """
     try:
-        # Obtener el video para verificar permisos
-        video = await video_service.get_video(video_id, player_id)
+        # Verifica permisos y obtiene el descriptor del video procesado (sin leer su contenido)
+        stored_file = await video_service.get_processed_video(video_id, player_id)
         
-        # Obtener el contenido del video procesado
-        video_content = await video_service.get_processed_video(video_id, player_id)
-        
-        # Determinar el tipo de contenido basado en la extensión del archivo
-        content_type = "video/mp4"  # Default
-        
-        return Response(
-            content=video_content,
-            media_type=content_type,
-            headers={
-                "Content-Disposition": f"inline; filename=processed_{video.id}",
-                "Cache-Control": "public, max-age=3600"
-            }
-        )
+        return _build_video_response(video_service, stored_file, f"processed_{video_id}", request)
     except VideoNotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except VideoNotOwnedException as e:
@@ -0,0 +1,52 @@
+"""Caché de tokens verificados y estado de jugadores para la autenticación"""
+
+import time
+from typing import Callable, Optional
+from app.shared.utils.ttl_cache import TTLCache
+
+
+class AuthCacheService:
+    """
+    Evita decodificar el JWT y consultar al jugador en cada request autenticado.
+
+    Guarda token → player_id (hasta el menor entre el TTL y el exp del token) y
+    player_id → activo. Los cambios de un jugador en este proceso invalidan su
+    estado de inmediato; los hechos en otras instancias se ven al expirar el TTL.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time
+    ):
+        self._tokens = TTLCache(max_size, ttl, clock)
+        self._players = TTLCache(max_size, ttl, clock)
+        self._wall_clock = wall_clock
+
+    def get_player_id(self, token: str) -> Optional[int]:
+        """Obtiene el player_id de un token ya verificado"""
+        return self._tokens.get(token)
+
+    def remember_token(self, token: str, player_id: int, expires_at: Optional[float] = None) -> None:
+        """Guarda un token verificado; expires_at es el claim exp (epoch) del token"""
+        ttl = None if expires_at is None else expires_at - self._wall_clock()
+        self._tokens.set(token, player_id, ttl)
+
+    def is_active(self, player_id: int) -> Optional[bool]:
+        """Estado del jugador en caché (None si hay que consultarlo)"""
+        return self._players.get(player_id)
+
+    def remember_player(self, player_id: int, is_active: bool) -> None:
+        """Guarda si el jugador existe y está activo"""
+        self._players.set(player_id, is_active)
+
+    def invalidate_player(self, player_id: int) -> None:
+        """Descarta el estado del jugador tras actualizarlo o eliminarlo"""
+        self._players.pop(player_id)
+
+    def clear(self) -> None:
+        """Descarta todo el contenido de la caché"""
+        self._tokens.clear()
+        self._players.clear()
@@ -0,0 +1,188 @@
+"""Ranking de jugadores en memoria del proceso"""
+
+import asyncio
+import logging
+import time
+from bisect import bisect_left, bisect_right, insort
+from typing import Callable, Dict, List, Optional, Tuple
+from app.domain.entities.player_score import PlayerScore
+from app.domain.repositories.player_repository import PlayerRepositoryInterface
+
+logger = logging.getLogger(__name__)
+
+# Clave de orden: votos descendente y player_id como desempate (mismo orden que la BD)
+RankKey = Tuple[int, int]
+
+
+class LeaderboardService:
+    """
+    Ranking en memoria para servir /public/rankings sin acceso a la BD.
+
+    Mantiene una lista ordenada por (-votos, player_id) más un índice por ciudad,
+    se actualiza en cada voto exitoso y se reconcilia periódicamente contra el
+    conteo de votos de la BD (un solo JOIN agrupado). La reconciliación también
+    corrige player_scores, que es lo que se lee cuando el ranking está obsoleto;
+    un voto confirmado mientras corre esa corrección puede quedar descontado en
+    la tabla hasta la siguiente reconciliación.
+    Cada proceso tiene su propia copia: los votos recibidos por otras instancias
+    aparecen tras la siguiente reconciliación. Si la última reconciliación es más
+    antigua que max_staleness, el ranking se considera obsoleto y no se usa.
+    Los votos registrados mientras corre la consulta de reconciliación se guardan
+    como deltas pendientes y se re-aplican sobre el resultado, porque la consulta
+    puede haber tomado su snapshot antes de que se confirmaran. Un voto confirmado
+    justo antes del snapshot pero registrado después cuenta doble hasta la
+    siguiente reconciliación.
+    """
+
+    def __init__(
+        self,
+        player_repository: PlayerRepositoryInterface,
+        refresh_interval: float = 10.0,
+        max_staleness: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._player_repository = player_repository
+        self._refresh_interval = refresh_interval
+        self._max_staleness = max_staleness
+        self._clock = clock
+        self._scores: Dict[int, PlayerScore] = {}
+        self._ranking: List[RankKey] = []
+        self._city_rankings: Dict[str, List[RankKey]] = {}
+        self._last_reconciled: Optional[float] = None
+        # player_id -> delta de los votos registrados durante una reconciliación en curso
+        self._pending_deltas: Optional[Dict[int, int]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def is_fresh(self) -> bool:
+        """Indica si el ranking está dentro de la cota de obsolescencia configurada"""
+        if self._last_reconciled is None:
+            return False
+        return self._clock() - self._last_reconciled <= self._max_staleness
+
+    def top(
+        self,
+        city: Optional[str] = None,
+        limit: int = 100,
+        after: Optional[Tuple[int, int]] = None
+    ) -> List[PlayerScore]:
+        """
+        Obtiene posiciones del ranking (global o por ciudad); after=(total_votes, player_id)
+        continúa después de esa fila, igual que el keyset de la BD.
+        """
+        ranking = self._ranking if city is None else self._city_rankings.get(city, [])
+        start = 0
+        if after is not None:
+            total_votes, player_id = after
+            start = bisect_right(ranking, (-total_votes, player_id))
+        return [self._scores[player_id] for _, player_id in ranking[start:start + limit]]
+
+    def rank(self, player_id: int, city: Optional[str] = None) -> Optional[PlayerScore]:
+        """Obtiene la posición de un jugador con una búsqueda binaria"""
+        score = self._scores.get(player_id)
+        if score is None or (city is not None and score.city != city):
+            return None
+        ranking = self._ranking if city is None else self._city_rankings[city]
+        position = bisect_left(ranking, score.rank_key()) + 1
+        return PlayerScore(player=score.player, total_votes=score.total_votes, position=position)
+
+    async def record_vote(self, player_id: int, delta: int = 1) -> None:
+        """Refleja un voto (o su eliminación) sobre el jugador dueño del video"""
+        if self._pending_deltas is not None:
+            self._pending_deltas[player_id] = self._pending_deltas.get(player_id, 0) + delta
+        score = self._scores.get(player_id)
+        if score is None:
+            if delta <= 0:
+                return
+            # Primer voto del jugador desde la última reconciliación
+            player = await self._player_repository.get_by_id(player_id)
+            if not player or player_id in self._scores:
+                return
+            self._insert(PlayerScore(player=player, total_votes=delta))
+            return
+
+        self._remove(score)
+        self._insert(PlayerScore(player=score.player, total_votes=max(score.total_votes + delta, 0)))
+
+    async def reconcile(self) -> None:
+        """
+        Corrige player_scores y reconstruye el ranking desde los votos en la BD;
+        reinicia la cota de obsolescencia
+        """
+        self._pending_deltas = {}
+        try:
+            await self._sync_materialized_scores()
+            scores = await self._player_repository.get_rankings_from_votes()
+        except Exception:
+            self._pending_deltas = None
+            raise
+
+        # Construir las estructuras nuevas y reemplazarlas de una sola vez
+        ranking: List[RankKey] = []
+        city_rankings: Dict[str, List[RankKey]] = {}
+        for score in scores:
+            key = score.rank_key()
+            ranking.append(key)
+            city_rankings.setdefault(score.city, []).append(key)
+        ranking.sort()
+        for keys in city_rankings.values():
+            keys.sort()
+
+        self._scores = {score.player_id: score for score in scores}
+        self._ranking = ranking
+        self._city_rankings = city_rankings
+
+        # Re-aplicar los votos registrados mientras corría la consulta
+        pending, self._pending_deltas = self._pending_deltas, None
+        for player_id, delta in pending.items():
+            if delta:
+                await self.record_vote(player_id, delta)
+        self._last_reconciled = self._clock()
+
+    async def _sync_materialized_scores(self) -> None:
+        """Escribe el conteo real en player_scores (un error no impide reconstruir el ranking en memoria)"""
+        try:
+            corrected = await self._player_repository.sync_scores_from_votes()
+        except Exception as e:
+            logger.error(f"❌ Error corrigiendo player_scores desde los votos: {e}")
+            return
+        if corrected:
+            logger.warning(f"⚠️ player_scores corregido desde los votos ({corrected} jugadores con drift)")
+
+    def start(self) -> None:
+        """Inicia la reconciliación periódica en background"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._reconcile_periodically())
+            logger.info(f"🏆 Ranking en memoria iniciado (reconciliación cada {self._refresh_interval}s)")
+
+    async def stop(self) -> None:
+        """Detiene la reconciliación periódica"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _reconcile_periodically(self) -> None:
+        while True:
+            try:
+                await self.reconcile()
+            except Exception as e:
+                # Se sigue intentando; si no se logra, el ranking queda obsoleto y se usa la BD
+                logger.error(f"❌ Error reconciliando el ranking en memoria: {e}")
+            await asyncio.sleep(self._refresh_interval)
+
+    def _insert(self, score: PlayerScore) -> None:
+        key = score.rank_key()
+        self._scores[score.player_id] = score
+        insort(self._ranking, key)
+        insort(self._city_rankings.setdefault(score.city, []), key)
+
+    def _remove(self, score: PlayerScore) -> None:
+        key = score.rank_key()
+        del self._scores[score.player_id]
+        for ranking in (self._ranking, self._city_rankings.get(score.city, [])):
+            index = bisect_left(ranking, key)
+            if index < len(ranking) and ranking[index] == key:
+                del ranking[index]
@@ -1,10 +1,15 @@
-from typing import Optional
+from typing import List, Optional
 from app.domain.entities.player import Player
+from app.domain.entities.player_score import PlayerScore
 from app.domain.value_objects.email import Email
 from app.domain.value_objects.password import Password
 from app.domain.repositories.player_repository import PlayerRepositoryInterface
+from app.services.auth_cache_service import AuthCacheService
+from app.services.leaderboard_service import LeaderboardService
 from app.shared.interfaces.authentication import AuthenticationInterface
+from app.shared.interfaces.unit_of_work import UnitOfWorkInterface
 from app.shared.exceptions.player_exceptions import PlayerAlreadyExistsException, PlayerNotFoundException
+from app.shared.utils.cursors import InvalidCursorError, decode_cursor, encode_cursor
 
 
 class PlayerService:
@@ -13,10 +18,16 @@ class PlayerService:
     def __init__(
         self,
         player_repository: PlayerRepositoryInterface,
-        auth_service: AuthenticationInterface
+        auth_service: AuthenticationInterface,
+        leaderboard: Optional[LeaderboardService] = None,
+        auth_cache: Optional[AuthCacheService] = None,
+        unit_of_work: Optional[UnitOfWorkInterface] = None
     ):
         self._player_repository = player_repository
         self._auth_service = auth_service
+        self._leaderboard = leaderboard
+        self._auth_cache = auth_cache
+        self._unit_of_work = unit_of_work
     
     async def register_player(
         self,
@@ -97,25 +108,88 @@ class PlayerService:
         """Actualiza el perfil de un jugador"""
         player = await self.get_player_by_id(player_id)
         player.update_profile(first_name, last_name, city, country)
-        return await self._player_repository.update(player)
+        updated = await self._player_repository.update(player)
+        await self._commit()
+        self._invalidate_auth_cache(player_id)
+        return updated
     
     async def deactivate_player(self, player_id: int) -> Player:
         """Desactiva un jugador"""
         player = await self.get_player_by_id(player_id)
         player.deactivate()
-        return await self._player_repository.update(player)
+        updated = await self._player_repository.update(player)
+        await self._commit()
+        self._invalidate_auth_cache(player_id)
+        return updated
     
-    async def get_rankings(self, city: Optional[str] = None) -> list:
-        """Obtiene el ranking de jugadores"""
-        players = await self._player_repository.get_rankings(city)
+    async def delete_player(self, player_id: int) -> bool:
+        """Elimina un jugador"""
+        deleted = await self._player_repository.delete(player_id)
+        await self._commit()
+        self._invalidate_auth_cache(player_id)
+        return deleted
+    
+    async def _commit(self) -> None:
+        """
+        Confirma la unidad de trabajo del request antes de invalidar la caché:
+        si se invalidara antes, un request concurrente podría volver a cachear
+        la fila aún sin confirmar (el jugador todavía activo)
+        """
+        if self._unit_of_work:
+            await self._unit_of_work.commit()
+    
+    def _invalidate_auth_cache(self, player_id: int) -> None:
+        """Sus tokens vigentes vuelven a consultar el estado del jugador en el siguiente request"""
+        if self._auth_cache:
+            self._auth_cache.invalidate_player(player_id)
+    
+    async def get_rankings(self, city: Optional[str] = None, limit: int = 100, cursor: Optional[str] = None) -> list:
+        """
+        Obtiene una página del ranking ordenado por votos (en memoria si está al día).
+        El cursor es el retornado por next_rankings_cursor para la página anterior.
+        """
+        after, position = None, 0
+        if cursor:
+            total_votes, player_id, position = self._decode_rankings_cursor(cursor)
+            after = (total_votes, player_id)
         
-        rankings = []
-        for i, player in enumerate(players, 1):
-            rankings.append({
-                "position": i,
-                "username": player.username,
-                "city": player.city,
-                "votes": 0  # Esto se calculará en el servicio de videos
-            })
+        if self._leaderboard and self._leaderboard.is_fresh():
+            scores = self._leaderboard.top(city, limit, after)
+        else:
+            scores = await self._player_repository.get_rankings(city, limit, after)
         
-        return rankings
+        return [self._ranking_item(score, position + i) for i, score in enumerate(scores, 1)]
+    
+    def next_rankings_cursor(self, rankings: list, limit: int) -> Optional[str]:
+        """Cursor opaco para la página siguiente (None si no hay más posiciones)"""
+        if len(rankings) < limit:
+            return None
+        last = rankings[-1]
+        return encode_cursor(last["votes"], last["player_id"], last["position"])
+    
+    async def get_player_rank(self, player_id: int, city: Optional[str] = None) -> dict:
+        """Obtiene la posición de un jugador sin materializar el ranking completo"""
+        if self._leaderboard and self._leaderboard.is_fresh():
+            score = self._leaderboard.rank(player_id, city)
+        else:
+            score = await self._player_repository.get_player_rank(player_id, city)
+        if not score:
+            raise PlayerNotFoundException(f"El jugador {player_id} no tiene posición en el ranking")
+        return self._ranking_item(score, score.position)
+    
+    @staticmethod
+    def _ranking_item(score: PlayerScore, position: int) -> dict:
+        return {
+            "position": position,
+            "player_id": score.player_id,
+            "username": score.username,
+            "city": score.city,
+            "votes": score.total_votes
+        }
+    
+    @staticmethod
+    def _decode_rankings_cursor(cursor: str) -> List[int]:
+        values = decode_cursor(cursor, 3)
+        if not all(isinstance(value, int) and value >= 0 for value in values):
+            raise InvalidCursorError("Cursor inválido")
+        return values
@@ -1,13 +1,17 @@
-from typing import List
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
 from fastapi import UploadFile
 from app.config.settings import settings
 from app.domain.entities.video import Video, VideoStatus
-from app.domain.entities.vote import Vote
 from app.domain.repositories.video_repository import VideoRepositoryInterface
 from app.domain.repositories.vote_repository import VoteRepositoryInterface
-from app.shared.interfaces.file_storage import FileStorageInterface
+from app.services.leaderboard_service import LeaderboardService
+from app.services.vote_buffer_service import VoteBufferService
+from app.shared.interfaces.file_storage import FileStorageInterface, FileTooLargeError, StoredFile
 from app.shared.interfaces.task_queue import TaskQueueInterface
+from app.shared.interfaces.unit_of_work import UnitOfWorkInterface
 from app.shared.exceptions.video_exceptions import VideoNotFoundException, VideoNotOwnedException, VideoCannotBeDeletedException
+from app.shared.utils.cursors import InvalidCursorError, decode_cursor, encode_cursor
 
 
 class VideoService:
@@ -18,12 +22,18 @@ class VideoService:
         video_repository: VideoRepositoryInterface,
         vote_repository: VoteRepositoryInterface,
         file_storage: FileStorageInterface,
-        task_queue: TaskQueueInterface
+        task_queue: TaskQueueInterface,
+        unit_of_work: Optional[UnitOfWorkInterface] = None,
+        leaderboard: Optional[LeaderboardService] = None,
+        vote_buffer: Optional[VoteBufferService] = None
     ):
         self._video_repository = video_repository
         self._vote_repository = vote_repository
         self._file_storage = file_storage
         self._task_queue = task_queue
+        self._unit_of_work = unit_of_work
+        self._leaderboard = leaderboard
+        self._vote_buffer = vote_buffer
     
     async def upload_video(
         self,
@@ -53,6 +63,8 @@ class VideoService:
 
         # Guardar en repositorio primero para obtener el ID
         created_video = await self._video_repository.create(video)
+        # Confirmar ya: la conexión no debe quedar tomada mientras se copia el archivo
+        await self._commit()
 
         # Generar filename usando el ID de la BD - siempre usar .mp4 para consistencia con S3 y worker
         filename = f"{created_video.id}.mp4"
@@ -63,17 +75,94 @@ class VideoService:
         # Actualizar el video con el filename y URL correctos
         created_video.original_url = original_url
         
-        # Guardar archivo en ubicación original con el filename correcto
-        await self._file_storage.save_file(file, filename, "original")
+        # Guardar archivo por chunks en ubicación original, validando el tamaño durante la copia
+        try:
+            await self._file_storage.save_file(
+                file, filename, "original", max_size=settings.MAX_FILE_SIZE
+            )
+        except Exception:
+            # Compensación: no dejar el registro huérfano si el archivo no se pudo guardar
+            await self._video_repository.delete(created_video.id)
+            await self._commit()
+            raise
         
         # Actualizar el registro en la BD con la información completa
         updated_video = await self._video_repository.update(created_video)
+
+        # Confirmar antes de publicar la tarea: el worker debe encontrar el video en la BD
+        await self._commit()
         
         # Iniciar procesamiento asíncrono
         await self._start_video_processing(updated_video)
         
         return updated_video
     
+    async def create_direct_upload(
+        self,
+        player_id: int,
+        title: str,
+        filename: str,
+        content_type: str
+    ) -> Tuple[Video, Dict]:
+        """
+        Registra un video y genera el destino presignado para que el cliente
+        lo suba directo al bucket (el archivo no pasa por la API)
+        """
+        from datetime import datetime
+
+        if not self._file_storage.supports_direct_upload:
+            raise ValueError("La subida directa solo está disponible con almacenamiento S3")
+
+        self._validate_video_filename(filename)
+        if not content_type or not content_type.startswith('video/'):
+            raise ValueError("El archivo debe ser un video válido")
+
+        # original_url queda vacío hasta que el cliente confirme la subida (finalize)
+        video = Video(
+            id=None,
+            player_id=player_id,
+            title=title,
+            status=VideoStatus.UPLOADED,
+            original_url=None,
+            processed_url=None,
+            uploaded_at=datetime.now()
+        )
+        created_video = await self._video_repository.create(video)
+        await self._commit()
+
+        upload_target = await self._file_storage.create_upload_target(
+            f"{created_video.id}.mp4",
+            "original",
+            content_type=content_type,
+            max_size=settings.MAX_FILE_SIZE
+        )
+        return created_video, upload_target
+
+    async def finalize_direct_upload(self, video_id: int, player_id: int) -> Video:
+        """Confirma una subida directa: verifica el objeto en el bucket e inicia el procesamiento"""
+        video = await self.get_video(video_id, player_id)
+
+        if video.original_url:
+            raise ValueError("La subida de este video ya fue confirmada")
+
+        # Liberar la conexión antes de consultar el bucket
+        await self._commit()
+
+        filename = f"{video_id}.mp4"
+        size = await self._file_storage.get_file_size(filename, "original")
+        if size is None:
+            raise ValueError("El archivo aún no se ha subido al almacenamiento")
+        if size > settings.MAX_FILE_SIZE:
+            await self._file_storage.delete_file(filename, "original")
+            raise FileTooLargeError(settings.MAX_FILE_SIZE)
+
+        video.original_url = f"{settings.BASE_PATH}/original/{video_id}"
+        updated_video = await self._video_repository.update(video)
+        await self._commit()
+
+        await self._start_video_processing(updated_video)
+        return updated_video
+
     async def get_player_videos(self, player_id: int) -> List[Video]:
         """Obtiene todos los videos de un jugador"""
         return await self._video_repository.get_by_player(player_id)
@@ -96,6 +185,9 @@ class VideoService:
         if not video.can_be_deleted():
             raise VideoCannotBeDeletedException("El video no puede ser eliminado en su estado actual")
 
+        # Liberar la conexión antes de eliminar los archivos del almacenamiento
+        await self._commit()
+
         # Eliminar archivos del almacenamiento (original y procesado si existe)
         filename = f"{video_id}.mp4"
         await self._file_storage.delete_file(filename, "original")
@@ -107,12 +199,56 @@ class VideoService:
         # Eliminar de la base de datos
         return await self._video_repository.delete(video_id)
     
-    async def get_public_videos(self, skip: int = 0, limit: int = 100) -> List[Video]:
-        """Obtiene videos públicos para votación con paginación"""
+    async def get_public_videos(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Video]:
+        """
+        Obtiene videos públicos para votación con paginación.
+        Con cursor (ver next_public_videos_cursor) se pagina por keyset y skip se ignora.
+        """
+        if cursor:
+            return await self._video_repository.get_public_videos(
+                limit=limit, after=self._decode_public_videos_cursor(cursor)
+            )
         return await self._video_repository.get_public_videos(skip=skip, limit=limit)
     
+    def next_public_videos_cursor(self, videos: List[Video], limit: int) -> Optional[str]:
+        """Cursor opaco para la página siguiente (None si no hay más videos)"""
+        if len(videos) < limit:
+            return None
+        last = videos[-1]
+        return encode_cursor(last.uploaded_at.isoformat(), last.id)
+    
+    @staticmethod
+    def _decode_public_videos_cursor(cursor: str) -> Tuple[datetime, int]:
+        uploaded_at, video_id = decode_cursor(cursor, 2)
+        if not isinstance(uploaded_at, str) or not isinstance(video_id, int):
+            raise InvalidCursorError("Cursor inválido")
+        try:
+            return datetime.fromisoformat(uploaded_at), video_id
+        except ValueError:
+            raise InvalidCursorError("Cursor inválido")
+    
     async def vote_for_video(self, video_id: int, player_id: int) -> bool:
-        """Vota por un video"""
+        """
+        Vota por un video con un único INSERT condicional (sin check-then-insert):
+        la BD valida que el video sea votable y la constraint única evita duplicados.
+        Con el buffer de votos habilitado, el voto se escribe en el siguiente lote.
+        """
+        if self._vote_buffer:
+            await self._vote_buffer.submit(video_id, player_id)
+            return True
+        
+        owner_id = await self._vote_repository.cast_vote(video_id, player_id)
+        if owner_id is None:
+            await self._raise_vote_rejection(video_id, player_id)
+        
+        if self._leaderboard:
+            # Solo se refleja en memoria un voto ya confirmado en la BD
+            await self._commit()
+            await self._leaderboard.record_vote(owner_id)
+        return True
+    
+    async def _raise_vote_rejection(self, video_id: int, player_id: int) -> None:
+        """Determina por qué no se registró el voto (solo se consulta en el camino de error)"""
         video = await self._video_repository.get_by_id(video_id)
         if not video:
             raise VideoNotFoundException(f"Video con ID {video_id} no encontrado")
@@ -124,53 +260,38 @@ class VideoService:
         if video.player_id == player_id:
             raise ValueError("No puedes votar por tu propio video")
         
-        # Verificar si el usuario ya votó por este video
-        if await self._vote_repository.has_user_voted(video_id, player_id):
-            raise ValueError("Ya has votado por este video")
-        
-        # Crear el voto usando el VoteRepository
-        vote = Vote(
-            id=None,
-            video_id=video_id,
-            player_id=player_id
-        )
-        
-        await self._vote_repository.create(vote)
-        return True
+        raise ValueError("Ya has votado por este video")
     
     async def get_video_votes_count(self, video_id: int) -> int:
-        """Obtiene el número de votos de un video"""
-        return await self._vote_repository.count_votes_for_video(video_id)
-    
-    async def get_videos_with_votes(self) -> List[dict]:
-        """Obtiene videos públicos con su conteo de votos"""
-        videos = await self._video_repository.get_public_videos()
-        video_ids = [video.id for video in videos]
-        vote_counts = await self._vote_repository.get_votes_by_videos(video_ids)
-        
-        result = []
-        for video in videos:
-            result.append({
-                "video": video,
-                "votes_count": vote_counts.get(video.id, 0)
-            })
-        
-        return result
+        """Obtiene el número de votos de un video desde el contador desnormalizado"""
+        return await self._video_repository.get_votes_count(video_id) or 0
     
     async def _validate_video_file(self, file: UploadFile) -> None:
         """Valida el archivo de video"""
-        # Verificar tamaño (100MB máximo)
-        if file.size and file.size > 100 * 1024 * 1024:
-            raise ValueError("El archivo es demasiado grande. Máximo permitido: 100MB")
+        # Verificar tamaño declarado (el real se valida por chunks al guardar)
+        if file.size and file.size > settings.MAX_FILE_SIZE:
+            raise FileTooLargeError(settings.MAX_FILE_SIZE)
         
+        self._validate_video_filename(file.filename)
+
+    def _validate_video_filename(self, filename: str) -> None:
+        """Valida la extensión del archivo de video"""
         # Verificar tipo de archivo
         allowed_extensions = {'.mp4', '.avi', '.mov', '.wmv'}
-        file_extension = file.filename.split('.')[-1].lower() if '.' in file.filename else ''
+        file_extension = filename.split('.')[-1].lower() if '.' in filename else ''
         if f'.{file_extension}' not in allowed_extensions:
             raise ValueError(f"Tipo de archivo no permitido. Extensiones permitidas: {', '.join(allowed_extensions)}")
     
     # Método removido - ya no se usa filename único con UUID
     
+    async def _commit(self) -> None:
+        """
+        Confirma la unidad de trabajo del request y devuelve la conexión al pool
+        (antes de efectos externos o de I/O lenta contra el almacenamiento)
+        """
+        if self._unit_of_work:
+            await self._unit_of_work.commit()
+
     async def _start_video_processing(self, video: Video) -> None:
         """Inicia el procesamiento del video enviando tarea a la cola"""
         try:
@@ -197,23 +318,35 @@ class VideoService:
             video.mark_as_processed(processed_url)
             await self._video_repository.update(video)
     
-    async def get_original_video(self, video_id: int, player_id: int) -> bytes:
-        """Obtiene el contenido del video original"""
+    async def get_original_video(self, video_id: int, player_id: int) -> StoredFile:
+        """Obtiene el descriptor del video original para servirlo por streaming"""
         video = await self.get_video(video_id, player_id)
+        await self._commit()
         # Pasar el filename con extensión (siempre mp4 después del procesamiento inicial)
         filename = f"{video_id}.mp4"
-        return await self._file_storage.get_file_content(filename, "original")
+        return await self._file_storage.get_stored_file(filename, "original")
     
-    async def get_processed_video(self, video_id: int, player_id: int) -> bytes:
-        """Obtiene el contenido del video procesado"""
+    async def get_processed_video(self, video_id: int, player_id: int) -> StoredFile:
+        """Obtiene el descriptor del video procesado para servirlo por streaming"""
         video = await self.get_video(video_id, player_id)
 
         if not video.processed_url:
             raise ValueError("El video procesado no está disponible")
+        await self._commit()
 
         # Pasar el filename con extensión
         filename = f"{video_id}.mp4"
-        return await self._file_storage.get_file_content(filename, "processed")
+        return await self._file_storage.get_stored_file(filename, "processed")
+
+    def iter_video_content(self, stored_file: StoredFile, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """Itera el contenido de un video almacenado (o un rango inclusivo) en bloques (memoria constante)"""
+        return self._file_storage.iter_file_content(
+            stored_file.filename,
+            stored_file.location,
+            chunk_size=settings.DOWNLOAD_CHUNK_SIZE,
+            start=start,
+            end=end
+        )
 
 
 class MockVideoService(VideoService):
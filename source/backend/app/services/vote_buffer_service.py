@@ -0,0 +1,170 @@
+"""Buffer de escritura diferida (write-behind) para votos"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from app.domain.repositories.video_repository import VideoRepositoryInterface
+from app.domain.repositories.vote_repository import VoteRepositoryInterface
+from app.services.leaderboard_service import LeaderboardService
+from app.shared.exceptions.video_exceptions import VideoNotFoundException
+
+logger = logging.getLogger(__name__)
+
+# (video_id, player_id, futuro a resolver tras el commit en modo durable)
+PendingVote = Tuple[int, int, Optional[asyncio.Future]]
+
+
+class VoteBufferService:
+    """
+    Acumula votos en memoria y los escribe en lotes (INSERT multi-fila + un commit).
+
+    Los duplicados se descartan contra un conjunto acotado de pares (video, votante)
+    ya vistos por este proceso; la constraint unique_vote sigue siendo el árbitro final
+    entre instancias. Con durable=True la respuesta espera al commit del lote (group
+    commit); con durable=False responde de inmediato y un voto aceptado puede perderse
+    si el proceso termina antes del siguiente flush.
+    """
+
+    def __init__(
+        self,
+        vote_repository: VoteRepositoryInterface,
+        video_repository: VideoRepositoryInterface,
+        flush_interval: float = 0.02,
+        max_batch: int = 500,
+        durable: bool = True,
+        dedupe_size: int = 100000,
+        leaderboard: Optional[LeaderboardService] = None
+    ):
+        self._vote_repository = vote_repository
+        self._video_repository = video_repository
+        self._flush_interval = flush_interval
+        self._max_batch = max_batch
+        self._durable = durable
+        self._dedupe_size = dedupe_size
+        self._leaderboard = leaderboard
+        self._pending: List[PendingVote] = []
+        self._seen: "OrderedDict[Tuple[int, int], None]" = OrderedDict()
+        # Dueño de cada video público (un video procesado no cambia de dueño ni se elimina)
+        self._owners: "OrderedDict[int, int]" = OrderedDict()
+        self._batch_ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """Votos aceptados que aún no se han escrito en la BD"""
+        return len(self._pending)
+
+    async def submit(self, video_id: int, player_id: int) -> None:
+        """
+        Acepta un voto para el siguiente lote. Lanza las mismas excepciones que el
+        voto directo; en modo durable retorna cuando el lote quedó confirmado.
+        """
+        owner_id = await self._get_owner(video_id)
+        if owner_id == player_id:
+            raise ValueError("No puedes votar por tu propio video")
+
+        key = (video_id, player_id)
+        if key in self._seen:
+            raise ValueError("Ya has votado por este video")
+        self._remember(self._seen, key, None)
+
+        future = asyncio.get_running_loop().create_future() if self._durable else None
+        self._pending.append((video_id, player_id, future))
+        if len(self._pending) >= self._max_batch:
+            self._batch_ready.set()
+
+        if future is not None and not await future:
+            # Otra instancia (o un voto ya olvidado por el conjunto acotado) ganó la constraint
+            raise ValueError("Ya has votado por este video")
+
+    async def flush(self) -> int:
+        """Escribe en la BD hasta max_batch votos pendientes; retorna cuántos se insertaron"""
+        if not self._pending:
+            return 0
+        batch = self._pending[:self._max_batch]
+        del self._pending[:self._max_batch]
+
+        try:
+            inserted = set(await self._vote_repository.cast_votes_batch([(v, p) for v, p, _ in batch]))
+        except Exception as e:
+            if self._durable:
+                for video_id, player_id, future in batch:
+                    # El cliente recibe el error y puede reintentar el voto
+                    self._seen.pop((video_id, player_id), None)
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                # Sin respuesta pendiente: se reintenta en el siguiente flush
+                self._pending[:0] = batch
+            raise
+
+        for video_id, player_id, future in batch:
+            if future is not None and not future.done():
+                future.set_result((video_id, player_id) in inserted)
+
+        if self._leaderboard and inserted:
+            votes_by_owner: Dict[int, int] = {}
+            for video_id, _ in inserted:
+                owner_id = self._owners.get(video_id)
+                if owner_id is not None:
+                    votes_by_owner[owner_id] = votes_by_owner.get(owner_id, 0) + 1
+            for owner_id, delta in votes_by_owner.items():
+                await self._leaderboard.record_vote(owner_id, delta=delta)
+        return len(inserted)
+
+    def start(self) -> None:
+        """Inicia el flush periódico en background"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_periodically())
+            mode = "durable" if self._durable else "buffered"
+            logger.info(f"🗳️ Buffer de votos iniciado (flush cada {self._flush_interval * 1000:.0f}ms, modo {mode})")
+
+    async def stop(self) -> None:
+        """Detiene el flush periódico y escribe los votos pendientes"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._pending:
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"❌ Se descartan {len(self._pending)} votos pendientes al detener el buffer: {e}")
+                break
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), timeout=self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            try:
+                while self._pending:
+                    await self.flush()
+            except Exception as e:
+                logger.error(f"❌ Error escribiendo lote de votos: {e}")
+
+    async def _get_owner(self, video_id: int) -> int:
+        """Obtiene el dueño de un video votable, con caché en memoria"""
+        owner_id = self._owners.get(video_id)
+        if owner_id is not None:
+            return owner_id
+
+        video = await self._video_repository.get_by_id(video_id)
+        if not video:
+            raise VideoNotFoundException(f"Video con ID {video_id} no encontrado")
+        if not video.is_public():
+            raise ValueError("El video no está disponible para votación")
+        self._remember(self._owners, video_id, video.player_id)
+        return video.player_id
+
+    def _remember(self, entries: OrderedDict, key, value) -> None:
+        """Agrega una entrada descartando las más antiguas por encima de dedupe_size"""
+        entries[key] = value
+        while len(entries) > self._dedupe_size:
+            entries.popitem(last=False)
@@ -1,13 +1,17 @@
 """Contenedor de dependencias para inyección de dependencias"""
 
-from typing import Dict, Any, Type
+from typing import Dict, Any, Optional, Type
 from app.shared.interfaces.file_storage import FileStorageInterface
 from app.shared.interfaces.authentication import AuthenticationInterface
 from app.shared.interfaces.task_queue import TaskQueueInterface
+from app.shared.interfaces.unit_of_work import UnitOfWorkInterface
 from app.domain.repositories.player_repository import PlayerRepositoryInterface
 from app.domain.repositories.video_repository import VideoRepositoryInterface
 from app.domain.repositories.vote_repository import VoteRepositoryInterface
 from app.services.player_service import PlayerService
+from app.services.auth_cache_service import AuthCacheService
+from app.services.leaderboard_service import LeaderboardService
+from app.services.vote_buffer_service import VoteBufferService
 import os
 from app.services.video_service import VideoService, MockVideoService
 
@@ -43,11 +47,38 @@ class DIContainer:
         else:
             return implementation_class()
     
+    def get_leaderboard_service(self) -> Optional[LeaderboardService]:
+        """Obtiene el ranking en memoria (None si está deshabilitado)"""
+        if LeaderboardService.__name__ not in self._services:
+            return None
+        return self.get(LeaderboardService)
+    
+    def get_vote_buffer_service(self) -> Optional[VoteBufferService]:
+        """Obtiene el buffer de votos (None si está deshabilitado)"""
+        if VoteBufferService.__name__ not in self._services:
+            return None
+        return self.get(VoteBufferService)
+    
+    def get_password_hasher(self) -> Optional[Any]:
+        """Obtiene el pool de hashing de contraseñas (None si bcrypt corre en el event loop)"""
+        if "PasswordHasher" not in self._services:
+            return None
+        return self._singletons["PasswordHasher"]
+    
+    def get_auth_cache_service(self) -> Optional[AuthCacheService]:
+        """Obtiene la caché de autenticación (None si está deshabilitada)"""
+        if AuthCacheService.__name__ not in self._services:
+            return None
+        return self.get(AuthCacheService)
+    
     def get_player_service(self) -> PlayerService:
         """Obtiene el servicio de jugadores"""
         return PlayerService(
             player_repository=self.get(PlayerRepositoryInterface),
-            auth_service=self.get(AuthenticationInterface)
+            auth_service=self.get(AuthenticationInterface),
+            leaderboard=self.get_leaderboard_service(),
+            auth_cache=self.get_auth_cache_service(),
+            unit_of_work=self.get(UnitOfWorkInterface)
         )
     
     def get_video_service(self) -> VideoService:
@@ -63,7 +94,10 @@ class DIContainer:
             video_repository=self.get(VideoRepositoryInterface),
             vote_repository=self.get(VoteRepositoryInterface),
             file_storage=self.get(FileStorageInterface),
-            task_queue=self.get(TaskQueueInterface)
+            task_queue=self.get(TaskQueueInterface),
+            unit_of_work=self.get(UnitOfWorkInterface),
+            leaderboard=self.get_leaderboard_service(),
+            vote_buffer=self.get_vote_buffer_service()
         )
 
 
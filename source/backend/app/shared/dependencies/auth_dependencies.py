@@ -14,41 +14,56 @@ async def get_current_player_id(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> int:
     """
-    Extrae el player_id del token JWT y lo valida
+    Extrae el player_id del token JWT y lo valida.
+    Con la caché de autenticación habilitada, un token ya verificado y un jugador
+    activo conocido no requieren decodificar el JWT ni consultar la BD.
     """
     try:
-        # Obtener el servicio de autenticación
-        auth_service: AuthenticationInterface = container.get(AuthenticationInterface)
+        auth_cache = container.get_auth_cache_service()
+        token = credentials.credentials
+        player_id = auth_cache.get_player_id(token) if auth_cache else None
         
-        # Verificar el token
-        payload = await auth_service.verify_token(credentials.credentials)
-        if payload is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token inválido o expirado",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        # Extraer el player_id del payload
-        player_id = payload.get("sub")
         if player_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token inválido: falta player_id",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+            # Obtener el servicio de autenticación
+            auth_service: AuthenticationInterface = container.get(AuthenticationInterface)
+            
+            # Verificar el token
+            payload = await auth_service.verify_token(token)
+            if payload is None:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Token inválido o expirado",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            
+            # Extraer el player_id del payload
+            subject = payload.get("sub")
+            if subject is None:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Token inválido: falta player_id",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            player_id = int(subject)
+            if auth_cache:
+                auth_cache.remember_token(token, player_id, payload.get("exp"))
         
         # Verificar que el jugador existe y está activo
-        player_repo: PlayerRepositoryInterface = container.get(PlayerRepositoryInterface)
-        player = await player_repo.get_by_id(int(player_id))
-        if player is None or not player.is_active:
+        is_active = auth_cache.is_active(player_id) if auth_cache else None
+        if is_active is None:
+            player_repo: PlayerRepositoryInterface = container.get(PlayerRepositoryInterface)
+            player = await player_repo.get_by_id(player_id)
+            is_active = player is not None and player.is_active
+            if auth_cache:
+                auth_cache.remember_player(player_id, is_active)
+        if not is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Jugador no encontrado o inactivo",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        return int(player_id)
+        return player_id
         
     except HTTPException:
         raise
@@ -1,16 +1,55 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Literal
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Literal
 from fastapi import UploadFile
 
 LocationType = Literal["original", "processed"]
 
 
+class FileTooLargeError(ValueError):
+    """El archivo supera el tamaño máximo permitido (se detecta durante la ingesta)"""
+
+    def __init__(self, max_size: int):
+        super().__init__(
+            f"El archivo es demasiado grande. Máximo permitido: {max_size // (1024 * 1024)}MB"
+        )
+        self.max_size = max_size
+
+
+def ensure_within_limit(total_bytes: int, max_size: Optional[int]) -> None:
+    """Valida incrementalmente el tamaño acumulado de una ingesta por chunks"""
+    if max_size is not None and total_bytes > max_size:
+        raise FileTooLargeError(max_size)
+
+
+@dataclass
+class StoredFile:
+    """Descriptor de un archivo almacenado para servirlo sin cargarlo en memoria"""
+    filename: str
+    location: LocationType
+    size: Optional[int] = None
+    path: Optional[str] = None  # Ruta local: se sirve directo desde disco (FileResponse)
+    url: Optional[str] = None  # URL presignada: el cliente descarga directo (redirect 302)
+    etag: Optional[str] = None  # Validador entre comillas, derivado de los metadatos del almacenamiento
+    last_modified: Optional[datetime] = None
+
+
 class FileStorageInterface(ABC):
     """Interface para el almacenamiento de archivos"""
+
+    # Indica si el cliente puede subir directo al almacenamiento (sin pasar por la API)
+    supports_direct_upload: bool = False
     
     @abstractmethod
-    async def save_file(self, file: UploadFile, filename: str, location: LocationType = "original") -> str:
-        """Guarda un archivo y retorna la ruta donde se guardó"""
+    async def save_file(
+        self, file: UploadFile, filename: str, location: LocationType = "original",
+        max_size: Optional[int] = None
+    ) -> str:
+        """
+        Guarda un archivo por chunks (memoria constante) y retorna la ruta donde se guardó.
+        Lanza FileTooLargeError en cuanto se superan max_size bytes, sin dejar archivos parciales.
+        """
         pass
     
     @abstractmethod
@@ -37,3 +76,26 @@ class FileStorageInterface(ABC):
     async def get_file_content(self, filename: str, location: LocationType = "original") -> bytes:
         """Obtiene el contenido del archivo como bytes"""
         pass
+
+    @abstractmethod
+    async def get_stored_file(self, filename: str, location: LocationType = "original") -> StoredFile:
+        """Obtiene el descriptor del archivo para servirlo por streaming (FileNotFoundError si no existe)"""
+        pass
+
+    @abstractmethod
+    def iter_file_content(
+        self, filename: str, location: LocationType = "original", chunk_size: int = 1024 * 1024,
+        start: int = 0, end: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """Itera el contenido del archivo (o el rango inclusivo start-end) en bloques de chunk_size"""
+        pass
+
+    async def create_upload_target(
+        self, filename: str, location: LocationType = "original",
+        content_type: str = "video/mp4", max_size: Optional[int] = None
+    ) -> Optional[Dict]:
+        """
+        Genera el destino para una subida directa del cliente ({"url", "fields"}).
+        Retorna None si el almacenamiento no soporta subida directa.
+        """
+        return None
@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+
+
+class UnitOfWorkInterface(ABC):
+    """Interface para la unidad de trabajo del request (transacción compartida por los repositorios)"""
+
+    @abstractmethod
+    async def commit(self) -> None:
+        """Confirma los cambios pendientes del request (antes de efectos externos, p.ej. publicar tareas)"""
+        pass
+
+    @abstractmethod
+    async def rollback(self) -> None:
+        """Descarta los cambios pendientes del request"""
+        pass
@@ -0,0 +1,28 @@
+"""Cursores opacos para paginación por keyset"""
+
+import base64
+import json
+from typing import Any, List
+
+
+class InvalidCursorError(ValueError):
+    """El cursor recibido no es válido o no corresponde al endpoint"""
+    pass
+
+
+def encode_cursor(*values: Any) -> str:
+    """Codifica los valores de la última fila de una página como un cursor opaco"""
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Decodifica un cursor opaco validando la cantidad de valores esperada"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise InvalidCursorError("Cursor inválido")
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursorError("Cursor inválido")
+    return values
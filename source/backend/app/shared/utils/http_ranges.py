@@ -0,0 +1,129 @@
+"""Utilidades HTTP para descargas parciales (Range) y peticiones condicionales"""
+
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Tuple
+
+
+class RangeNotSatisfiableError(Exception):
+    """El rango solicitado no se puede servir para el tamaño del archivo (HTTP 416)"""
+    pass
+
+
+def format_http_date(value: datetime) -> str:
+    """Formatea una fecha como HTTP-date (RFC 9110), siempre en GMT"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    """Parsea una HTTP-date; retorna None si el valor es inválido"""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _truncate(value: datetime) -> datetime:
+    """Las HTTP-date tienen resolución de segundos: se ignoran los microsegundos"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+
+def _opaque_tag(etag: str) -> str:
+    """Quita el prefijo W/ para comparación débil de ETags"""
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_matches(header: Optional[str], etag: Optional[str]) -> bool:
+    """Comparación débil de If-None-Match contra el ETag actual (soporta listas y *)"""
+    if not header or not etag:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [_opaque_tag(tag.strip()) for tag in header.split(",")]
+    return _opaque_tag(etag) in candidates
+
+
+def is_not_modified(
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+    etag: Optional[str],
+    last_modified: Optional[datetime]
+) -> bool:
+    """
+    Determina si se puede responder 304 Not Modified.
+    If-None-Match tiene prioridad: si viene, If-Modified-Since se ignora.
+    """
+    if if_none_match:
+        return etag_matches(if_none_match, etag)
+
+    since = parse_http_date(if_modified_since)
+    if since is None or last_modified is None:
+        return False
+    return _truncate(last_modified) <= since
+
+
+def if_range_matches(if_range: Optional[str], etag: Optional[str], last_modified: Optional[datetime]) -> bool:
+    """
+    Evalúa If-Range: el rango solo se sirve si el validador coincide con la
+    versión actual; si no, se responde el archivo completo (200).
+    """
+    if not if_range:
+        return True
+
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        # If-Range exige comparación fuerte: un ETag débil nunca coincide
+        return bool(etag) and not if_range.startswith("W/") and if_range == etag
+
+    since = parse_http_date(if_range)
+    return since is not None and last_modified is not None and _truncate(last_modified) == since
+
+
+def parse_range_header(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parsea un header Range de bytes y retorna (inicio, fin) inclusivos.
+
+    Solo se soporta un rango; un header con múltiples rangos o con formato
+    desconocido se ignora (retorna None) y se sirve el archivo completo.
+
+    Raises:
+        RangeNotSatisfiableError: Si el rango queda fuera del archivo
+    """
+    if not header:
+        return None
+
+    unit, _, ranges = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+
+    start_str, sep, end_str = ranges.strip().partition("-")
+    if not sep:
+        return None
+
+    try:
+        if not start_str:
+            # Sufijo: últimos N bytes
+            suffix = int(end_str)
+            if suffix <= 0 or size == 0:
+                raise RangeNotSatisfiableError(header)
+            return max(0, size - suffix), size - 1
+
+        start = int(start_str)
+        end = int(end_str) if end_str else size - 1
+    except ValueError:
+        return None
+
+    if start >= size:
+        raise RangeNotSatisfiableError(header)
+    if start < 0 or end < start:
+        return None
+    return start, min(end, size - 1)
@@ -46,6 +46,10 @@ app.add_middleware(
 if settings.FILE_STORAGE_TYPE.value == "local" and os.path.exists(settings.UPLOAD_DIR):
     app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
 
+# Sesión de BD por request compartida por todos los repositorios (unidad de trabajo)
+from app.infrastructure.database.unit_of_work import unit_of_work_middleware
+app.middleware("http")(unit_of_work_middleware())
+
 # Incluir routers
 from app.routers import auth, videos, public
 
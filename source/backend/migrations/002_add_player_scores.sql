@@ -0,0 +1,71 @@
+-- ======================================================================
+-- Migración 002: Ranking materializado de jugadores (player_scores)
+-- ======================================================================
+-- IDEMPOTENTE: Puede ejecutarse múltiples veces sin causar errores
+-- Uso:
+--   psql -d fileprocessing -f 002_add_player_scores.sql
+--
+-- El backend mantiene esta tabla en la misma transacción de cada voto
+-- (INSERT ... ON CONFLICT DO UPDATE), por lo que GET /public/rankings
+-- pasa a ser un ORDER BY total_votes DESC LIMIT n sobre un índice.
+-- ======================================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version VARCHAR(50) PRIMARY KEY,
+    applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    description TEXT
+);
+
+-- ======================================================================
+-- TABLA MATERIALIZADA
+-- ======================================================================
+
+CREATE TABLE IF NOT EXISTS player_scores (
+    player_id INTEGER PRIMARY KEY REFERENCES players(id) ON DELETE CASCADE,
+    city VARCHAR(100) NOT NULL,
+    total_votes INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Ranking global: ORDER BY total_votes DESC LIMIT n
+CREATE INDEX IF NOT EXISTS idx_player_scores_total_votes ON player_scores(total_votes DESC, player_id);
+
+-- Ranking por ciudad: WHERE city = X ORDER BY total_votes DESC LIMIT n
+CREATE INDEX IF NOT EXISTS idx_player_scores_city_total_votes ON player_scores(city, total_votes DESC, player_id);
+
+-- ======================================================================
+-- BACKFILL (recalcula desde votes; seguro de re-ejecutar)
+-- ======================================================================
+
+INSERT INTO player_scores (player_id, city, total_votes)
+SELECT p.id, COALESCE(p.city, ''), COUNT(vt.id)
+FROM votes vt
+JOIN videos v ON v.id = vt.video_id
+JOIN players p ON p.id = v.player_id
+GROUP BY p.id, p.city
+ON CONFLICT (player_id) DO UPDATE
+SET total_votes = EXCLUDED.total_votes,
+    city = EXCLUDED.city,
+    updated_at = CURRENT_TIMESTAMP;
+
+-- Registrar migración como aplicada
+INSERT INTO schema_migrations (version, description)
+VALUES ('002', 'Ranking materializado de jugadores (player_scores)')
+ON CONFLICT (version) DO NOTHING;
+
+COMMIT;
+
+-- ======================================================================
+-- VERIFICACIÓN
+-- ======================================================================
+\echo ''
+\echo '✅ Migración 002 completada'
+\echo ''
+\echo '🏆 Top 10 del ranking materializado:'
+
+SELECT player_id, city, total_votes
+FROM player_scores
+ORDER BY total_votes DESC, player_id
+LIMIT 10;
@@ -0,0 +1,72 @@
+-- ======================================================================
+-- Migración 003: Constraint única de votos (video_id, player_id)
+-- ======================================================================
+-- IDEMPOTENTE: Puede ejecutarse múltiples veces sin causar errores
+-- Uso:
+--   psql -d fileprocessing -f 003_add_unique_vote_constraint.sql
+--
+-- El backend registra los votos con un único
+--   INSERT ... SELECT ... ON CONFLICT (video_id, player_id) DO NOTHING RETURNING
+-- que requiere esta constraint como árbitro y evita votos dobles concurrentes.
+-- Las bases creadas con database/init.sql ya la tienen (unique_vote).
+-- ======================================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version VARCHAR(50) PRIMARY KEY,
+    applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    description TEXT
+);
+
+-- 1. Eliminar votos duplicados existentes (se conserva el más antiguo)
+DELETE FROM votes v
+USING votes older
+WHERE v.video_id = older.video_id
+  AND v.player_id = older.player_id
+  AND v.id > older.id;
+
+-- 2. Crear la constraint solo si no existe una equivalente
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM pg_constraint c
+        WHERE c.conrelid = 'votes'::regclass
+          AND c.contype = 'u'
+          AND (
+              SELECT array_agg(a.attname::text ORDER BY a.attname)
+              FROM pg_attribute a
+              WHERE a.attrelid = c.conrelid AND a.attnum = ANY(c.conkey)
+          ) = ARRAY['player_id', 'video_id']
+    ) THEN
+        ALTER TABLE votes ADD CONSTRAINT unique_vote UNIQUE (video_id, player_id);
+        RAISE NOTICE 'Constraint unique_vote creada';
+    ELSE
+        RAISE NOTICE 'La constraint única de votos ya existe';
+    END IF;
+END $$;
+
+-- 3. Recalcular el ranking materializado por si se eliminaron duplicados
+UPDATE player_scores ps
+SET total_votes = COALESCE(t.total_votes, 0),
+    updated_at = CURRENT_TIMESTAMP
+FROM (
+    SELECT p.id AS player_id, COUNT(vt.id) AS total_votes
+    FROM players p
+    LEFT JOIN videos v ON v.player_id = p.id
+    LEFT JOIN votes vt ON vt.video_id = v.id
+    GROUP BY p.id
+) t
+WHERE ps.player_id = t.player_id
+  AND ps.total_votes <> COALESCE(t.total_votes, 0);
+
+-- Registrar migración como aplicada
+INSERT INTO schema_migrations (version, description)
+VALUES ('003', 'Constraint única de votos (video_id, player_id)')
+ON CONFLICT (version) DO NOTHING;
+
+COMMIT;
+
+\echo ''
+\echo '✅ Migración 003 completada'
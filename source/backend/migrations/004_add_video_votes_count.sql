@@ -0,0 +1,44 @@
+-- ======================================================================
+-- Migración 004: Contador desnormalizado de votos por video (videos.votes_count)
+-- ======================================================================
+-- IDEMPOTENTE: Puede ejecutarse múltiples veces sin causar errores
+-- Uso:
+--   psql -d fileprocessing -f 004_add_video_votes_count.sql
+--
+-- El backend actualiza videos.votes_count en la misma transacción de cada
+-- voto (alta, lote o eliminación), por lo que GET /api/videos/{id} lee una
+-- columna en vez de ejecutar COUNT(*) sobre votes.
+-- ======================================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version VARCHAR(50) PRIMARY KEY,
+    applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    description TEXT
+);
+
+-- 1. Agregar la columna (DEFAULT constante: no reescribe la tabla en PostgreSQL 11+)
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS votes_count INTEGER NOT NULL DEFAULT 0;
+
+-- 2. Poblar/corregir el contador desde los votos existentes
+UPDATE videos v
+SET votes_count = COALESCE(t.total_votes, 0)
+FROM (
+    SELECT vi.id AS video_id, COUNT(vt.id) AS total_votes
+    FROM videos vi
+    LEFT JOIN votes vt ON vt.video_id = vi.id
+    GROUP BY vi.id
+) t
+WHERE v.id = t.video_id
+  AND v.votes_count <> COALESCE(t.total_votes, 0);
+
+-- Registrar migración como aplicada
+INSERT INTO schema_migrations (version, description)
+VALUES ('004', 'Contador desnormalizado de votos por video')
+ON CONFLICT (version) DO NOTHING;
+
+COMMIT;
+
+\echo ''
+\echo '✅ Migración 004 completada'
@@ -0,0 +1,37 @@
+-- ======================================================================
+-- Migración 005: Jugadores con videos publicados sin votos en player_scores
+-- ======================================================================
+-- IDEMPOTENTE: Puede ejecutarse múltiples veces sin causar errores
+-- Uso:
+--   psql -d fileprocessing -f 005_seed_unvoted_player_scores.sql
+--
+-- GET /public/rankings lista a todo jugador con al menos un video procesado,
+-- aunque tenga 0 votos. El backend y el worker crean la fila al publicar un
+-- video; esta migración la crea para los videos publicados antes del cambio
+-- (la 002 solo pobló jugadores con votos).
+-- ======================================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version VARCHAR(50) PRIMARY KEY,
+    applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    description TEXT
+);
+
+INSERT INTO player_scores (player_id, city, total_votes)
+SELECT DISTINCT p.id, COALESCE(p.city, ''), 0
+FROM players p
+JOIN videos v ON v.player_id = p.id
+WHERE v.status = 'processed'
+ON CONFLICT (player_id) DO NOTHING;
+
+-- Registrar migración como aplicada
+INSERT INTO schema_migrations (version, description)
+VALUES ('005', 'Jugadores con videos publicados sin votos en player_scores')
+ON CONFLICT (version) DO NOTHING;
+
+COMMIT;
+
+\echo ''
+\echo '✅ Migración 005 completada'
@@ -1,4 +1,5 @@
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -53,6 +54,17 @@ def db_session():
         db.close()
 
 
+@pytest_asyncio.fixture
+async def async_db_session():
+    """Fixture para obtener una sesión async (aiosqlite) sobre la misma base de datos de prueba"""
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    async_engine = create_async_engine("sqlite+aiosqlite:///./test.db")
+    session_factory = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as db:
+        yield db
+    await async_engine.dispose()
+
+
 @pytest.fixture(autouse=True)
 def clean_database():
     """Fixture que limpia la base de datos antes de cada test"""
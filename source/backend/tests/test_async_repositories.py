@@ -0,0 +1,152 @@
+"""Tests de integración para los repositorios async (AsyncSession)"""
+
+import pytest
+from app.infrastructure.repositories.async_player_repository import AsyncPlayerRepository
+from app.infrastructure.repositories.async_video_repository import AsyncVideoRepository
+from app.infrastructure.repositories.async_vote_repository import AsyncVoteRepository
+from app.domain.entities.player import Player
+from app.domain.entities.video import Video, VideoStatus
+from app.domain.entities.vote import Vote
+from app.domain.value_objects.email import Email
+from app.domain.value_objects.password import Password
+
+
+class TestAsyncPlayerRepository:
+    """Tests de integración para AsyncPlayerRepository"""
+
+    @pytest.mark.asyncio
+    async def test_create_and_get_player(self, async_db_session):
+        """Test para crear y consultar un jugador con AsyncSession"""
+        # Arrange
+        repository = AsyncPlayerRepository(async_db_session)
+        player = Player(
+            id=None,
+            first_name="John",
+            last_name="Doe",
+            email=Email("john.async@example.com"),
+            password=Password("dummy", hashed_value="$2b$12$hashed..."),
+            city="Bogotá",
+            country="Colombia"
+        )
+
+        # Act
+        created = await repository.create(player)
+        by_id = await repository.get_by_id(created.id)
+        by_email = await repository.get_by_email(Email("john.async@example.com"))
+
+        # Assert
+        assert created.id is not None
+        assert by_id.first_name == "John"
+        assert by_email.id == created.id
+
+    @pytest.mark.asyncio
+    async def test_get_player_not_found(self, async_db_session):
+        """Test para un jugador inexistente"""
+        repository = AsyncPlayerRepository(async_db_session)
+        assert await repository.get_by_id(999) is None
+
+
+class TestAsyncVideoRepository:
+    """Tests de integración para AsyncVideoRepository"""
+
+    @pytest.mark.asyncio
+    async def test_create_update_and_list(self, async_db_session, test_player):
+        """Test para crear, actualizar y listar videos públicos"""
+        # Arrange
+        repository = AsyncVideoRepository(async_db_session)
+        video = Video(id=None, player_id=test_player.id, title="Async Video", status=VideoStatus.UPLOADED)
+
+        # Act
+        created = await repository.create(video)
+        created.mark_as_processed("/videos/processed/1")
+        await repository.update(created)
+        public_videos = await repository.get_public_videos()
+        player_videos = await repository.get_by_player(test_player.id)
+
+        # Assert
+        assert [v.id for v in public_videos] == [created.id]
+        assert player_videos[0].status == VideoStatus.PROCESSED
+
+    @pytest.mark.asyncio
+    async def test_delete_video(self, async_db_session, test_player):
+        """Test para eliminar un video"""
+        repository = AsyncVideoRepository(async_db_session)
+        created = await repository.create(
+            Video(id=None, player_id=test_player.id, title="Borrar", status=VideoStatus.UPLOADED)
+        )
+
+        assert await repository.delete(created.id) is True
+        assert await repository.get_by_id(created.id) is None
+
+
+class TestAsyncVoteRepository:
+    """Tests de integración para AsyncVoteRepository"""
+
+    @pytest.mark.asyncio
+    async def test_votes_counts(self, async_db_session, test_video, test_player):
+        """Test para registrar votos y contarlos"""
+        # Arrange
+        repository = AsyncVoteRepository(async_db_session)
+
+        # Act
+        await repository.create(Vote(id=None, video_id=test_video.id, player_id=test_player.id))
+
+        # Assert
+        assert await repository.has_user_voted(test_video.id, test_player.id) is True
+        assert await repository.has_user_voted(test_video.id, 999) is False
+        assert await repository.count_votes_for_video(test_video.id) == 1
+        assert await repository.get_votes_by_videos([test_video.id, 999]) == {test_video.id: 1, 999: 0}
+        assert await AsyncVideoRepository(async_db_session).get_votes_count(test_video.id) == 1
+
+
+    @pytest.mark.asyncio
+    async def test_votes_update_rankings(self, async_db_session, test_video, test_player):
+        """Test que crear y eliminar votos mantiene el ranking materializado"""
+        # Arrange
+        repository = AsyncVoteRepository(async_db_session)
+        player_repository = AsyncPlayerRepository(async_db_session)
+
+        # Act
+        vote = await repository.create(Vote(id=None, video_id=test_video.id, player_id=test_player.id))
+        after_create = await player_repository.get_rankings(city="Bogotá")
+        await repository.delete(vote.id)
+        after_delete = await player_repository.get_rankings()
+
+        # Assert
+        assert [(r.player_id, r.total_votes) for r in after_create] == [(test_player.id, 1)]
+        assert after_delete[0].total_votes == 0
+
+    @pytest.mark.asyncio
+    async def test_cast_vote(self, async_db_session, test_video, test_player):
+        """Test que cast_vote registra el voto una sola vez y rechaza el voto propio"""
+        # Arrange
+        repository = AsyncVoteRepository(async_db_session)
+        voter = await AsyncPlayerRepository(async_db_session).create(Player(
+            id=None,
+            first_name="Async",
+            last_name="Voter",
+            email=Email("async.voter@example.com"),
+            password=Password("dummy", hashed_value="$2b$12$hashed..."),
+            city="Bogotá",
+            country="Colombia"
+        ))
+        voter_id = voter.id
+
+        # Act
+        first = await repository.cast_vote(test_video.id, voter_id)
+        duplicate = await repository.cast_vote(test_video.id, voter_id)
+        own = await repository.cast_vote(test_video.id, test_player.id)
+
+        # Assert
+        assert (first, duplicate, own) == (test_player.id, None, None)
+        assert await repository.count_votes_for_video(test_video.id) == 1
+
+        # Un lote con el mismo voto no inserta nada
+        assert await repository.cast_votes_batch([(test_video.id, voter_id)]) == []
+
+def test_to_async_url():
+    """Test que la URL de la BD se convierte al driver async"""
+    from app.infrastructure.database.async_database import to_async_url
+
+    assert to_async_url("postgresql://u:p@host:5432/db") == "postgresql+asyncpg://u:p@host:5432/db"
+    assert to_async_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
@@ -0,0 +1,164 @@
+"""Tests para la caché de autenticación"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from app.domain.entities.player import Player
+from app.domain.value_objects.email import Email
+from app.domain.value_objects.password import Password
+from app.services.auth_cache_service import AuthCacheService
+from app.shared.utils.ttl_cache import TTLCache
+
+
+class FakeClock:
+    """Reloj controlable para probar la expiración"""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _player(player_id: int = 7, is_active: bool = True) -> Player:
+    return Player(
+        id=player_id,
+        first_name="Cache",
+        last_name="Player",
+        email=Email("cache.player@example.com"),
+        password=Password("dummy", hashed_value="$2b$12$hashed..."),
+        city="Bogotá",
+        country="Colombia",
+        is_active=is_active
+    )
+
+
+class TestTTLCache:
+    """Tests para TTLCache"""
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = TTLCache(max_size=10, ttl=5, clock=clock)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=1)
+
+        clock.now = 1
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+
+        clock.now = 5
+        assert cache.get("a") is None
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(max_size=2, ttl=60, clock=FakeClock())
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert len(cache) == 2
+
+
+class TestAuthCacheService:
+    """Tests para AuthCacheService"""
+
+    def test_token_ttl_bounded_by_exp(self):
+        clock = FakeClock()
+        cache = AuthCacheService(ttl=60, clock=clock, wall_clock=lambda: 1000.0)
+        cache.remember_token("short", 7, expires_at=1010)
+        cache.remember_token("expired", 7, expires_at=999)
+        cache.remember_token("long", 7, expires_at=5000)
+
+        clock.now = 20
+        assert cache.get_player_id("short") is None
+        assert cache.get_player_id("expired") is None
+        assert cache.get_player_id("long") == 7
+
+    def test_invalidate_player(self):
+        cache = AuthCacheService(clock=FakeClock())
+        cache.remember_player(7, True)
+
+        cache.invalidate_player(7)
+
+        assert cache.is_active(7) is None
+
+
+class TestGetCurrentPlayerId:
+    """Tests para get_current_player_id con la caché de autenticación"""
+
+    @pytest.fixture
+    def services(self, monkeypatch):
+        """Registra mocks en el contenedor y restaura el registro al terminar"""
+        from app.shared.container import container
+        from app.shared.interfaces.authentication import AuthenticationInterface
+        from app.domain.repositories.player_repository import PlayerRepositoryInterface
+
+        auth_service = AsyncMock()
+        auth_service.verify_token.return_value = {"sub": "7", "exp": 4102444800}
+        player_repository = AsyncMock()
+        player_repository.get_by_id.return_value = _player()
+        auth_cache = AuthCacheService()
+        registry = {
+            AuthenticationInterface.__name__: auth_service,
+            PlayerRepositoryInterface.__name__: player_repository,
+            AuthCacheService.__name__: auth_cache,
+        }
+        for name, instance in registry.items():
+            monkeypatch.setitem(container._services, name, (lambda instance=instance: instance, True))
+            monkeypatch.setitem(container._singletons, name, instance)
+        return auth_service, player_repository, auth_cache
+
+    @pytest.mark.asyncio
+    async def test_second_request_skips_jwt_and_database(self, services):
+        """Test que un token ya verificado no vuelve a decodificarse ni a consultar la BD"""
+        from app.shared.dependencies.auth_dependencies import get_current_player_id
+        auth_service, player_repository, _ = services
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="token")
+
+        assert await get_current_player_id(credentials) == 7
+        assert await get_current_player_id(credentials) == 7
+
+        auth_service.verify_token.assert_called_once_with("token")
+        player_repository.get_by_id.assert_called_once_with(7)
+
+    @pytest.mark.asyncio
+    async def test_deactivation_invalidates_cached_status(self, services):
+        """Test que desactivar al jugador invalida su estado y el token deja de aceptarse"""
+        from app.services.player_service import PlayerService
+        from app.shared.dependencies.auth_dependencies import get_current_player_id
+        _, player_repository, auth_cache = services
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="token")
+        await get_current_player_id(credentials)
+
+        # Act
+        player_repository.update.return_value = _player(is_active=False)
+        await PlayerService(player_repository, AsyncMock(), auth_cache=auth_cache).deactivate_player(7)
+        player_repository.get_by_id.return_value = _player(is_active=False)
+
+        # Assert
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_player_id(credentials)
+        assert exc_info.value.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_invalidates_after_commit(self, services):
+        """Test que la caché se invalida después de confirmar la unidad de trabajo"""
+        from app.services.player_service import PlayerService
+        _, player_repository, auth_cache = services
+        calls = []
+        unit_of_work = AsyncMock()
+        unit_of_work.commit.side_effect = lambda: calls.append("commit")
+        auth_cache.invalidate_player = MagicMock(side_effect=lambda player_id: calls.append("invalidate"))
+        service = PlayerService(player_repository, AsyncMock(), auth_cache=auth_cache, unit_of_work=unit_of_work)
+
+        # Act
+        player_repository.update.return_value = _player(is_active=False)
+        await service.deactivate_player(7)
+        await service.update_player_profile(7, city="Medellín")
+        await service.delete_player(7)
+
+        # Assert
+        assert calls == ["commit", "invalidate"] * 3
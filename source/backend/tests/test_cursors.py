@@ -0,0 +1,19 @@
+"""Tests para los cursores opacos de paginación"""
+
+import pytest
+from app.shared.utils.cursors import InvalidCursorError, decode_cursor, encode_cursor
+
+
+def test_cursor_roundtrip():
+    """Test que un cursor se decodifica a los mismos valores"""
+    cursor = encode_cursor(12, 345, "2024-01-01T00:00:00")
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, 3) == [12, 345, "2024-01-01T00:00:00"]
+
+
+@pytest.mark.parametrize("cursor", ["no-es-base64!!", encode_cursor(1, 2), "e30", ""])
+def test_invalid_cursor(cursor):
+    """Test que cursores malformados o de otro tamaño se rechazan"""
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, 3)
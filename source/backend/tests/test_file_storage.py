@@ -0,0 +1,369 @@
+"""Tests para las implementaciones de almacenamiento de archivos"""
+
+import asyncio
+import io
+import threading
+import time
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import Mock
+from botocore.exceptions import ClientError
+from starlette.requests import Request
+from fastapi import UploadFile
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
+from app.infrastructure.external_services.local_file_storage import LocalFileStorage
+from app.infrastructure.external_services.s3_file_storage import S3FileStorage
+from app.infrastructure.external_services.async_s3_file_storage import AsyncS3FileStorage
+from app.routers.videos import _build_video_response
+from app.shared.interfaces.file_storage import FileTooLargeError, StoredFile
+
+
+def _not_found_error(operation: str) -> ClientError:
+    return ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, operation)
+
+
+def _upload(data: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename="video.mp4")
+
+
+def _request(headers: dict = None) -> Request:
+    raw_headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw_headers})
+
+
+class TestLocalFileStorage:
+    """Tests para LocalFileStorage"""
+
+    @pytest.fixture
+    def storage(self, tmp_path):
+        storage = LocalFileStorage(str(tmp_path))
+        (tmp_path / "original" / "1.mp4").write_bytes(b"0123456789")
+        return storage
+
+    @pytest.mark.asyncio
+    async def test_get_stored_file_returns_path(self, storage, tmp_path):
+        """Test que el descriptor local apunta al archivo en disco"""
+        stored = await storage.get_stored_file("1.mp4", "original")
+
+        assert stored.path == str(tmp_path / "original" / "1.mp4")
+        assert stored.size == 10
+        assert stored.url is None
+        assert stored.etag.startswith('"') and stored.etag.endswith('"')
+        assert stored.last_modified.tzinfo is not None
+
+    @pytest.mark.asyncio
+    async def test_get_stored_file_not_found(self, storage):
+        """Test que un archivo inexistente lanza FileNotFoundError"""
+        with pytest.raises(FileNotFoundError):
+            await storage.get_stored_file("999.mp4", "original")
+
+    def test_iter_file_content_in_chunks(self, storage):
+        """Test que el contenido se itera en bloques del tamaño pedido"""
+        chunks = list(storage.iter_file_content("1.mp4", "original", chunk_size=4))
+        assert chunks == [b"0123", b"4567", b"89"]
+
+    def test_iter_file_content_range(self, storage):
+        """Test que un rango inclusivo solo lee los bytes pedidos"""
+        chunks = list(storage.iter_file_content("1.mp4", "original", chunk_size=4, start=3, end=8))
+        assert b"".join(chunks) == b"345678"
+
+
+    @pytest.mark.asyncio
+    async def test_save_file_copies_in_chunks(self, tmp_path):
+        """Test que el archivo se copia por chunks sin dejar temporales"""
+        storage = LocalFileStorage(str(tmp_path), chunk_size=3)
+
+        path = await storage.save_file(_upload(b"0123456789"), "2.mp4", "original", max_size=10)
+
+        assert open(path, "rb").read() == b"0123456789"
+        assert sorted(p.name for p in (tmp_path / "original").iterdir()) == ["2.mp4"]
+
+    @pytest.mark.asyncio
+    async def test_save_file_too_large_leaves_no_file(self, tmp_path):
+        """Test que superar max_size aborta la copia y elimina el parcial"""
+        storage = LocalFileStorage(str(tmp_path), chunk_size=3)
+
+        with pytest.raises(FileTooLargeError):
+            await storage.save_file(_upload(b"0123456789"), "2.mp4", "original", max_size=5)
+
+        assert list((tmp_path / "original").iterdir()) == []
+
+
+class TestS3FileStorage:
+    """Tests para S3FileStorage con cliente mockeado"""
+
+    def _storage(self, download_mode: str) -> S3FileStorage:
+        storage = S3FileStorage(bucket_name="bucket", download_mode=download_mode)
+        storage.s3_client = Mock()
+        storage.s3_client.head_object.return_value = {
+            "ContentLength": 10,
+            "ETag": '"abc123"',
+            "LastModified": datetime(2025, 1, 1, tzinfo=timezone.utc)
+        }
+        storage.s3_client.generate_presigned_url.return_value = "https://s3/presigned"
+        return storage
+
+    @pytest.mark.asyncio
+    async def test_redirect_mode_returns_presigned_url(self):
+        """Test que en modo redirect el descriptor trae la URL presignada"""
+        storage = self._storage("redirect")
+
+        stored = await storage.get_stored_file("1.mp4", "processed")
+
+        assert stored.url == "https://s3/presigned"
+        assert stored.size == 10
+        assert stored.etag == '"abc123"'
+        storage.s3_client.head_object.assert_called_once_with(Bucket="bucket", Key="processed/1.mp4")
+
+    @pytest.mark.asyncio
+    async def test_stream_mode_has_no_url(self):
+        """Test que en modo stream no se genera URL presignada"""
+        storage = self._storage("stream")
+
+        stored = await storage.get_stored_file("1.mp4", "processed")
+
+        assert stored.url is None
+        storage.s3_client.generate_presigned_url.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_stored_file_not_found(self):
+        """Test que un objeto inexistente lanza FileNotFoundError"""
+        storage = self._storage("redirect")
+        storage.s3_client.head_object.side_effect = _not_found_error("HeadObject")
+
+        with pytest.raises(FileNotFoundError):
+            await storage.get_stored_file("999.mp4", "original")
+
+    def test_iter_file_content_streams_body(self):
+        """Test que el cuerpo del objeto se itera por chunks y se cierra"""
+        storage = self._storage("stream")
+        body = Mock()
+        body.iter_chunks.return_value = iter([b"01234", b"56789"])
+        storage.s3_client.get_object.return_value = {"Body": body}
+
+        chunks = list(storage.iter_file_content("1.mp4", "original", chunk_size=5))
+
+        assert chunks == [b"01234", b"56789"]
+        body.iter_chunks.assert_called_once_with(5)
+        body.close.assert_called_once()
+        assert "Range" not in storage.s3_client.get_object.call_args.kwargs
+
+    def test_iter_file_content_range_uses_s3_range(self):
+        """Test que un rango se delega a S3 con el header Range"""
+        storage = self._storage("stream")
+        body = Mock()
+        body.iter_chunks.return_value = iter([b"2345"])
+        storage.s3_client.get_object.return_value = {"Body": body}
+
+        list(storage.iter_file_content("1.mp4", "original", start=2, end=5))
+
+        assert storage.s3_client.get_object.call_args.kwargs["Range"] == "bytes=2-5"
+
+
+    def _multipart_storage(self) -> S3FileStorage:
+        storage = self._storage("stream")
+        storage.part_size = 4
+        storage.upload_concurrency = 2
+        storage.s3_client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+        storage.s3_client.upload_part.side_effect = lambda **kwargs: {"ETag": f'"{kwargs["PartNumber"]}"'}
+        return storage
+
+    @pytest.mark.asyncio
+    async def test_save_small_file_uses_put_object(self):
+        """Test que un archivo menor a una parte se sube con put_object"""
+        storage = self._storage("stream")
+
+        result = await storage.save_file(_upload(b"0123"), "1.mp4", "original", max_size=10)
+
+        assert result == "s3://bucket/original/1.mp4"
+        assert storage.s3_client.put_object.call_args.kwargs["Body"] == b"0123"
+        storage.s3_client.create_multipart_upload.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_save_large_file_uses_multipart(self):
+        """Test que un archivo grande se sube en partes ordenadas"""
+        storage = self._multipart_storage()
+
+        await storage.save_file(_upload(b"0123456789"), "1.mp4", "original")
+
+        bodies = [c.kwargs["Body"] for c in storage.s3_client.upload_part.call_args_list]
+        assert sorted(bodies) == [b"0123", b"4567", b"89"]
+        complete = storage.s3_client.complete_multipart_upload.call_args.kwargs
+        assert [p["PartNumber"] for p in complete["MultipartUpload"]["Parts"]] == [1, 2, 3]
+        storage.s3_client.put_object.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_save_too_large_aborts_multipart(self):
+        """Test que superar max_size aborta el multipart upload"""
+        storage = self._multipart_storage()
+
+        with pytest.raises(FileTooLargeError):
+            await storage.save_file(_upload(b"0123456789"), "1.mp4", "original", max_size=6)
+
+        storage.s3_client.abort_multipart_upload.assert_called_once_with(
+            Bucket="bucket", Key="original/1.mp4", UploadId="upload-1"
+        )
+        storage.s3_client.complete_multipart_upload.assert_not_called()
+
+
+    @pytest.mark.asyncio
+    async def test_create_upload_target_presigned_post(self):
+        """Test que la subida directa usa un POST presignado con límite de tamaño"""
+        storage = self._storage("redirect")
+        storage.s3_client.generate_presigned_post.return_value = {"url": "https://s3/bucket", "fields": {}}
+
+        target = await storage.create_upload_target("7.mp4", "original", "video/mp4", max_size=100)
+
+        assert target["url"] == "https://s3/bucket"
+        kwargs = storage.s3_client.generate_presigned_post.call_args.kwargs
+        assert kwargs["Key"] == "original/7.mp4"
+        assert ["content-length-range", 1, 100] in kwargs["Conditions"]
+
+
+class TestAsyncS3FileStorage:
+    """Tests para AsyncS3FileStorage (boto3 en pool de threads)"""
+
+    def _storage(self) -> AsyncS3FileStorage:
+        storage = AsyncS3FileStorage(bucket_name="bucket", max_workers=4)
+        storage.s3_client = Mock()
+        return storage
+
+    def test_client_pool_sized_to_workers(self):
+        """Test que el pool de conexiones del cliente coincide con los threads"""
+        storage = AsyncS3FileStorage(bucket_name="bucket", max_workers=4)
+        assert storage.s3_client.meta.config.max_pool_connections == 4
+
+    @pytest.mark.asyncio
+    async def test_calls_run_off_the_event_loop(self):
+        """Test que una llamada lenta a S3 no bloquea el event loop"""
+        storage = self._storage()
+        call_threads = []
+
+        def slow_head_object(**kwargs):
+            call_threads.append(threading.current_thread())
+            time.sleep(0.2)
+            return {"ContentLength": 10}
+
+        storage.s3_client.head_object.side_effect = slow_head_object
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker_task = asyncio.ensure_future(ticker())
+        size = await storage.get_file_size("1.mp4", "original")
+        ticker_task.cancel()
+
+        assert size == 10
+        assert call_threads[0] is not threading.main_thread()
+        # El loop siguió atendiendo otras tareas mientras S3 respondía
+        assert ticks >= 5
+
+
+class TestBuildVideoResponse:
+    """Tests para la respuesta de descarga de videos"""
+
+    @pytest.fixture
+    def stored(self):
+        return StoredFile(
+            filename="1.mp4",
+            location="processed",
+            size=10,
+            etag='"abc123"',
+            last_modified=datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+        )
+
+    @pytest.fixture
+    def video_service(self):
+        video_service = Mock()
+        video_service.iter_video_content.return_value = iter([b"0123456789"])
+        return video_service
+
+    def test_presigned_url_redirects(self):
+        """Test que una URL presignada produce un 302"""
+        stored = StoredFile(filename="1.mp4", location="original", size=10, url="https://s3/presigned")
+
+        response = _build_video_response(Mock(), stored, "1", _request())
+
+        assert isinstance(response, RedirectResponse)
+        assert response.status_code == 302
+        assert response.headers["location"] == "https://s3/presigned"
+
+    def test_local_path_uses_file_response(self, tmp_path):
+        """Test que un archivo local se sirve con FileResponse"""
+        path = tmp_path / "1.mp4"
+        path.write_bytes(b"0123456789")
+        stored = StoredFile(filename="1.mp4", location="original", size=10, path=str(path), etag='"v1"')
+
+        response = _build_video_response(Mock(), stored, "1", _request())
+
+        assert isinstance(response, FileResponse)
+        assert response.headers["content-disposition"] == "inline; filename=1"
+        assert response.headers["etag"] == '"v1"'
+        assert response.headers["accept-ranges"] == "bytes"
+
+    def test_without_path_or_url_streams(self, stored, video_service):
+        """Test que sin ruta ni URL el contenido se reenvía por chunks con validadores"""
+        response = _build_video_response(video_service, stored, "processed_1", _request())
+
+        assert isinstance(response, StreamingResponse)
+        assert response.status_code == 200
+        assert response.headers["content-length"] == "10"
+        assert response.headers["etag"] == '"abc123"'
+        assert response.headers["last-modified"] == "Wed, 01 Jan 2025 12:00:00 GMT"
+        video_service.iter_video_content.assert_called_once_with(stored)
+
+    def test_if_none_match_returns_304(self, stored, video_service):
+        """Test que un ETag vigente en If-None-Match responde 304 sin cuerpo"""
+        response = _build_video_response(
+            video_service, stored, "processed_1", _request({"If-None-Match": '"abc123"'})
+        )
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == '"abc123"'
+        video_service.iter_video_content.assert_not_called()
+
+    def test_range_returns_206(self, stored, video_service):
+        """Test que un header Range válido responde 206 con solo ese rango"""
+        response = _build_video_response(
+            video_service, stored, "processed_1", _request({"Range": "bytes=2-5"})
+        )
+
+        assert response.status_code == 206
+        assert response.headers["content-range"] == "bytes 2-5/10"
+        assert response.headers["content-length"] == "4"
+        video_service.iter_video_content.assert_called_once_with(stored, start=2, end=5)
+
+    def test_range_on_local_file_streams_partial(self, tmp_path, video_service):
+        """Test que un rango sobre un archivo local no usa FileResponse completo"""
+        path = tmp_path / "1.mp4"
+        path.write_bytes(b"0123456789")
+        stored = StoredFile(filename="1.mp4", location="original", size=10, path=str(path))
+
+        response = _build_video_response(video_service, stored, "1", _request({"Range": "bytes=-3"}))
+
+        assert response.status_code == 206
+        assert response.headers["content-range"] == "bytes 7-9/10"
+
+    def test_unsatisfiable_range_returns_416(self, stored, video_service):
+        """Test que un rango fuera del archivo responde 416"""
+        response = _build_video_response(
+            video_service, stored, "processed_1", _request({"Range": "bytes=50-"})
+        )
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == "bytes */10"
+
+    def test_stale_if_range_returns_full_body(self, stored, video_service):
+        """Test que un If-Range desactualizado ignora el Range y envía el archivo completo"""
+        response = _build_video_response(
+            video_service, stored, "processed_1",
+            _request({"Range": "bytes=2-5", "If-Range": '"old-etag"'})
+        )
+
+        assert response.status_code == 200
+        video_service.iter_video_content.assert_called_once_with(stored)
@@ -0,0 +1,63 @@
+"""Tests para las utilidades de Range y peticiones condicionales"""
+
+import pytest
+from datetime import datetime, timezone
+from app.shared.utils.http_ranges import (
+    RangeNotSatisfiableError, etag_matches, if_range_matches, is_not_modified, parse_range_header
+)
+
+LAST_MODIFIED = datetime(2025, 1, 1, 12, 0, 0, 500000, tzinfo=timezone.utc)
+LAST_MODIFIED_HTTP = "Wed, 01 Jan 2025 12:00:00 GMT"
+
+
+class TestParseRangeHeader:
+    """Tests para parse_range_header"""
+
+    def test_closed_range(self):
+        assert parse_range_header("bytes=0-99", 1000) == (0, 99)
+
+    def test_open_range(self):
+        assert parse_range_header("bytes=500-", 1000) == (500, 999)
+
+    def test_suffix_range(self):
+        assert parse_range_header("bytes=-100", 1000) == (900, 999)
+
+    def test_end_is_clamped_to_size(self):
+        assert parse_range_header("bytes=900-5000", 1000) == (900, 999)
+
+    def test_multiple_ranges_are_ignored(self):
+        assert parse_range_header("bytes=0-1,5-6", 1000) is None
+
+    def test_invalid_header_is_ignored(self):
+        assert parse_range_header("items=0-1", 1000) is None
+        assert parse_range_header("bytes=abc", 1000) is None
+
+    def test_start_beyond_size_is_unsatisfiable(self):
+        with pytest.raises(RangeNotSatisfiableError):
+            parse_range_header("bytes=1000-", 1000)
+
+
+class TestConditionalRequests:
+    """Tests para If-None-Match, If-Modified-Since e If-Range"""
+
+    def test_etag_matches_weak_and_lists(self):
+        assert etag_matches('"a", W/"b"', '"b"')
+        assert etag_matches("*", '"b"')
+        assert not etag_matches('"a"', '"b"')
+
+    def test_if_none_match_takes_precedence(self):
+        assert not is_not_modified('"old"', LAST_MODIFIED_HTTP, '"new"', LAST_MODIFIED)
+        assert is_not_modified('"new"', None, '"new"', LAST_MODIFIED)
+
+    def test_if_modified_since_ignores_subsecond(self):
+        assert is_not_modified(None, LAST_MODIFIED_HTTP, '"new"', LAST_MODIFIED)
+        assert not is_not_modified(None, "Tue, 31 Dec 2024 00:00:00 GMT", '"new"', LAST_MODIFIED)
+
+    def test_if_range_etag_requires_strong_match(self):
+        assert if_range_matches('"abc"', '"abc"', LAST_MODIFIED)
+        assert not if_range_matches('W/"abc"', '"abc"', LAST_MODIFIED)
+        assert not if_range_matches('"old"', '"abc"', LAST_MODIFIED)
+
+    def test_if_range_date(self):
+        assert if_range_matches(LAST_MODIFIED_HTTP, '"abc"', LAST_MODIFIED)
+        assert not if_range_matches("Tue, 31 Dec 2024 00:00:00 GMT", '"abc"', LAST_MODIFIED)
@@ -0,0 +1,261 @@
+"""Tests para el ranking en memoria"""
+
+import pytest
+from unittest.mock import AsyncMock
+from app.services.leaderboard_service import LeaderboardService
+from app.services.player_service import PlayerService
+from app.domain.entities.player import Player
+from app.domain.entities.player_score import PlayerScore
+from app.domain.value_objects.email import Email
+from app.domain.value_objects.password import Password
+
+
+def _player(player_id: int, city: str = "Bogotá") -> Player:
+    return Player(
+        id=player_id,
+        first_name=f"Player{player_id}",
+        last_name="Rank",
+        email=Email(f"player{player_id}.rank@example.com"),
+        password=Password("dummy", hashed_value="$2b$12$hashed..."),
+        city=city,
+        country="Colombia"
+    )
+
+
+class FakeClock:
+    """Reloj controlable para probar la cota de obsolescencia"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLeaderboardService:
+    """Tests para LeaderboardService"""
+
+    @pytest.fixture
+    def mock_player_repository(self):
+        """Mock del repositorio de jugadores con un ranking en BD"""
+        repository = AsyncMock()
+        repository.get_rankings_from_votes.return_value = [
+            PlayerScore(player=_player(1), total_votes=5),
+            PlayerScore(player=_player(2, city="Cali"), total_votes=3),
+            PlayerScore(player=_player(3), total_votes=1),
+        ]
+        return repository
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def leaderboard(self, mock_player_repository, clock):
+        return LeaderboardService(mock_player_repository, refresh_interval=10, max_staleness=30, clock=clock)
+
+    @pytest.mark.asyncio
+    async def test_reconcile_builds_global_and_city_rankings(self, leaderboard, mock_player_repository):
+        """Test que la reconciliación construye el ranking global y por ciudad"""
+        # Act
+        await leaderboard.reconcile()
+
+        # Assert
+        mock_player_repository.get_rankings_from_votes.assert_called_once_with()
+        mock_player_repository.sync_scores_from_votes.assert_awaited_once_with()
+        assert [s.player_id for s in leaderboard.top()] == [1, 2, 3]
+        assert [s.player_id for s in leaderboard.top(city="Bogotá")] == [1, 3]
+        assert [s.player_id for s in leaderboard.top(limit=1)] == [1]
+        assert leaderboard.top(city="Medellín") == []
+
+    @pytest.mark.asyncio
+    async def test_record_vote_reorders_ranking(self, leaderboard):
+        """Test que un voto mueve al jugador a su nueva posición"""
+        # Arrange
+        await leaderboard.reconcile()
+
+        # Act
+        for _ in range(3):
+            await leaderboard.record_vote(2)
+
+        # Assert
+        assert [(s.player_id, s.total_votes) for s in leaderboard.top()] == [(2, 6), (1, 5), (3, 1)]
+        assert [s.player_id for s in leaderboard.top(city="Cali")] == [2]
+
+    @pytest.mark.asyncio
+    async def test_record_vote_for_unknown_player(self, leaderboard, mock_player_repository):
+        """Test que el primer voto de un jugador lo agrega al ranking"""
+        # Arrange
+        await leaderboard.reconcile()
+        mock_player_repository.get_by_id.return_value = _player(4, city="Cali")
+
+        # Act
+        await leaderboard.record_vote(4)
+
+        # Assert
+        assert [(s.player_id, s.total_votes) for s in leaderboard.top(city="Cali")] == [(2, 3), (4, 1)]
+
+    @pytest.mark.asyncio
+    async def test_reconcile_replays_votes_recorded_during_query(self, leaderboard, mock_player_repository):
+        """Test que los votos registrados mientras corre la consulta no se pierden al reemplazar el ranking"""
+        # Arrange
+        snapshot = mock_player_repository.get_rankings_from_votes.return_value
+
+        async def query_with_concurrent_votes():
+            await leaderboard.record_vote(3)
+            await leaderboard.record_vote(3)
+            return snapshot
+
+        mock_player_repository.get_rankings_from_votes.side_effect = query_with_concurrent_votes
+
+        # Act
+        await leaderboard.reconcile()
+        await leaderboard.record_vote(3)
+
+        # Assert
+        assert [(s.player_id, s.total_votes) for s in leaderboard.top()] == [(1, 5), (3, 4), (2, 3)]
+
+    @pytest.mark.asyncio
+    async def test_reconcile_survives_failed_score_sync(self, leaderboard, mock_player_repository):
+        """Test que un error al corregir player_scores no impide reconstruir el ranking en memoria"""
+        mock_player_repository.sync_scores_from_votes.side_effect = RuntimeError("db")
+
+        await leaderboard.reconcile()
+
+        assert leaderboard.is_fresh() is True
+        assert [s.player_id for s in leaderboard.top()] == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_top_after_and_rank(self, leaderboard):
+        """Test de paginación por keyset y posición de un jugador"""
+        # Arrange
+        await leaderboard.reconcile()
+
+        # Act
+        after_first = leaderboard.top(after=(5, 1))
+        rank = leaderboard.rank(3)
+        city_rank = leaderboard.rank(3, city="Bogotá")
+
+        # Assert
+        assert [s.player_id for s in after_first] == [2, 3]
+        assert rank.position == 3
+        assert city_rank.position == 2
+        assert leaderboard.rank(3, city="Cali") is None
+        assert leaderboard.rank(99) is None
+
+    @pytest.mark.asyncio
+    async def test_staleness_bound(self, leaderboard, clock):
+        """Test que el ranking deja de usarse al superar la cota de obsolescencia"""
+        assert leaderboard.is_fresh() is False
+
+        await leaderboard.reconcile()
+        clock.now = 30
+        assert leaderboard.is_fresh() is True
+
+        clock.now = 31
+        assert leaderboard.is_fresh() is False
+
+
+class TestPlayerServiceRankings:
+    """Tests para PlayerService.get_rankings con ranking en memoria"""
+
+    @pytest.mark.asyncio
+    async def test_uses_leaderboard_when_fresh(self):
+        """Test que el ranking se sirve desde memoria sin acceder a la BD"""
+        # Arrange
+        repository = AsyncMock()
+        leaderboard = AsyncMock()
+        leaderboard.is_fresh = lambda: True
+        leaderboard.top = lambda city, limit, after: [PlayerScore(player=_player(1), total_votes=7)]
+        service = PlayerService(repository, AsyncMock(), leaderboard=leaderboard)
+
+        # Act
+        rankings = await service.get_rankings()
+
+        # Assert
+        assert rankings == [{"position": 1, "player_id": 1, "username": "player1.rank", "city": "Bogotá", "votes": 7}]
+        repository.get_rankings.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_database_when_stale(self):
+        """Test que con el ranking obsoleto se consulta la BD"""
+        # Arrange
+        repository = AsyncMock()
+        repository.get_rankings.return_value = [PlayerScore(player=_player(1), total_votes=2)]
+        leaderboard = AsyncMock()
+        leaderboard.is_fresh = lambda: False
+        service = PlayerService(repository, AsyncMock(), leaderboard=leaderboard)
+
+        # Act
+        rankings = await service.get_rankings(city="Bogotá", limit=5)
+
+        # Assert
+        assert rankings[0]["votes"] == 2
+        repository.get_rankings.assert_called_once_with("Bogotá", 5, None)
+
+    @pytest.mark.asyncio
+    async def test_cursor_pages_continue_positions(self):
+        """Test que el cursor continúa después de la última fila y conserva la numeración"""
+        # Arrange
+        leaderboard = LeaderboardService(AsyncMock(), clock=lambda: 0)
+        leaderboard._player_repository.get_rankings_from_votes.return_value = [
+            PlayerScore(player=_player(i), total_votes=10 - i) for i in range(1, 6)
+        ]
+        await leaderboard.reconcile()
+        service = PlayerService(AsyncMock(), AsyncMock(), leaderboard=leaderboard)
+
+        # Act
+        first = await service.get_rankings(limit=2)
+        cursor = service.next_rankings_cursor(first, 2)
+        second = await service.get_rankings(limit=2, cursor=cursor)
+        last = await service.get_rankings(limit=2, cursor=service.next_rankings_cursor(second, 2))
+
+        # Assert
+        assert [(r["position"], r["player_id"]) for r in first] == [(1, 1), (2, 2)]
+        assert [(r["position"], r["player_id"]) for r in second] == [(3, 3), (4, 4)]
+        assert [(r["position"], r["player_id"]) for r in last] == [(5, 5)]
+        assert service.next_rankings_cursor(last, 2) is None
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self):
+        """Test que un cursor manipulado se rechaza"""
+        from app.shared.utils.cursors import InvalidCursorError, encode_cursor
+        service = PlayerService(AsyncMock(), AsyncMock())
+
+        with pytest.raises(InvalidCursorError):
+            await service.get_rankings(cursor=encode_cursor("x", 1, 1))
+
+    @pytest.mark.asyncio
+    async def test_get_player_rank_not_ranked(self):
+        """Test que un jugador sin votos no tiene posición"""
+        from app.shared.exceptions.player_exceptions import PlayerNotFoundException
+        repository = AsyncMock()
+        repository.get_player_rank.return_value = None
+        service = PlayerService(repository, AsyncMock())
+
+        with pytest.raises(PlayerNotFoundException):
+            await service.get_player_rank(99)
+
+
+@pytest.mark.asyncio
+async def test_vote_commits_before_updating_leaderboard():
+    """Test que el voto se confirma en la BD antes de reflejarse en memoria"""
+    from app.services.video_service import VideoService
+
+    # Arrange
+    calls = []
+    video_repository = AsyncMock()
+    vote_repository = AsyncMock()
+    vote_repository.cast_vote.return_value = 1
+    unit_of_work = AsyncMock()
+    unit_of_work.commit.side_effect = lambda: calls.append("commit")
+    leaderboard = AsyncMock()
+    leaderboard.record_vote.side_effect = lambda player_id: calls.append(("record_vote", player_id))
+    service = VideoService(video_repository, vote_repository, AsyncMock(), AsyncMock(),
+                           unit_of_work=unit_of_work, leaderboard=leaderboard)
+
+    # Act
+    await service.vote_for_video(1, 2)
+
+    # Assert
+    assert calls == ["commit", ("record_vote", 1)]
@@ -0,0 +1,74 @@
+"""Tests para el pool de hashing de contraseñas"""
+
+import asyncio
+import threading
+import pytest
+from app.infrastructure.external_services.jwt_auth_service import JWTAuthService
+from app.infrastructure.external_services.password_hasher import PasswordHasher
+
+
+class TestPasswordHasher:
+    """Tests para PasswordHasher"""
+
+    @pytest.fixture
+    def hasher(self):
+        hasher = PasswordHasher(max_workers=2)
+        yield hasher
+        hasher.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_off_the_event_loop(self, hasher, monkeypatch):
+        """Test que bcrypt se ejecuta en los threads del pool y no en el del event loop"""
+        from app.infrastructure.external_services import password_hasher as module
+        threads = []
+        original = module.hash_password
+
+        def tracked_hash(password: str) -> str:
+            threads.append(threading.current_thread().name)
+            return original(password)
+
+        monkeypatch.setattr(module, "hash_password", tracked_hash)
+
+        hashed = await hasher.hash("StrongPass123")
+        valid = await hasher.verify("StrongPass123", hashed)
+        invalid = await hasher.verify("WrongPass123", hashed)
+
+        assert (valid, invalid) == (True, False)
+        assert threads[0].startswith("bcrypt")
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_metrics(self, hasher):
+        """Test que se registra la cola máxima cuando hay más operaciones que workers"""
+        release = threading.Event()
+        blocked = [hasher._run(release.wait) for _ in range(5)]
+        tasks = [asyncio.ensure_future(call) for call in blocked]
+        await asyncio.sleep(0.05)
+
+        assert hasher.stats()["in_flight"] == 5
+        assert hasher.queue_depth == 3
+
+        release.set()
+        await asyncio.gather(*tasks)
+        stats = hasher.stats()
+        assert (stats["in_flight"], stats["queue_depth"], stats["completed"]) == (0, 0, 5)
+        assert hasher.reset_peak_queue_depth() == 3
+        assert hasher.reset_peak_queue_depth() == 0
+
+    def test_rejects_unknown_executor(self):
+        with pytest.raises(ValueError):
+            PasswordHasher(executor_type="fiber")
+
+
+@pytest.mark.asyncio
+async def test_jwt_auth_service_uses_password_hasher():
+    """Test que el servicio de autenticación delega bcrypt al pool cuando está configurado"""
+    hasher = PasswordHasher(max_workers=1)
+    try:
+        service = JWTAuthService(password_hasher=hasher)
+        hashed = await service.hash_password("StrongPass123")
+
+        assert await service.verify_password("StrongPass123", hashed) is True
+        assert await JWTAuthService().verify_password("StrongPass123", hashed) is True
+        assert hasher.stats()["completed"] == 2
+    finally:
+        hasher.shutdown()
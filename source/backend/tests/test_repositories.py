@@ -373,6 +373,137 @@ class TestVoteRepository:
         # Assert
         assert vote_count >= 3
 
+    @pytest.mark.asyncio
+    async def test_video_votes_count_follows_votes(self, db_session, test_video, test_player):
+        """Test que videos.votes_count se mantiene al crear, registrar en lote y eliminar votos"""
+        # Arrange
+        repository = VoteRepository(db_session)
+        video_repository = VideoRepository(db_session)
+        voters = [
+            await PlayerRepository(db_session).create(Player(
+                id=None,
+                first_name="Counter",
+                last_name=f"Voter{i}",
+                email=Email(f"counter.voter{i}@example.com"),
+                password=Password("dummy", hashed_value="$2b$12$hashed..."),
+                city="Bogotá",
+                country="Colombia"
+            ))
+            for i in range(3)
+        ]
+
+        # Act
+        created = await repository.create(Vote(id=None, video_id=test_video.id, player_id=voters[0].id))
+        await repository.cast_vote(test_video.id, voters[1].id)
+        await repository.cast_votes_batch([(test_video.id, voters[1].id), (test_video.id, voters[2].id)])
+        after_votes = await video_repository.get_votes_count(test_video.id)
+        await repository.delete(created.id)
+
+        # Assert
+        assert after_votes == 3
+        assert await video_repository.get_votes_count(test_video.id) == 2
+        assert (await video_repository.get_by_id(test_video.id)).votes_count == 2
+        assert await video_repository.get_votes_count(99999) is None
+
+    @pytest.mark.asyncio
+    async def test_cast_vote_is_single_conditional_insert(self, db_session, test_video, test_player):
+        """Test que cast_vote registra una sola vez y rechaza votos propios, duplicados o de videos no votables"""
+        # Arrange
+        repository = VoteRepository(db_session)
+        voter = await PlayerRepository(db_session).create(Player(
+            id=None,
+            first_name="Caster",
+            last_name="User",
+            email=Email("caster.vote@example.com"),
+            password=Password("dummy", hashed_value="$2b$12$hashed..."),
+            city="Bogotá",
+            country="Colombia"
+        ))
+        pending = await VideoRepository(db_session).create(
+            Video(id=None, player_id=test_player.id, title="Pendiente", status=VideoStatus.UPLOADED)
+        )
+
+        # Act
+        first = await repository.cast_vote(test_video.id, voter.id)
+        duplicate = await repository.cast_vote(test_video.id, voter.id)
+        own = await repository.cast_vote(test_video.id, test_player.id)
+        not_public = await repository.cast_vote(pending.id, voter.id)
+        missing = await repository.cast_vote(99999, voter.id)
+
+        # Assert
+        assert first == test_player.id
+        assert (duplicate, own, not_public, missing) == (None, None, None, None)
+        assert await repository.count_votes_for_video(test_video.id) == 1
+        rankings = await PlayerRepository(db_session).get_rankings()
+        assert [(r.player_id, r.total_votes) for r in rankings] == [(test_player.id, 1)]
+
+    def test_cast_vote_is_one_statement_on_postgresql(self):
+        """Test que en PostgreSQL el voto, el ranking y el contador van en una sola sentencia"""
+        from sqlalchemy.dialects import postgresql
+        from app.infrastructure.repositories.player_score_statements import cast_vote_in_one_statement
+
+        sql = " ".join(str(cast_vote_in_one_statement(1, 2).compile(dialect=postgresql.dialect())).split())
+
+        assert sql.startswith("WITH vote AS (INSERT INTO votes")
+        assert "score AS (INSERT INTO player_scores" in sql
+        assert "ON CONFLICT (player_id) DO UPDATE" in sql
+        assert "UPDATE videos SET votes_count" in sql
+        assert "FROM vote" in sql
+
+    def test_score_statements_coalesce_null_city(self):
+        """Test que las sentencias que copian players.city a player_scores toleran ciudades NULL"""
+        from sqlalchemy.dialects import postgresql
+        from app.infrastructure.repositories import player_score_statements as statements
+
+        for statement in (
+            statements.add_vote_to_score("postgresql", 1),
+            statements.seed_player_score("postgresql", 1),
+            statements.cast_vote_in_one_statement(1, 2),
+            statements.video_owners([1]),
+        ):
+            sql = str(statement.compile(dialect=postgresql.dialect()))
+            assert "coalesce(players.city" in sql
+
+    @pytest.mark.asyncio
+    async def test_cast_votes_batch_skips_duplicates(self, db_session, test_video, test_player):
+        """Test que un lote de votos se inserta en una transacción ignorando duplicados"""
+        # Arrange
+        repository = VoteRepository(db_session)
+        voters = [
+            await PlayerRepository(db_session).create(Player(
+                id=None,
+                first_name="Batch",
+                last_name=f"Voter{i}",
+                email=Email(f"batch.voter{i}@example.com"),
+                password=Password("dummy", hashed_value="$2b$12$hashed..."),
+                city="Bogotá",
+                country="Colombia"
+            ))
+            for i in range(3)
+        ]
+        await repository.cast_vote(test_video.id, voters[0].id)
+
+        # Act
+        inserted = await repository.cast_votes_batch([(test_video.id, voter.id) for voter in voters])
+
+        # Assert
+        assert sorted(inserted) == [(test_video.id, voters[1].id), (test_video.id, voters[2].id)]
+        assert await repository.count_votes_for_video(test_video.id) == 3
+        rankings = await PlayerRepository(db_session).get_rankings()
+        assert [(r.player_id, r.total_votes) for r in rankings] == [(test_player.id, 3)]
+        assert await repository.cast_votes_batch([]) == []
+
+    @pytest.mark.asyncio
+    async def test_unique_constraint_rejects_duplicate_votes(self, db_session, test_video, test_player):
+        """Test que la constraint única impide votos duplicados aunque se salte la validación"""
+        from sqlalchemy.exc import IntegrityError
+        repository = VoteRepository(db_session)
+        await repository.create(Vote(id=None, video_id=test_video.id, player_id=test_player.id))
+
+        with pytest.raises(IntegrityError):
+            await repository.create(Vote(id=None, video_id=test_video.id, player_id=test_player.id))
+        db_session.rollback()
+
     @pytest.mark.asyncio
     async def test_get_votes_by_videos(self, db_session, test_video, test_player):
         """Test para obtener votos agrupados por video"""
@@ -406,3 +537,239 @@ class TestVoteRepository:
         # Assert
         assert test_video.id in votes_dict
         assert votes_dict[test_video.id] >= 1
+
+
+class TestPlayerRankings:
+    """Tests de integración para el ranking materializado (player_scores)"""
+
+    async def _create_voter(self, db_session, index: int, city: str = "Bogotá") -> Player:
+        return await PlayerRepository(db_session).create(Player(
+            id=None,
+            first_name=f"Ranker{index}",
+            last_name="User",
+            email=Email(f"ranker{index}.score@example.com"),
+            password=Password("dummy", hashed_value="$2b$12$hashed..."),
+            city=city,
+            country="Colombia"
+        ))
+
+    @pytest.mark.asyncio
+    async def test_votes_update_rankings(self, db_session, test_video, test_player):
+        """Test que cada voto creado o eliminado actualiza el ranking en la misma transacción"""
+        # Arrange
+        vote_repository = VoteRepository(db_session)
+        player_repository = PlayerRepository(db_session)
+        voters = [await self._create_voter(db_session, i) for i in range(3)]
+
+        # Act
+        votes = [
+            await vote_repository.create(Vote(id=None, video_id=test_video.id, player_id=voter.id))
+            for voter in voters
+        ]
+        await vote_repository.delete(votes[0].id)
+        rankings = await player_repository.get_rankings()
+
+        # Assert
+        assert len(rankings) == 1
+        assert rankings[0].player_id == test_player.id
+        assert rankings[0].total_votes == 2
+        assert rankings[0].username == "test.player"
+
+    @pytest.mark.asyncio
+    async def test_rankings_order_city_and_limit(self, db_session, test_video, test_player):
+        """Test que el ranking se ordena por votos, filtra por ciudad y respeta el límite"""
+        # Arrange
+        vote_repository = VoteRepository(db_session)
+        player_repository = PlayerRepository(db_session)
+        video_repository = VideoRepository(db_session)
+        owner = await self._create_voter(db_session, 10, city="Cali")
+        owner_video = await video_repository.create(
+            Video(id=None, player_id=owner.id, title="Cali Video", status=VideoStatus.PROCESSED)
+        )
+        voters = [await self._create_voter(db_session, i) for i in range(3)]
+        for voter in voters:
+            await vote_repository.create(Vote(id=None, video_id=owner_video.id, player_id=voter.id))
+        await vote_repository.create(Vote(id=None, video_id=test_video.id, player_id=voters[0].id))
+
+        # Act
+        rankings = await player_repository.get_rankings()
+        bogota = await player_repository.get_rankings(city="Bogotá")
+        top_one = await player_repository.get_rankings(limit=1)
+
+        # Assert
+        assert [(r.player_id, r.total_votes) for r in rankings] == [(owner.id, 3), (test_player.id, 1)]
+        assert [r.player_id for r in bogota] == [test_player.id]
+        assert [r.player_id for r in top_one] == [owner.id]
+
+    @pytest.mark.asyncio
+    async def test_update_player_city_moves_score(self, db_session, test_video, test_player):
+        """Test que cambiar la ciudad del jugador actualiza el ranking por ciudad"""
+        # Arrange
+        player_repository = PlayerRepository(db_session)
+        voter = await self._create_voter(db_session, 20)
+        await VoteRepository(db_session).create(Vote(id=None, video_id=test_video.id, player_id=voter.id))
+        owner = await player_repository.get_by_id(test_player.id)
+
+        # Act
+        owner.update_profile(city="Cali")
+        await player_repository.update(owner)
+
+        # Assert
+        assert await player_repository.get_rankings(city="Bogotá") == []
+        assert [r.player_id for r in await player_repository.get_rankings(city="Cali")] == [test_player.id]
+
+    @pytest.mark.asyncio
+    async def test_rankings_keyset_and_player_rank(self, db_session, test_player):
+        """Test de paginación por keyset y posición de un jugador desde la BD"""
+        # Arrange
+        vote_repository = VoteRepository(db_session)
+        player_repository = PlayerRepository(db_session)
+        video_repository = VideoRepository(db_session)
+        owners = [await self._create_voter(db_session, 30 + i) for i in range(3)]
+        voters = [await self._create_voter(db_session, 40 + i) for i in range(2)]
+        for owner, votes in zip(owners, (1, 2, 2)):
+            video = await video_repository.create(
+                Video(id=None, player_id=owner.id, title="Rank Video", status=VideoStatus.PROCESSED)
+            )
+            for voter in voters[:votes]:
+                await vote_repository.create(Vote(id=None, video_id=video.id, player_id=voter.id))
+
+        # Act
+        first_page = await player_repository.get_rankings(limit=2)
+        last = first_page[-1]
+        second_page = await player_repository.get_rankings(limit=2, after=(last.total_votes, last.player_id))
+        rank = await player_repository.get_player_rank(owners[0].id)
+
+        # Assert
+        assert [s.player_id for s in first_page] == [owners[1].id, owners[2].id]
+        assert [s.player_id for s in second_page] == [owners[0].id]
+        assert (rank.position, rank.total_votes) == (3, 1)
+        assert await player_repository.get_player_rank(owners[0].id, city="Cali") is None
+        assert await player_repository.get_player_rank(test_player.id) is None
+
+    @pytest.mark.asyncio
+    async def test_rankings_from_votes_counts_every_processed_video(self, db_session, test_player):
+        """Test que el ranking agregado incluye todos los videos procesados (más de 100) en una consulta"""
+        # Arrange
+        from sqlalchemy import event
+        from app.infrastructure.database.models import VideoModel, VideoStatusEnum, VoteModel
+        voter = await self._create_voter(db_session, 50)
+        cali_owner = await self._create_voter(db_session, 51, city="Cali")
+        videos = [
+            VideoModel(player_id=test_player.id, title=f"Video {i}", status=VideoStatusEnum.PROCESSED)
+            for i in range(120)
+        ]
+        cali_video = VideoModel(player_id=cali_owner.id, title="Cali", status=VideoStatusEnum.PROCESSED)
+        pending_video = VideoModel(player_id=cali_owner.id, title="Pendiente", status=VideoStatusEnum.UPLOADED)
+        # Jugador con un video publicado sin votos: aparece con 0 votos
+        unvoted_owner = await self._create_voter(db_session, 52)
+        unvoted_video = VideoModel(player_id=unvoted_owner.id, title="Sin votos", status=VideoStatusEnum.PROCESSED)
+        db_session.add_all(videos + [cali_video, pending_video, unvoted_video])
+        db_session.flush()
+        db_session.add_all([VoteModel(video_id=video.id, player_id=voter.id) for video in videos + [cali_video]])
+        db_session.add(VoteModel(video_id=pending_video.id, player_id=voter.id))
+        db_session.commit()
+
+        repository = PlayerRepository(db_session)
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+
+        # Act
+        try:
+            rankings = await repository.get_rankings_from_votes()
+        finally:
+            event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+        cali = await repository.get_rankings_from_votes(city="Cali")
+        top_one = await repository.get_rankings_from_votes(limit=1)
+
+        # Assert
+        assert len(statements) == 1
+        assert [(s.player_id, s.total_votes) for s in rankings] == [
+            (test_player.id, 120), (cali_owner.id, 1), (unvoted_owner.id, 0)
+        ]
+        assert [(s.player_id, s.total_votes) for s in cali] == [(cali_owner.id, 1)]
+        assert [s.player_id for s in top_one] == [test_player.id]
+
+    @pytest.mark.asyncio
+    async def test_sync_scores_from_votes_corrects_drift(self, db_session, test_video, test_player):
+        """Test que la reconciliación reescribe en player_scores solo los totales con drift"""
+        # Arrange
+        from sqlalchemy import update
+        from app.infrastructure.database.models import PlayerScoreModel
+        repository = PlayerRepository(db_session)
+        voter = await repository.create(Player(
+            id=None,
+            first_name="Drift",
+            last_name="Voter",
+            email=Email("drift.voter@example.com"),
+            password=Password("dummy", hashed_value="$2b$12$hashed..."),
+            city="Bogotá",
+            country="Colombia"
+        ))
+        await VoteRepository(db_session).cast_vote(test_video.id, voter.id)
+        db_session.execute(update(PlayerScoreModel).values(total_votes=42))
+        db_session.commit()
+
+        # Act
+        corrected = await repository.sync_scores_from_votes()
+        unchanged = await repository.sync_scores_from_votes()
+
+        # Assert
+        assert (corrected, unchanged) == (1, 0)
+        rankings = await repository.get_rankings()
+        assert [(r.player_id, r.total_votes) for r in rankings] == [(test_player.id, 1)]
+
+    @pytest.mark.asyncio
+    async def test_processed_video_seeds_player_score(self, db_session, test_player):
+        """Test que publicar un video agrega al jugador al ranking con 0 votos"""
+        # Arrange
+        video_repository = VideoRepository(db_session)
+        video = await video_repository.create(
+            Video(id=None, player_id=test_player.id, title="Publicar", status=VideoStatus.UPLOADED)
+        )
+        before = await PlayerRepository(db_session).get_rankings()
+
+        # Act
+        video.mark_as_processed("/videos/processed/1")
+        await video_repository.update(video)
+        await video_repository.update(video)
+
+        # Assert
+        after = await PlayerRepository(db_session).get_rankings()
+        assert before == []
+        assert [(r.player_id, r.total_votes) for r in after] == [(test_player.id, 0)]
+
+
+class TestPublicVideosKeyset:
+    """Tests de integración para la paginación por keyset de videos públicos"""
+
+    @pytest.mark.asyncio
+    async def test_keyset_pages_cover_all_videos_once(self, db_session, test_player):
+        """Test que las páginas por cursor recorren todos los videos sin repetir ni saltar"""
+        # Arrange
+        from datetime import timedelta
+        repository = VideoRepository(db_session)
+        base = datetime(2025, 3, 10, 12, 0, 0)
+        created = []
+        for i in range(7):
+            # Dos videos por timestamp para validar el desempate por id
+            video = await repository.create(Video(
+                id=None, player_id=test_player.id, title=f"Keyset {i}",
+                status=VideoStatus.PROCESSED, uploaded_at=base + timedelta(minutes=i // 2)
+            ))
+            created.append(video)
+
+        # Act
+        pages, after = [], None
+        while True:
+            page = await repository.get_public_videos(limit=3, after=after)
+            pages.append([video.id for video in page])
+            if len(page) < 3:
+                break
+            after = (page[-1].uploaded_at, page[-1].id)
+
+        # Assert
+        expected = [video.id for video in sorted(created, key=lambda v: (v.uploaded_at, v.id), reverse=True)]
+        assert [video_id for page in pages for video_id in page] == expected
+        assert [len(page) for page in pages] == [3, 3, 1]
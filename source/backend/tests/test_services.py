@@ -385,34 +385,52 @@ class TestVideoService:
         assert result[0].id == 1
         mock_video_repository.get_public_videos.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_get_public_videos_with_cursor(self, video_service, mock_video_repository):
+        """Test para paginar videos públicos con el cursor de la página anterior"""
+        # Arrange
+        uploaded_at = datetime(2025, 3, 10, 14, 30)
+        page = [
+            Video(id=i, player_id=1, title=f"Video {i}", status=VideoStatus.PROCESSED, uploaded_at=uploaded_at)
+            for i in (5, 4)
+        ]
+        cursor = video_service.next_public_videos_cursor(page, limit=2)
+
+        # Act
+        await video_service.get_public_videos(limit=2, cursor=cursor)
+
+        # Assert
+        mock_video_repository.get_public_videos.assert_called_once_with(limit=2, after=(uploaded_at, 4))
+        assert video_service.next_public_videos_cursor(page[:1], limit=2) is None
+
+    @pytest.mark.asyncio
+    async def test_get_public_videos_invalid_cursor(self, video_service):
+        """Test para un cursor de videos inválido"""
+        from app.shared.utils.cursors import InvalidCursorError, encode_cursor
+
+        with pytest.raises(InvalidCursorError):
+            await video_service.get_public_videos(cursor=encode_cursor("no-es-fecha", 1))
+
     @pytest.mark.asyncio
     async def test_vote_for_video_success(self, video_service, mock_video_repository, mock_vote_repository):
-        """Test para votar por un video exitosamente"""
+        """Test para votar por un video exitosamente (un solo INSERT condicional)"""
         # Arrange
-        video = Video(
-            id=1,
-            player_id=1,
-            title="Test Video",
-            status=VideoStatus.PROCESSED,
-            uploaded_at=datetime.now()
-        )
-        mock_video_repository.get_by_id.return_value = video
-        mock_vote_repository.has_user_voted.return_value = False
-        mock_vote_repository.create.return_value = Vote(id=1, video_id=1, player_id=2)
+        mock_vote_repository.cast_vote.return_value = 1  # dueño del video
 
         # Act
         result = await video_service.vote_for_video(1, 2)
 
         # Assert
         assert result is True
-        mock_video_repository.get_by_id.assert_called_once_with(1)
-        mock_vote_repository.has_user_voted.assert_called_once_with(1, 2)
-        mock_vote_repository.create.assert_called_once()
+        mock_vote_repository.cast_vote.assert_called_once_with(1, 2)
+        mock_video_repository.get_by_id.assert_not_called()
+        mock_vote_repository.has_user_voted.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_vote_for_own_video(self, video_service, mock_video_repository):
+    async def test_vote_for_own_video(self, video_service, mock_video_repository, mock_vote_repository):
         """Test para intentar votar por el propio video"""
         # Arrange
+        mock_vote_repository.cast_vote.return_value = None
         video = Video(
             id=1,
             player_id=1,
@@ -438,24 +456,36 @@ class TestVideoService:
             uploaded_at=datetime.now()
         )
         mock_video_repository.get_by_id.return_value = video
-        mock_vote_repository.has_user_voted.return_value = True
+        mock_vote_repository.cast_vote.return_value = None
 
         # Act & Assert
         with pytest.raises(ValueError, match="Ya has votado"):
             await video_service.vote_for_video(1, 2)
 
     @pytest.mark.asyncio
-    async def test_get_video_votes_count(self, video_service, mock_vote_repository):
-        """Test para obtener el conteo de votos de un video"""
+    async def test_vote_for_missing_video(self, video_service, mock_video_repository, mock_vote_repository):
+        """Test para votar por un video inexistente"""
+        # Arrange
+        mock_vote_repository.cast_vote.return_value = None
+        mock_video_repository.get_by_id.return_value = None
+
+        # Act & Assert
+        with pytest.raises(VideoNotFoundException):
+            await video_service.vote_for_video(999, 2)
+
+    @pytest.mark.asyncio
+    async def test_get_video_votes_count(self, video_service, mock_video_repository, mock_vote_repository):
+        """Test para obtener el conteo de votos de un video desde el contador del video"""
         # Arrange
-        mock_vote_repository.count_votes_for_video.return_value = 5
+        mock_video_repository.get_votes_count.return_value = 5
 
         # Act
         result = await video_service.get_video_votes_count(1)
 
         # Assert
         assert result == 5
-        mock_vote_repository.count_votes_for_video.assert_called_once_with(1)
+        mock_video_repository.get_votes_count.assert_called_once_with(1)
+        mock_vote_repository.count_votes_for_video.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_mark_video_as_processed(self, video_service, mock_video_repository):
@@ -477,3 +507,61 @@ class TestVideoService:
         # Assert
         mock_video_repository.get_by_id.assert_called_once_with(1)
         mock_video_repository.update.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_create_direct_upload(self, video_service, mock_video_repository, mock_file_storage):
+        """Test para registrar una subida directa a S3"""
+        # Arrange
+        mock_file_storage.supports_direct_upload = True
+        mock_video_repository.create.side_effect = lambda video: Video(
+            id=7, player_id=video.player_id, title=video.title, status=video.status
+        )
+        mock_file_storage.create_upload_target.return_value = {"url": "https://s3/bucket", "fields": {"key": "original/7.mp4"}}
+
+        # Act
+        video, target = await video_service.create_direct_upload(1, "Mi jugada", "jugada.mp4", "video/mp4")
+
+        # Assert
+        assert video.id == 7
+        assert video.original_url is None
+        assert target["fields"]["key"] == "original/7.mp4"
+        assert mock_file_storage.create_upload_target.call_args.args[:2] == ("7.mp4", "original")
+
+    @pytest.mark.asyncio
+    async def test_create_direct_upload_requires_s3(self, video_service, mock_video_repository, mock_file_storage):
+        """Test que la subida directa falla sin almacenamiento S3"""
+        mock_file_storage.supports_direct_upload = False
+
+        with pytest.raises(ValueError):
+            await video_service.create_direct_upload(1, "Mi jugada", "jugada.mp4", "video/mp4")
+
+        mock_video_repository.create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_finalize_direct_upload(self, video_service, mock_video_repository, mock_file_storage, mock_task_queue):
+        """Test para confirmar una subida directa e iniciar el procesamiento"""
+        # Arrange
+        video = Video(id=7, player_id=1, title="Mi jugada", status=VideoStatus.UPLOADED)
+        mock_video_repository.get_by_id.return_value = video
+        mock_video_repository.update.side_effect = lambda v: v
+        mock_file_storage.get_file_size.return_value = 1024
+
+        # Act
+        result = await video_service.finalize_direct_upload(7, 1)
+
+        # Assert
+        assert result.original_url.endswith("/original/7")
+        mock_file_storage.get_file_size.assert_called_once_with("7.mp4", "original")
+        mock_task_queue.publish_video_processing_task.assert_called_once_with(7)
+
+    @pytest.mark.asyncio
+    async def test_finalize_direct_upload_missing_object(self, video_service, mock_video_repository, mock_file_storage, mock_task_queue):
+        """Test que no se confirma una subida si el objeto no está en el bucket"""
+        mock_video_repository.get_by_id.return_value = Video(id=7, player_id=1, title="Mi jugada", status=VideoStatus.UPLOADED)
+        mock_file_storage.get_file_size.return_value = None
+
+        with pytest.raises(ValueError):
+            await video_service.finalize_direct_upload(7, 1)
+
+        mock_video_repository.update.assert_not_called()
+        mock_task_queue.publish_video_processing_task.assert_not_called()
@@ -0,0 +1,133 @@
+"""Tests para la sesión por request (unidad de trabajo)"""
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.domain.entities.player import Player
+from app.domain.value_objects.email import Email
+from app.domain.value_objects.password import Password
+from app.infrastructure.database.database import Base
+from app.infrastructure.database.models import PlayerModel
+from app.infrastructure.database.unit_of_work import SqlAlchemyUnitOfWork, unit_of_work_middleware
+from app.infrastructure.repositories.player_repository import PlayerRepository
+
+
+def _player(email: str) -> Player:
+    return Player(
+        id=None,
+        first_name="Uow",
+        last_name="Player",
+        email=Email(email),
+        password=Password("dummy", hashed_value="$2b$12$hashed..."),
+        city="Bogotá",
+        country="Colombia"
+    )
+
+
+class TestUnitOfWorkMiddleware:
+    """Tests para unit_of_work_middleware"""
+
+    @pytest.fixture
+    def session_factory(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'uow.db'}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        engine.dispose()
+
+    @pytest.fixture
+    def client(self, session_factory):
+        app = FastAPI()
+        app.middleware("http")(unit_of_work_middleware(session_factory))
+        repository = PlayerRepository()
+
+        @app.post("/players/{email}")
+        async def create_player(email: str, fail: bool = False):
+            created = await repository.create(_player(email))
+            found = await repository.get_by_email(Email(email))
+            if fail:
+                raise HTTPException(status_code=400, detail="fallo después de escribir")
+            return {"id": created.id, "found": found.id}
+
+        return TestClient(app)
+
+    def _count_players(self, session_factory) -> int:
+        db = session_factory()
+        try:
+            return db.query(PlayerModel).count()
+        finally:
+            db.close()
+
+    def test_repositories_share_one_checkout(self, client, session_factory):
+        """Test que todas las operaciones del request usan una sola conexión del pool"""
+        checkouts = []
+        event.listen(session_factory.kw["bind"], "checkout", lambda *args: checkouts.append(1))
+
+        response = client.post("/players/uow.ok@example.com")
+
+        assert response.status_code == 200
+        assert response.json()["id"] == response.json()["found"]
+        assert len(checkouts) == 1
+        assert self._count_players(session_factory) == 1
+
+    def test_error_response_rolls_back(self, client, session_factory):
+        """Test que una respuesta >= 400 descarta las escrituras del request"""
+        response = client.post("/players/uow.fail@example.com?fail=true")
+
+        assert response.status_code == 400
+        assert self._count_players(session_factory) == 0
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_commit_outside_request_is_noop():
+    """Test que la unidad de trabajo no falla fuera de un request"""
+    unit_of_work = SqlAlchemyUnitOfWork()
+    await unit_of_work.commit()
+    await unit_of_work.rollback()
+
+
+class TestUploadCommitsBeforeStreaming:
+    """Tests para que la subida no retenga la conexión mientras copia el archivo"""
+
+    def _service(self, calls, save_error=None):
+        from unittest.mock import AsyncMock, MagicMock
+        from app.domain.entities.video import Video, VideoStatus
+        from app.services.video_service import VideoService
+
+        video_repository = AsyncMock()
+        video_repository.create.side_effect = lambda video: calls.append("create") or Video(
+            id=1, player_id=video.player_id, title=video.title, status=VideoStatus.UPLOADED
+        )
+        video_repository.update.side_effect = lambda video: calls.append("update") or video
+        video_repository.delete.side_effect = lambda video_id: calls.append("delete")
+        def save_file(*args, **kwargs):
+            calls.append("save_file")
+            if save_error:
+                raise save_error
+
+        file_storage = AsyncMock()
+        file_storage.save_file.side_effect = save_file
+        unit_of_work = AsyncMock()
+        unit_of_work.commit.side_effect = lambda: calls.append("commit")
+        upload = MagicMock(filename="jugada.mp4", size=1024)
+        return VideoService(video_repository, AsyncMock(), file_storage, AsyncMock(), unit_of_work=unit_of_work), upload
+
+    @pytest.mark.asyncio
+    async def test_commit_before_save_file(self):
+        calls = []
+        service, upload = self._service(calls)
+
+        await service.upload_video(1, upload, "Jugada")
+
+        assert calls == ["create", "commit", "save_file", "update", "commit"]
+
+    @pytest.mark.asyncio
+    async def test_failed_save_commits_compensating_delete(self):
+        calls = []
+        service, upload = self._service(calls, save_error=IOError("S3 no disponible"))
+
+        with pytest.raises(IOError):
+            await service.upload_video(1, upload, "Jugada")
+
+        assert calls == ["create", "commit", "save_file", "delete", "commit"]
@@ -0,0 +1,131 @@
+"""Tests para el buffer de escritura diferida de votos"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from app.domain.entities.video import Video, VideoStatus
+from app.services.vote_buffer_service import VoteBufferService
+from app.shared.exceptions.video_exceptions import VideoNotFoundException
+
+
+def _video(video_id: int, owner_id: int = 1, status: VideoStatus = VideoStatus.PROCESSED) -> Video:
+    return Video(id=video_id, player_id=owner_id, title=f"Video {video_id}", status=status)
+
+
+class TestVoteBufferService:
+    """Tests para VoteBufferService"""
+
+    @pytest.fixture
+    def mock_video_repository(self):
+        repository = AsyncMock()
+        repository.get_by_id.side_effect = lambda video_id: {
+            10: _video(10),
+            20: _video(20, status=VideoStatus.UPLOADED),
+        }.get(video_id)
+        return repository
+
+    @pytest.fixture
+    def mock_vote_repository(self):
+        repository = AsyncMock()
+        repository.cast_votes_batch.side_effect = lambda votes: list(votes)
+        return repository
+
+    def _buffer(self, vote_repository, video_repository, **kwargs) -> VoteBufferService:
+        return VoteBufferService(vote_repository, video_repository, flush_interval=0.01, **kwargs)
+
+    @pytest.mark.asyncio
+    async def test_buffered_mode_writes_one_batch(self, mock_vote_repository, mock_video_repository):
+        """Test que en modo no durable los votos se aceptan de inmediato y se escriben en un lote"""
+        leaderboard = AsyncMock()
+        buffer = self._buffer(mock_vote_repository, mock_video_repository, durable=False, leaderboard=leaderboard)
+
+        # Act
+        for voter in (2, 3, 4):
+            await buffer.submit(10, voter)
+        assert buffer.pending == 3
+        inserted = await buffer.flush()
+
+        # Assert
+        assert inserted == 3
+        mock_vote_repository.cast_votes_batch.assert_called_once_with([(10, 2), (10, 3), (10, 4)])
+        # El video se consulta una sola vez: el dueño queda en caché
+        mock_video_repository.get_by_id.assert_called_once_with(10)
+        leaderboard.record_vote.assert_called_once_with(1, delta=3)
+
+    @pytest.mark.asyncio
+    async def test_rejects_invalid_votes_before_buffering(self, mock_vote_repository, mock_video_repository):
+        """Test que los votos inválidos o duplicados se rechazan sin llegar a la BD"""
+        buffer = self._buffer(mock_vote_repository, mock_video_repository, durable=False)
+        await buffer.submit(10, 2)
+
+        with pytest.raises(ValueError, match="Ya has votado"):
+            await buffer.submit(10, 2)
+        with pytest.raises(ValueError, match="propio video"):
+            await buffer.submit(10, 1)
+        with pytest.raises(ValueError, match="no está disponible"):
+            await buffer.submit(20, 2)
+        with pytest.raises(VideoNotFoundException):
+            await buffer.submit(99, 2)
+        assert buffer.pending == 1
+
+    @pytest.mark.asyncio
+    async def test_durable_mode_waits_for_group_commit(self, mock_vote_repository, mock_video_repository):
+        """Test que en modo durable cada voto responde tras el commit de su lote"""
+        # La BD ya tenía el voto del jugador 3 (p. ej. registrado por otra instancia)
+        mock_vote_repository.cast_votes_batch.side_effect = lambda votes: [v for v in votes if v != (10, 3)]
+        buffer = self._buffer(mock_vote_repository, mock_video_repository, durable=True, max_batch=2)
+        buffer.start()
+        try:
+            results = await asyncio.gather(
+                buffer.submit(10, 2), buffer.submit(10, 3), return_exceptions=True
+            )
+        finally:
+            await buffer.stop()
+
+        assert results[0] is None
+        assert isinstance(results[1], ValueError)
+        mock_vote_repository.cast_votes_batch.assert_called_once_with([(10, 2), (10, 3)])
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried_in_buffered_mode(self, mock_vote_repository, mock_video_repository):
+        """Test que un lote fallido vuelve a la cola si nadie espera la respuesta"""
+        mock_vote_repository.cast_votes_batch.side_effect = [RuntimeError("BD no disponible"), [(10, 2)]]
+        buffer = self._buffer(mock_vote_repository, mock_video_repository, durable=False)
+        await buffer.submit(10, 2)
+
+        with pytest.raises(RuntimeError):
+            await buffer.flush()
+        assert buffer.pending == 1
+
+        await buffer.stop()
+        assert buffer.pending == 0
+        assert mock_vote_repository.cast_votes_batch.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_fails_waiting_votes_in_durable_mode(self, mock_vote_repository, mock_video_repository):
+        """Test que en modo durable el error del lote llega al cliente y el voto puede reintentarse"""
+        mock_vote_repository.cast_votes_batch.side_effect = RuntimeError("BD no disponible")
+        buffer = self._buffer(mock_vote_repository, mock_video_repository, durable=True)
+        buffer.start()
+        try:
+            with pytest.raises(RuntimeError):
+                await buffer.submit(10, 2)
+
+            mock_vote_repository.cast_votes_batch.side_effect = lambda votes: list(votes)
+            await buffer.submit(10, 2)
+        finally:
+            await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_video_service_delegates_to_vote_buffer():
+    """Test que con el buffer habilitado el voto no se escribe directamente"""
+    from app.services.video_service import VideoService
+
+    vote_repository = AsyncMock()
+    vote_buffer = AsyncMock()
+    service = VideoService(AsyncMock(), vote_repository, AsyncMock(), AsyncMock(), vote_buffer=vote_buffer)
+
+    assert await service.vote_for_video(10, 2) is True
+    vote_buffer.submit.assert_called_once_with(10, 2)
+    vote_repository.cast_vote.assert_not_called()
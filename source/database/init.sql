@@ -24,7 +24,9 @@ CREATE TABLE videos (
     original_url VARCHAR(512),
     processed_url VARCHAR(512),
     uploaded_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    processed_at TIMESTAMP WITH TIME ZONE
+    processed_at TIMESTAMP WITH TIME ZONE,
+    -- Contador desnormalizado: se actualiza en la misma transacción de cada voto
+    votes_count INTEGER NOT NULL DEFAULT 0
 );
 
 CREATE TABLE votes (
@@ -35,6 +37,14 @@ CREATE TABLE votes (
     CONSTRAINT unique_vote UNIQUE (player_id, video_id)
 );
 
+-- Ranking materializado: se actualiza en la misma transacción de cada voto
+CREATE TABLE player_scores (
+    player_id INTEGER PRIMARY KEY REFERENCES players(id) ON DELETE CASCADE,
+    city VARCHAR(100) NOT NULL,
+    total_votes INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
 -- ======================================================================
 -- ÍNDICES DE OPTIMIZACIÓN DE PERFORMANCE
 -- ======================================================================
@@ -64,6 +74,10 @@ CREATE INDEX IF NOT EXISTS idx_votes_player_id ON votes(player_id);
 -- Índice compuesto en votes(video_id, player_id) para verificación rápida
 CREATE INDEX IF NOT EXISTS idx_votes_video_player ON votes(video_id, player_id);
 
+-- Índices del ranking materializado (global y por ciudad)
+CREATE INDEX IF NOT EXISTS idx_player_scores_total_votes ON player_scores(total_votes DESC, player_id);
+CREATE INDEX IF NOT EXISTS idx_player_scores_city_total_votes ON player_scores(city, total_votes DESC, player_id);
+
 -- ======================================================================
 -- INFORMACIÓN
 -- ======================================================================
@@ -71,5 +85,5 @@ CREATE INDEX IF NOT EXISTS idx_votes_video_player ON votes(video_id, player_id);
 --   - Listado de videos públicos (WHERE status='processed' ORDER BY uploaded_at)
 --   - Conteo de votos por video (GROUP BY video_id)
 --   - Verificación de voto duplicado (WHERE video_id=X AND player_id=Y)
---   - Rankings de jugadores (JOIN + agregaciones)
+--   - Rankings de jugadores (ORDER BY sobre player_scores, sin agregaciones)
 -- ======================================================================
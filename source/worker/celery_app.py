@@ -99,6 +99,22 @@ def worker_ready_handler(sender=None, **kwargs):
     logger.info("=" * 60)
 
 
+@worker_ready.connect
+def warm_bumper_cache_handler(sender=None, **kwargs):
+    """Pre-codifica las cortinillas una sola vez al arrancar el worker"""
+    if not config.BUMPER_CACHE_ENABLED:
+        return
+
+    try:
+        from utils.bumper_cache import bumper_cache
+
+        segments = bumper_cache.warm_up()
+        logger.info(f"🎬 Cortinillas pre-codificadas: {segments}")
+    except Exception as e:
+        # No es fatal: las tareas codifican la cortinilla bajo demanda
+        logger.warning(f"⚠️ No se pudieron pre-codificar las cortinillas: {e}")
+
+
 @task_prerun.connect
 def task_prerun_handler(task_id=None, task=None, **kwargs):
     """Hook antes de ejecutar una tarea - trackear tiempo de inicio"""
@@ -3,6 +3,7 @@ Configuración del Worker ANB Rising Stars
 Variables de entorno y configuración centralizada
 """
 import os
+import tempfile
 from pathlib import Path
 
 class Config:
@@ -32,6 +33,16 @@ class Config:
     AWS_SESSION_TOKEN: str = os.getenv('AWS_SESSION_TOKEN', '')  # Para AWS Academy
     AWS_REGION: str = os.getenv('AWS_REGION', 'us-east-1')
     S3_BUCKET_NAME: str = os.getenv('S3_BUCKET_NAME', '')
+    S3_PRESIGNED_URL_EXPIRATION: int = int(os.getenv('S3_PRESIGNED_URL_EXPIRATION', '3600'))
+
+    # Leer el original directamente desde el storage (URL prefirmada con HTTP Range)
+    # en vez de descargarlo completo a TEMP_DIR
+    STREAM_INPUT: bool = os.getenv('STREAM_INPUT', 'true').lower() == 'true'
+    # Subir el resultado a S3 (multipart, MP4 fragmentado) sin archivo final en TEMP_DIR.
+    # Con BUMPER_CACHE_ENABLED (defecto) el video principal se codifica en TEMP_DIR y el
+    # concat con -c copy de las cortinillas cacheadas sube mientras se genera; sin cache,
+    # sube el encode single-pass (cortinillas re-codificadas en el mismo grafo)
+    STREAM_OUTPUT: bool = os.getenv('STREAM_OUTPUT', 'false').lower() == 'true'
     
     @property
     def ORIGINAL_DIR(self) -> str:
@@ -47,6 +58,13 @@ class Config:
         path.mkdir(parents=True, exist_ok=True)
         return str(path)
     
+    @property
+    def CACHE_DIR(self) -> str:
+        """Carpeta para artefactos cacheados (cortinillas pre-codificadas, logos)"""
+        path = Path(self.UPLOAD_BASE_DIR) / 'cache'
+        path.mkdir(parents=True, exist_ok=True)
+        return str(path)
+
     @property
     def TEMP_DIR(self) -> str:
         """Carpeta temporal para procesamiento"""
@@ -58,6 +76,14 @@ class Config:
     CELERY_TASK_DEFAULT_RETRY_DELAY: int = int(os.getenv('CELERY_RETRY_DELAY', '60'))
     CELERY_TASK_MAX_RETRIES: int = int(os.getenv('CELERY_MAX_RETRIES', '3'))
     CELERY_WORKER_CONCURRENCY: int = int(os.getenv('CELERY_CONCURRENCY', '4'))
+
+    # ===== THREADS DE FFMPEG =====
+    # Adaptativo: reparte los cores del nodo entre las tareas activas (false = 1 thread fijo)
+    FFMPEG_ADAPTIVE_THREADS: bool = os.getenv('FFMPEG_ADAPTIVE_THREADS', 'true').lower() == 'true'
+    # Directorio LOCAL del nodo para contar tareas activas (no usar el volumen NFS compartido)
+    THREAD_STATE_DIR: str = os.getenv(
+        'THREAD_STATE_DIR', os.path.join(tempfile.gettempdir(), 'anb_active_tasks')
+    )
     
     # ===== PROCESAMIENTO DE VIDEO =====
     # Según especificación del proyecto
@@ -69,18 +95,39 @@ class Config:
     VIDEO_PRESET: str = os.getenv('VIDEO_PRESET', 'ultrafast')  # 4x más rápido que "fast" (2x que veryfast)
     VIDEO_CRF: int = int(os.getenv('VIDEO_CRF', '28'))  # Archivos 20% más pequeños vs CRF 25, calidad excelente para 720p
     VIDEO_TUNE: str = os.getenv('VIDEO_TUNE', 'film')  # Optimización para contenido de video
+    # Fijos en todos los encodes: el concat con -c copy exige que coincidan entre segmentos
+    VIDEO_FPS: int = int(os.getenv('VIDEO_FPS', '30'))  # Frame rate constante de salida (-r)
+    VIDEO_PIX_FMT: str = 'yuv420p'  # Máxima compatibilidad
+    VIDEO_PROFILE: str = os.getenv('VIDEO_PROFILE', 'high')  # Perfil H.264 (solo libx264)
+    VIDEO_LEVEL: str = os.getenv('VIDEO_LEVEL', '4.0')  # Nivel H.264 (solo libx264)
     
     # ===== LOGOS Y MARCA DE AGUA =====
     LOGO_PATH: str = os.getenv('LOGO_PATH', '/app/assets/anb_logo.png')
     LOGO_POSITION: str = os.getenv('LOGO_POSITION', 'top-right')  # top-left, top-right, bottom-left, bottom-right
     LOGO_MARGIN: int = 10  # píxeles desde el borde
+    LOGO_DESIGN_HEIGHT: int = 720  # Altura de salida para la que está diseñado el PNG (escala 1:1)
+    # Rasterizar el logo una vez (RGBA premultiplicado) en vez de decodificar el PNG en cada tarea
+    LOGO_CACHE_ENABLED: bool = os.getenv('LOGO_CACHE_ENABLED', 'true').lower() == 'true'
     
     # Cortinillas (máximo 5 segundos adicionales según especificación)
     INTRO_VIDEO_PATH: str = os.getenv('INTRO_VIDEO_PATH', '/app/assets/intro.mp4')
     OUTRO_VIDEO_PATH: str = os.getenv('OUTRO_VIDEO_PATH', '/app/assets/outro.mp4')
     MAX_INTRO_DURATION: float = 2.5  # segundos
     MAX_OUTRO_DURATION: float = 2.5  # segundos
-    
+
+    # Ruta por defecto (ambos activos): encode single-pass solo del video principal
+    # y concat con -c copy de las cortinillas cacheadas, también con STREAM_OUTPUT.
+    # Single-pass: un solo grafo FFmpeg (recorte + escala + logo, y las cortinillas
+    # re-codificadas si BUMPER_CACHE_ENABLED=false) con un único encode libx264 en
+    # vez de dos (process_video + add_intro_outro)
+    VIDEO_SINGLE_PASS: bool = os.getenv('VIDEO_SINGLE_PASS', 'true').lower() == 'true'
+
+    # Cache de cortinillas pre-codificadas: se codifican una vez al arrancar con los
+    # mismos parámetros del encode principal (VideoProcessor.encode_options) y se
+    # concatenan con stream copy (-c copy) en vez de entrar al grafo de encode
+    BUMPER_CACHE_ENABLED: bool = os.getenv('BUMPER_CACHE_ENABLED', 'true').lower() == 'true'
+    VIDEO_TRACK_TIMESCALE: int = 90000  # Timebase común para concatenar sin re-encode
+
     # ===== LOGGING =====
     LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
     
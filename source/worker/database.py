@@ -38,6 +38,22 @@ def get_db_session() -> Session:
     return SessionLocal()
 
 
+def seed_player_score(db: Session, player_id: int) -> None:
+    """
+    Crea la fila del jugador en player_scores (ranking del backend) con 0 votos
+    si aún no existe, para que aparezca en el ranking al publicar su primer video.
+    Se ejecuta en la misma transacción que marca el video como procesado.
+    """
+    db.execute(
+        text(
+            "INSERT INTO player_scores (player_id, city, total_votes) "
+            "SELECT id, COALESCE(city, ''), 0 FROM players WHERE id = :player_id "
+            "ON CONFLICT (player_id) DO NOTHING"
+        ),
+        {"player_id": player_id},
+    )
+
+
 def test_db_connection() -> bool:
     """
     Prueba la conexión a la base de datos
@@ -4,12 +4,62 @@ Soporta almacenamiento local (NFS) y S3
 """
 import os
 import shutil
+import uuid
 from abc import ABC, abstractmethod
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# ioctl FICLONE de Linux: reflink (copy-on-write) en XFS/Btrfs
+FICLONE = 0x40049409
+
+
+def _reflink(source_path: str, dest_path: str) -> None:
+    """Clona el archivo con reflink (sin copiar bytes); OSError si el FS no lo soporta"""
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError("reflink no soportado en esta plataforma")
+
+    with open(source_path, 'rb') as src, open(dest_path, 'wb') as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    shutil.copystat(source_path, dest_path)
+
+
+def fast_transfer(source_path: str, dest_path: str) -> str:
+    """
+    Transfiere un archivo dentro del mismo volumen evitando copiar bytes
+
+    Intenta en orden: reflink, hardlink y, solo como fallback, copia completa.
+    El resultado se escribe con un nombre temporal y se publica con os.replace,
+    así el destino aparece de forma atómica (también sobre un archivo existente).
+    La fuente nunca se modifica.
+
+    Returns:
+        Estrategia usada: "reflink", "hardlink" o "copy"
+    """
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    tmp_path = f"{dest_path}.{uuid.uuid4().hex}.tmp"
+
+    try:
+        for strategy, transfer in (("reflink", _reflink), ("hardlink", os.link), ("copy", shutil.copy2)):
+            try:
+                transfer(source_path, tmp_path)
+                break
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                if strategy == "copy":
+                    raise
+
+        os.replace(tmp_path, dest_path)
+        return strategy
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
 
 class StorageInterface(ABC):
     """Interface abstracta para almacenamiento de archivos"""
@@ -34,6 +84,26 @@ class StorageInterface(ABC):
         """Obtiene el path completo del archivo (para logging)"""
         pass
 
+    @abstractmethod
+    def get_file_size(self, remote_key: str) -> int:
+        """Obtiene el tamaño del archivo en bytes sin descargarlo"""
+        pass
+
+    def get_stream_url(self, remote_key: str) -> Optional[str]:
+        """
+        URL (o ruta en el volumen) que FFmpeg puede leer directamente, sin copia
+        en TEMP_DIR. None si el backend no soporta lectura directa
+        """
+        return None
+
+    def open_upload_stream(self, remote_key: str) -> Optional["S3MultipartUpload"]:
+        """
+        Abre una subida en streaming (write/complete/abort) para escribir la
+        salida de FFmpeg mientras se codifica
+        None si el backend no soporta escritura en streaming
+        """
+        return None
+
 
 class LocalStorage(StorageInterface):
     """
@@ -60,10 +130,9 @@ class LocalStorage(StorageInterface):
             logger.debug(f"Archivo ya está en destino: {local_path}")
             return
 
-        # Copiar archivo
-        os.makedirs(os.path.dirname(local_path), exist_ok=True)
-        shutil.copy2(source_path, local_path)
-        logger.debug(f"📥 Copiado: {source_path} -> {local_path}")
+        # Reflink/hardlink si es posible (mismo volumen), copia solo como fallback
+        strategy = fast_transfer(source_path, local_path)
+        logger.debug(f"📥 Transferido ({strategy}): {source_path} -> {local_path}")
 
     def upload_file(self, local_path: str, remote_key: str) -> None:
         """Copia el archivo procesado a la ubicación final"""
@@ -80,8 +149,8 @@ class LocalStorage(StorageInterface):
             logger.debug(f"Archivo ya está en destino: {dest_path}")
             return
 
-        shutil.copy2(local_path, dest_path)
-        logger.debug(f"📤 Copiado: {local_path} -> {dest_path}")
+        strategy = fast_transfer(local_path, dest_path)
+        logger.debug(f"📤 Transferido ({strategy}): {local_path} -> {dest_path}")
 
     def file_exists(self, remote_key: str) -> bool:
         """Verifica si existe el archivo"""
@@ -92,6 +161,108 @@ class LocalStorage(StorageInterface):
         """Retorna el path completo"""
         return os.path.join(self.base_dir, remote_key)
 
+    def get_file_size(self, remote_key: str) -> int:
+        """Tamaño del archivo en bytes"""
+        return os.path.getsize(os.path.join(self.base_dir, remote_key))
+
+    def get_stream_url(self, remote_key: str) -> Optional[str]:
+        """
+        Ruta del archivo en el volumen: FFmpeg lee el original en su lugar,
+        sin copiarlo a TEMP_DIR
+        """
+        full_path = os.path.join(self.base_dir, remote_key)
+        return full_path if os.path.exists(full_path) else None
+
+
+class S3MultipartUpload:
+    """
+    Subida multipart a S3 alimentada por chunks (p.ej. stdout de FFmpeg)
+
+    Acumula los bytes hasta part_size y sube cada parte en un pool de threads
+    acotado, de forma que el pipe de FFmpeg se sigue drenando mientras sube.
+    S3 exige partes de al menos 5 MB (excepto la última).
+    """
+
+    MIN_PART_SIZE = 5 * 1024 * 1024
+
+    def __init__(self, s3_client, bucket_name: str, remote_key: str,
+                 part_size: int = 8 * 1024 * 1024, max_inflight: int = 2):
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.remote_key = remote_key
+        self.part_size = max(part_size, self.MIN_PART_SIZE)
+        self.max_inflight = max_inflight
+        self.bytes_written = 0
+
+        self._buffer = bytearray()
+        self._parts: List[Dict] = []
+        self._pending = []
+        self._executor = ThreadPoolExecutor(max_workers=max_inflight)
+
+        response = self.s3_client.create_multipart_upload(
+            Bucket=bucket_name, Key=remote_key, ContentType='video/mp4'
+        )
+        self.upload_id = response['UploadId']
+        logger.debug(f"📤 Multipart iniciado: s3://{bucket_name}/{remote_key} ({self.upload_id})")
+
+    def _upload_part(self, part_number: int, data: bytes) -> Dict:
+        response = self.s3_client.upload_part(
+            Bucket=self.bucket_name,
+            Key=self.remote_key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=data
+        )
+        return {'PartNumber': part_number, 'ETag': response['ETag']}
+
+    def _submit_part(self, data: bytes) -> None:
+        # Backpressure: no tener más de max_inflight partes en memoria
+        while len(self._pending) >= self.max_inflight:
+            self._parts.append(self._pending.pop(0).result())
+
+        part_number = len(self._parts) + len(self._pending) + 1
+        self._pending.append(self._executor.submit(self._upload_part, part_number, data))
+
+    def write(self, data: bytes) -> None:
+        """Agrega bytes y sube las partes completas"""
+        self._buffer.extend(data)
+        self.bytes_written += len(data)
+        while len(self._buffer) >= self.part_size:
+            self._submit_part(bytes(self._buffer[:self.part_size]))
+            del self._buffer[:self.part_size]
+
+    def complete(self) -> None:
+        """Sube la última parte y completa el objeto en S3"""
+        try:
+            if self._buffer or not (self._parts or self._pending):
+                self._submit_part(bytes(self._buffer))
+                self._buffer.clear()
+
+            self._parts.extend(future.result() for future in self._pending)
+            self._pending = []
+
+            self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=self.remote_key,
+                UploadId=self.upload_id,
+                MultipartUpload={'Parts': sorted(self._parts, key=lambda p: p['PartNumber'])}
+            )
+            logger.info(f"✅ Subido en streaming: s3://{self.bucket_name}/{self.remote_key} "
+                        f"({self.bytes_written} bytes, {len(self._parts)} partes)")
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def abort(self) -> None:
+        """Cancela la subida (S3 descarta las partes ya subidas)"""
+        self._executor.shutdown(wait=True)
+        try:
+            self.s3_client.abort_multipart_upload(
+                Bucket=self.bucket_name, Key=self.remote_key, UploadId=self.upload_id
+            )
+            logger.warning(f"⚠️ Multipart cancelado: s3://{self.bucket_name}/{self.remote_key}")
+        except Exception as e:
+            logger.error(f"❌ Error cancelando multipart: {e}")
+
 
 class S3Storage(StorageInterface):
     """
@@ -100,11 +271,13 @@ class S3Storage(StorageInterface):
     """
 
     def __init__(self, bucket_name: str, region: str = 'us-east-1',
-                 access_key: str = None, secret_key: str = None, session_token: str = None):
+                 access_key: str = None, secret_key: str = None, session_token: str = None,
+                 presigned_expiration: int = 3600):
         try:
             import boto3
             self.bucket_name = bucket_name
             self.region = region
+            self.presigned_expiration = presigned_expiration
 
             # Configurar cliente S3
             # Prioridad:
@@ -172,6 +345,31 @@ class S3Storage(StorageInterface):
         """Retorna la URI de S3"""
         return f"s3://{self.bucket_name}/{remote_key}"
 
+    def get_file_size(self, remote_key: str) -> int:
+        """Tamaño del objeto en bytes (head_object, sin descargar)"""
+        response = self.s3_client.head_object(Bucket=self.bucket_name, Key=remote_key)
+        return int(response['ContentLength'])
+
+    def get_stream_url(self, remote_key: str) -> Optional[str]:
+        """
+        URL prefirmada de GET para que FFmpeg lea el original directamente
+        FFmpeg usa peticiones HTTP Range: solo descarga el moov y los bytes
+        de los primeros segundos que necesita el recorte
+        """
+        try:
+            return self.s3_client.generate_presigned_url(
+                'get_object',
+                Params={'Bucket': self.bucket_name, 'Key': remote_key},
+                ExpiresIn=self.presigned_expiration
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo generar URL prefirmada, se descargará el archivo: {e}")
+            return None
+
+    def open_upload_stream(self, remote_key: str) -> Optional[S3MultipartUpload]:
+        """Subida multipart que se alimenta mientras FFmpeg codifica"""
+        return S3MultipartUpload(self.s3_client, self.bucket_name, remote_key)
+
 
 def get_storage_backend() -> StorageInterface:
     """
@@ -190,7 +388,8 @@ def get_storage_backend() -> StorageInterface:
             region=config.AWS_REGION,
             access_key=config.AWS_ACCESS_KEY_ID if config.AWS_ACCESS_KEY_ID else None,
             secret_key=config.AWS_SECRET_ACCESS_KEY if config.AWS_SECRET_ACCESS_KEY else None,
-            session_token=config.AWS_SESSION_TOKEN if config.AWS_SESSION_TOKEN else None
+            session_token=config.AWS_SESSION_TOKEN if config.AWS_SESSION_TOKEN else None,
+            presigned_expiration=config.S3_PRESIGNED_URL_EXPIRATION
         )
     else:
         return LocalStorage(base_dir=config.UPLOAD_BASE_DIR)
@@ -12,10 +12,12 @@ from celery import Task
 from celery.exceptions import SoftTimeLimitExceeded
 from celery_app import app
 
-from database import get_db_session
+from database import get_db_session, seed_player_score
 from datetime import datetime
 from models import Video, VideoStatus
 from utils.video_processing import video_processor, VideoProcessingError
+from utils.bumper_cache import bumper_cache
+from utils.thread_scheduler import thread_scheduler
 from config import config
 from storage import get_storage_backend
 
@@ -60,14 +62,20 @@ def process_video(self, video_id: int) -> Dict:
     Flujo MODIFICADO para soportar Local/NFS y S3:
     1. Definir claves de almacenamiento (original/{id}.mp4, processed/{id}.mp4)
     2. Verificar que el archivo original existe en el storage
-    3. Descargar archivo original a directorio temporal
+    3. Obtener archivo original: lectura directa (URL prefirmada S3 o archivo
+       en el volumen local/NFS) o, como fallback, copia en directorio temporal
     4. Procesar video con FFmpeg localmente:
        - Recortar a 30s
        - Escalar a 720p 16:9
        - Agregar logo ANB
        - Eliminar audio
     5. Agregar cortinillas (intro/outro) si existen
+       - BUMPER_CACHE_ENABLED (defecto): el encode del paso 4 solo cubre el video
+         principal y las cortinillas pre-codificadas se concatenan con -c copy
+       - Sin cache y con VIDEO_SINGLE_PASS: los pasos 4 y 5 son un único encode
     6. Subir archivo procesado al storage (NFS o S3)
+       (con STREAM_OUTPUT en S3 la salida final sube mientras se genera: el concat
+       con -c copy o, sin cortinillas cacheadas, el encode single-pass)
     7. Actualizar PostgreSQL con el resultado
     8. Limpiar archivos temporales
 
@@ -83,6 +91,10 @@ def process_video(self, video_id: int) -> Dict:
     """
     temp_files = []
     storage = get_storage_backend()  # Obtener backend según configuración
+    # Cache de ffprobe por tarea: cada archivo se prueba a lo sumo una vez
+    video_processor.reset_probe_cache()
+    # Registrar tarea activa: el reparto de threads de FFmpeg depende de cuántas hay
+    thread_scheduler.task_started()
 
     try:
         logger.info(f"🎬 Video {video_id}: Iniciando procesamiento")
@@ -108,14 +120,23 @@ def process_video(self, video_id: int) -> Dict:
             logger.error(f"❌ {error_msg}")
             raise VideoProcessingError(error_msg)
 
-        # ===== 3. DESCARGAR ARCHIVO ORIGINAL =====
-        logger.debug("📥 Descargando archivo original...")
-        storage.download_file(original_key, temp_original)
+        # ===== 3. OBTENER ARCHIVO ORIGINAL =====
+        # Lectura directa: FFmpeg lee del storage sin copia en TEMP_DIR
+        # (S3: URL prefirmada con HTTP Range; local/NFS: el archivo en su lugar)
+        input_path = storage.get_stream_url(original_key) if config.STREAM_INPUT else None
+
+        if input_path:
+            logger.debug("📡 FFmpeg leerá el original directamente (sin copia local)")
+            file_size_bytes = storage.get_file_size(original_key)
+        else:
+            logger.debug("📥 Descargando archivo original...")
+            storage.download_file(original_key, temp_original)
+            input_path = temp_original
+            file_size_bytes = os.path.getsize(temp_original)
 
         # Obtener tamaño para métricas
-        file_size_bytes = os.path.getsize(temp_original)
         file_size_mb = file_size_bytes / (1024 * 1024)
-        logger.debug(f"✅ Archivo descargado: {file_size_mb:.2f} MB")
+        logger.debug(f"✅ Archivo original: {file_size_mb:.2f} MB")
 
         # Registrar métrica de tamaño de archivo en CloudWatch
         try:
@@ -131,46 +152,107 @@ def process_video(self, video_id: int) -> Dict:
         except ImportError:
             pass
 
-        # ===== 4. PROCESAR VIDEO CON FFMPEG =====
-        logger.debug("⚙️ Procesando con FFmpeg...")
-        video_processor.process_video(
-            input_path=temp_original,
-            output_path=temp_processed,
-            add_logo=True
-        )
-
-        # Verificar que se creó el archivo procesado
-        if not os.path.exists(temp_processed):
-            raise VideoProcessingError(f"No se generó el video procesado: {temp_processed}")
-
-        file_size = os.path.getsize(temp_processed)
-        logger.info(f"✅ Video procesado: {temp_processed} ({file_size} bytes)")
-
-        # Validar video
-        if not video_processor.validate_video(temp_processed):
-            logger.warning("⚠️ Video procesado no cumple todas las validaciones")
-
-        # ===== 5. AGREGAR CORTINILLAS (OPCIONAL) =====
-        if os.path.exists(config.INTRO_VIDEO_PATH) or os.path.exists(config.OUTRO_VIDEO_PATH):
-            logger.debug("🎬 Agregando cortinillas...")
-            temp_with_intros = os.path.join(config.TEMP_DIR, f"{video_id}_with_intros.mp4")
-            temp_files.append(temp_with_intros)
+        # ===== 4-6. PROCESAR Y SUBIR =====
+        has_bumpers = os.path.exists(config.INTRO_VIDEO_PATH) or os.path.exists(config.OUTRO_VIDEO_PATH)
+        # Cortinillas cacheadas: el encode solo cubre el video principal
+        concat_bumpers = config.BUMPER_CACHE_ENABLED and has_bumpers
+        upload_stream = storage.open_upload_stream(processed_key) if config.STREAM_OUTPUT else None
 
-            video_processor.add_intro_outro(
-                video_path=temp_processed,
-                output_path=temp_with_intros
-            )
-
-            if os.path.exists(temp_with_intros):
-                # Usar el archivo con cortinillas
-                os.remove(temp_processed)
-                os.rename(temp_with_intros, temp_processed)
-                logger.info(f"✅ Cortinillas agregadas: {temp_processed}")
-
-        # ===== 6. SUBIR ARCHIVO PROCESADO =====
-        logger.debug("📤 Subiendo archivo procesado...")
-        storage.upload_file(temp_processed, processed_key)
-        logger.info(f"✅ Archivo subido: {storage.get_full_path(processed_key)}")
+        if upload_stream:
+            # Salida final como MP4 fragmentado directo a S3 (multipart), sin pasar por TEMP_DIR
+            final_output = storage.get_full_path(processed_key)
+            try:
+                if concat_bumpers:
+                    # Encode del principal en TEMP_DIR y concat con -c copy subiendo en streaming
+                    logger.debug("⚙️ Procesando con FFmpeg (single-pass, sin cortinillas)...")
+                    video_processor.process_video_single_pass(
+                        input_path=input_path,
+                        output_path=temp_processed,
+                        add_logo=True,
+                        include_bumpers=False
+                    )
+                    logger.debug("🎬 Concatenando cortinillas y subiendo en streaming...")
+                    bumper_cache.concat_with_bumpers(
+                        video_path=temp_processed,
+                        output_path=final_output,
+                        sink=upload_stream
+                    )
+                else:
+                    # La subida se solapa con el encode
+                    logger.debug("⚙️ Procesando con FFmpeg (single-pass) y subiendo en streaming...")
+                    video_processor.process_video_single_pass(
+                        input_path=input_path,
+                        output_path=final_output,
+                        add_logo=True,
+                        sink=upload_stream
+                    )
+                upload_stream.complete()
+            except Exception:
+                upload_stream.abort()
+                raise
+            logger.info(f"✅ Archivo subido: {final_output}")
+
+            if not video_processor.validate_video(final_output):
+                logger.warning("⚠️ Video procesado no cumple todas las validaciones")
+        else:
+            # ===== 4. PROCESAR VIDEO CON FFMPEG =====
+            if config.VIDEO_SINGLE_PASS:
+                # Un solo encode: recorte + escala + logo (+ cortinillas si no están cacheadas)
+                logger.debug("⚙️ Procesando con FFmpeg (single-pass)...")
+                video_processor.process_video_single_pass(
+                    input_path=input_path,
+                    output_path=temp_processed,
+                    add_logo=True,
+                    include_bumpers=not concat_bumpers
+                )
+            else:
+                logger.debug("⚙️ Procesando con FFmpeg...")
+                video_processor.process_video(
+                    input_path=input_path,
+                    output_path=temp_processed,
+                    add_logo=True
+                )
+
+            # Verificar que se creó el archivo procesado
+            if not os.path.exists(temp_processed):
+                raise VideoProcessingError(f"No se generó el video procesado: {temp_processed}")
+
+            file_size = os.path.getsize(temp_processed)
+            logger.info(f"✅ Video procesado: {temp_processed} ({file_size} bytes)")
+
+            # Validar video
+            if not video_processor.validate_video(temp_processed):
+                logger.warning("⚠️ Video procesado no cumple todas las validaciones")
+
+            # ===== 5. AGREGAR CORTINILLAS (OPCIONAL) =====
+            # En single-pass sin cache las cortinillas ya están incluidas en el encode
+            if concat_bumpers or (has_bumpers and not config.VIDEO_SINGLE_PASS):
+                logger.debug("🎬 Agregando cortinillas...")
+                temp_with_intros = os.path.join(config.TEMP_DIR, f"{video_id}_with_intros.mp4")
+                temp_files.append(temp_with_intros)
+
+                if concat_bumpers:
+                    # Cortinillas pre-codificadas: concatenación sin re-encode
+                    bumper_cache.concat_with_bumpers(
+                        video_path=temp_processed,
+                        output_path=temp_with_intros
+                    )
+                else:
+                    video_processor.add_intro_outro(
+                        video_path=temp_processed,
+                        output_path=temp_with_intros
+                    )
+
+                if os.path.exists(temp_with_intros):
+                    # Usar el archivo con cortinillas (sin renombrar: conserva su entrada en el cache de probe)
+                    temp_processed = temp_with_intros
+                    logger.info(f"✅ Cortinillas agregadas: {temp_processed}")
+
+            # ===== 6. SUBIR ARCHIVO PROCESADO =====
+            logger.debug("📤 Subiendo archivo procesado...")
+            storage.upload_file(temp_processed, processed_key)
+            logger.info(f"✅ Archivo subido: {storage.get_full_path(processed_key)}")
+            final_output = temp_processed
 
         # ===== 7. ACTUALIZAR BASE DE DATOS CON RESULTADO =====
         db = get_db_session()
@@ -194,10 +276,12 @@ def process_video(self, video_id: int) -> Dict:
         base_path = os.getenv("BASE_PATH", "http://localhost:80/api/videos")
         video.processed_url = f"{base_path}/processed/{video_id}"
 
+        # El jugador entra al ranking (con 0 votos) al publicar su video
+        seed_player_score(db, video.player_id)
         db.commit()
 
-        # Métricas finales
-        video_info = video_processor.get_video_info(temp_processed)
+        # Métricas finales (stats registradas por el encode, sin ffprobe adicional)
+        video_info = video_processor.get_video_info(final_output)
         duration = int(video_info["duration"])
         file_size_mb = video_info["size_bytes"] / (1024 * 1024)
 
@@ -265,6 +349,9 @@ def process_video(self, video_id: int) -> Dict:
         raise
 
     finally:
+        video_processor.reset_probe_cache()
+        thread_scheduler.task_finished()
+
         # ===== 8. LIMPIAR ARCHIVOS TEMPORALES =====
         for temp_file in temp_files:
             try:
@@ -0,0 +1,128 @@
+"""
+Tests unitarios para el cache de cortinillas pre-codificadas
+"""
+import os
+import pytest
+from unittest.mock import patch, MagicMock
+from utils.bumper_cache import BumperCache
+from utils.video_processing import VideoProcessor
+
+
+class TestBumperCache:
+    """Tests para BumperCache"""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return BumperCache(cache_dir=str(tmp_path / 'bumpers'), processor=VideoProcessor())
+
+    @pytest.fixture
+    def intro(self, tmp_path):
+        path = tmp_path / 'intro.mp4'
+        path.write_bytes(b'intro-bytes')
+        return str(path)
+
+    def test_cache_key_is_stable(self, cache, intro):
+        """Test que la clave es determinística para el mismo asset y config"""
+        assert cache.cache_key(intro, 2.5) == cache.cache_key(intro, 2.5)
+
+    def test_cache_key_changes_with_encoder_settings(self, cache, intro):
+        """Test que cambiar parámetros del encoder invalida la clave"""
+        key = cache.cache_key(intro, 2.5)
+        cache.processor.crf = cache.processor.crf + 1
+        assert cache.cache_key(intro, 2.5) != key
+
+    @pytest.mark.parametrize("attribute, value", [
+        ("fps", 25), ("pix_fmt", "yuv422p"), ("profile", "main"), ("level", "3.1"),
+    ])
+    def test_cache_key_pins_concat_parameters(self, cache, intro, attribute, value):
+        """Test que frame rate, pix_fmt, perfil y nivel forman parte de la clave"""
+        key = cache.cache_key(intro, 2.5)
+        setattr(cache.processor, attribute, value)
+        assert cache.cache_key(intro, 2.5) != key
+
+    def test_cache_key_changes_with_asset_content(self, cache, intro):
+        """Test que cambiar el contenido del asset invalida la clave"""
+        key = cache.cache_key(intro, 2.5)
+        with open(intro, 'wb') as f:
+            f.write(b'otro contenido distinto')
+        os.utime(intro, (1, 1))
+        assert cache.cache_key(intro, 2.5) != key
+
+    def test_get_segment_missing_asset(self, cache, tmp_path):
+        """Test que un asset inexistente retorna None"""
+        assert cache.get_segment(str(tmp_path / 'nope.mp4'), 2.5) is None
+
+    @patch('ffmpeg.run')
+    @patch('ffmpeg.output')
+    @patch('ffmpeg.input')
+    def test_get_segment_encodes_once(self, mock_input, mock_output, mock_run, cache, intro):
+        """Test que la cortinilla se codifica una vez y luego se reutiliza"""
+        mock_stream = MagicMock()
+        mock_stream.filter.return_value = mock_stream
+        mock_input.return_value = mock_stream
+        mock_output.return_value = mock_stream
+
+        def fake_run(stream, **kwargs):
+            tmp_path = mock_output.call_args[0][1]
+            with open(tmp_path, 'wb') as f:
+                f.write(b'encoded')
+
+        mock_run.side_effect = fake_run
+
+        first = cache.get_segment(intro, 2.5)
+        second = cache.get_segment(intro, 2.5)
+
+        assert first == second
+        assert os.path.exists(first)
+        mock_run.assert_called_once()
+        # La cortinilla se codifica con los mismos parámetros que el video principal
+        encode_kwargs = mock_output.call_args.kwargs
+        for name, value in cache.processor.encode_options().items():
+            assert encode_kwargs[name] == value
+        assert (encode_kwargs['r'], encode_kwargs['profile:v']) == (30, 'high')
+
+    @patch('ffmpeg.run')
+    @patch('ffmpeg.output')
+    @patch('ffmpeg.input')
+    def test_concat_with_bumpers_uses_stream_copy(self, mock_input, mock_output, mock_run, cache, tmp_path):
+        """Test que la concatenación usa el concat demuxer con -c copy"""
+        mock_stream = MagicMock()
+        mock_input.return_value = mock_stream
+        mock_output.return_value = mock_stream
+
+        with patch.object(cache, 'get_segment', side_effect=['/cache/intro.mp4', '/cache/outro.mp4']):
+            result = cache.concat_with_bumpers('/fake/video.mp4', str(tmp_path / 'out.mp4'))
+
+        assert result == str(tmp_path / 'out.mp4')
+        assert mock_input.call_args.kwargs == {'format': 'concat', 'safe': 0}
+        assert mock_output.call_args.kwargs['c'] == 'copy'
+        mock_run.assert_called_once()
+        # El archivo de lista se elimina al terminar
+        assert not os.path.exists(str(tmp_path / 'out.mp4') + '.concat.txt')
+
+    @patch('ffmpeg.output')
+    @patch('ffmpeg.input')
+    def test_concat_with_bumpers_to_sink(self, mock_input, mock_output, cache, tmp_path):
+        """Test que con sink el concat -c copy se escribe como MP4 fragmentado al sink"""
+        mock_stream = MagicMock()
+        mock_input.return_value = mock_stream
+        mock_output.return_value = mock_stream
+        sink = MagicMock()
+
+        with patch.object(cache, 'get_segment', side_effect=['/cache/intro.mp4', '/cache/outro.mp4']), \
+                patch.object(cache.processor, 'run_to_sink') as mock_run_to_sink:
+            result = cache.concat_with_bumpers(
+                str(tmp_path / 'video.mp4'), 's3://bucket/processed/1.mp4', sink=sink
+            )
+
+        assert result == 's3://bucket/processed/1.mp4'
+        assert mock_output.call_args[0][1] == 'pipe:1'
+        assert mock_output.call_args.kwargs['c'] == 'copy'
+        assert 'empty_moov' in mock_output.call_args.kwargs['movflags']
+        mock_run_to_sink.assert_called_once_with(mock_stream, 's3://bucket/processed/1.mp4', sink)
+        assert not os.path.exists(str(tmp_path / 'video.mp4') + '.concat.txt')
+
+    def test_concat_without_bumpers_returns_input(self, cache):
+        """Test que sin cortinillas se retorna el video sin cambios"""
+        with patch.object(cache, 'get_segment', return_value=None):
+            assert cache.concat_with_bumpers('/fake/video.mp4', '/fake/out.mp4') == '/fake/video.mp4'
@@ -0,0 +1,69 @@
+"""
+Tests unitarios para el cache del logo pre-escalado
+"""
+import os
+import pytest
+from unittest.mock import patch
+from PIL import Image
+from utils.logo_cache import LogoCache
+
+
+class TestLogoCache:
+    """Tests para LogoCache"""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return LogoCache(cache_dir=str(tmp_path / 'logos'))
+
+    @pytest.fixture
+    def logo(self, tmp_path):
+        path = tmp_path / 'logo.png'
+        # Rojo semitransparente: premultiplicado debe quedar en ~128
+        Image.new('RGBA', (20, 10), (255, 0, 0, 128)).save(path)
+        return str(path)
+
+    def test_missing_logo_returns_none(self, cache, tmp_path):
+        """Test que un logo inexistente retorna None"""
+        assert cache.get(str(tmp_path / 'nope.png'), 1280, 720) is None
+
+    def test_rasterize_premultiplied_buffer(self, cache, logo):
+        """Test que el buffer es RGBA premultiplicado con el tamaño correcto"""
+        prepared = cache.get(logo, 1280, 720, position='top-left', margin=10)
+
+        with open(prepared.path, 'rb') as f:
+            data = f.read()
+
+        assert (prepared.width, prepared.height) == (20, 10)
+        assert len(data) == 20 * 10 * 4
+        assert data[0] == 128  # 255 * 128/255
+        assert data[3] == 128
+
+    def test_positions_are_absolute(self, cache, logo):
+        """Test que la posición se resuelve a coordenadas absolutas"""
+        assert cache.get(logo, 1280, 720, 'top-right', 10)[3:] == (1280 - 20 - 10, 10)
+        assert cache.get(logo, 1280, 720, 'bottom-left', 10)[3:] == (10, 720 - 10 - 10)
+        assert cache.get(logo, 1280, 720, 'center', 0)[3:] == (630, 355)
+
+    def test_scaled_for_target_resolution(self, cache, logo):
+        """Test que el logo se escala según la altura de salida"""
+        prepared = cache.get(logo, 1920, 1080, position='top-left')
+        assert (prepared.width, prepared.height) == (30, 15)
+
+    def test_reused_across_calls(self, cache, logo):
+        """Test que el logo no se rasteriza de nuevo si no cambió"""
+        first = cache.get(logo, 1280, 720)
+        with patch.object(cache, '_rasterize') as mock_rasterize:
+            second = cache.get(logo, 1280, 720)
+        mock_rasterize.assert_not_called()
+        assert first == second
+
+    def test_invalidated_when_mtime_changes(self, cache, logo):
+        """Test que un cambio de mtime del PNG invalida la entrada"""
+        first = cache.get(logo, 1280, 720)
+        Image.new('RGBA', (40, 20), (0, 255, 0, 255)).save(logo)
+        os.utime(logo, (1, 1))
+
+        second = cache.get(logo, 1280, 720)
+
+        assert second.path != first.path
+        assert (second.width, second.height) == (40, 20)
@@ -0,0 +1,155 @@
+"""
+Tests unitarios para los backends de almacenamiento del worker
+"""
+import os
+import pytest
+from unittest.mock import patch, MagicMock
+from storage import LocalStorage, S3Storage, S3MultipartUpload, fast_transfer
+
+
+class TestLocalStorage:
+    """Tests para LocalStorage"""
+
+    @pytest.fixture
+    def storage(self, tmp_path):
+        (tmp_path / 'original').mkdir()
+        (tmp_path / 'original' / '1.mp4').write_bytes(b'x' * 100)
+        return LocalStorage(base_dir=str(tmp_path))
+
+    def test_get_file_size(self, storage):
+        """Test tamaño del archivo sin copiarlo"""
+        assert storage.get_file_size('original/1.mp4') == 100
+
+    def test_stream_url_is_file_in_place(self, storage):
+        """Test que FFmpeg lee el original en su lugar (sin staging)"""
+        assert storage.get_stream_url('original/1.mp4') == storage.get_full_path('original/1.mp4')
+        assert storage.get_stream_url('original/404.mp4') is None
+
+    def test_download_and_upload_preserve_content(self, storage, tmp_path):
+        """Test que download/upload dejan el contenido correcto y la fuente intacta"""
+        local = str(tmp_path / 'temp' / '1_original.mp4')
+        storage.download_file('original/1.mp4', local)
+        storage.upload_file(local, 'processed/1.mp4')
+
+        with open(storage.get_full_path('processed/1.mp4'), 'rb') as f:
+            assert f.read() == b'x' * 100
+        assert os.path.exists(storage.get_full_path('original/1.mp4'))
+        assert os.path.exists(local)
+
+
+class TestFastTransfer:
+    """Tests para la estrategia reflink -> hardlink -> copia"""
+
+    @pytest.fixture
+    def source(self, tmp_path):
+        path = tmp_path / 'src.mp4'
+        path.write_bytes(b'video')
+        return str(path)
+
+    def test_hardlink_when_reflink_unsupported(self, source, tmp_path):
+        """Test que sin reflink se usa hardlink (mismo inode, sin copiar bytes)"""
+        dest = str(tmp_path / 'out' / 'dst.mp4')
+        with patch('storage._reflink', side_effect=OSError('no soportado')):
+            strategy = fast_transfer(source, dest)
+
+        assert strategy == 'hardlink'
+        assert os.stat(dest).st_ino == os.stat(source).st_ino
+
+    def test_copy_as_last_resort(self, source, tmp_path):
+        """Test que la copia solo se usa si reflink y hardlink fallan"""
+        dest = str(tmp_path / 'dst.mp4')
+        with patch('storage._reflink', side_effect=OSError), \
+                patch('os.link', side_effect=OSError('EXDEV')):
+            strategy = fast_transfer(source, dest)
+
+        assert strategy == 'copy'
+        with open(dest, 'rb') as f:
+            assert f.read() == b'video'
+
+    def test_replaces_existing_destination_atomically(self, source, tmp_path):
+        """Test que un destino existente (reintento) se reemplaza sin residuos"""
+        dest = tmp_path / 'dst.mp4'
+        dest.write_bytes(b'viejo')
+
+        fast_transfer(source, str(dest))
+
+        assert dest.read_bytes() == b'video'
+        assert [p.name for p in tmp_path.iterdir() if p.name.endswith('.tmp')] == []
+
+
+class TestS3Storage:
+    """Tests para S3Storage"""
+
+    @pytest.fixture
+    def s3_client(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def storage(self, s3_client):
+        with patch('boto3.client', return_value=s3_client):
+            return S3Storage(bucket_name='bucket', presigned_expiration=600)
+
+    def test_get_stream_url_presigned(self, storage, s3_client):
+        """Test que se genera una URL prefirmada de GET para FFmpeg"""
+        s3_client.generate_presigned_url.return_value = 'https://bucket.s3/original/1.mp4?sig'
+
+        url = storage.get_stream_url('original/1.mp4')
+
+        assert url == 'https://bucket.s3/original/1.mp4?sig'
+        s3_client.generate_presigned_url.assert_called_once_with(
+            'get_object',
+            Params={'Bucket': 'bucket', 'Key': 'original/1.mp4'},
+            ExpiresIn=600
+        )
+
+    def test_get_stream_url_falls_back_on_error(self, storage, s3_client):
+        """Test que un error al firmar retorna None (se descarga el archivo)"""
+        s3_client.generate_presigned_url.side_effect = Exception('boom')
+        assert storage.get_stream_url('original/1.mp4') is None
+
+    def test_get_file_size(self, storage, s3_client):
+        """Test tamaño del objeto con head_object"""
+        s3_client.head_object.return_value = {'ContentLength': 4096}
+        assert storage.get_file_size('original/1.mp4') == 4096
+
+
+class TestS3MultipartUpload:
+    """Tests para la subida multipart en streaming"""
+
+    @pytest.fixture
+    def s3_client(self):
+        client = MagicMock()
+        client.create_multipart_upload.return_value = {'UploadId': 'up-1'}
+        client.upload_part.side_effect = lambda **kw: {'ETag': f"etag-{kw['PartNumber']}"}
+        return client
+
+    def test_parts_uploaded_in_order(self, s3_client):
+        """Test que los chunks se agrupan en partes y se completan en orden"""
+        upload = S3MultipartUpload(s3_client, 'bucket', 'processed/1.mp4', part_size=0)
+        part = upload.part_size  # mínimo de S3 (5 MB)
+
+        upload.write(b'a' * (part - 10))
+        upload.write(b'b' * 20)  # completa la primera parte
+        upload.write(b'c' * part)  # segunda parte completa
+        upload.complete()
+
+        sizes = [len(c.kwargs['Body']) for c in s3_client.upload_part.call_args_list]
+        assert sizes == [part, part, 10]
+        parts = s3_client.complete_multipart_upload.call_args.kwargs['MultipartUpload']['Parts']
+        assert parts == [
+            {'PartNumber': 1, 'ETag': 'etag-1'},
+            {'PartNumber': 2, 'ETag': 'etag-2'},
+            {'PartNumber': 3, 'ETag': 'etag-3'},
+        ]
+        assert upload.bytes_written == 2 * part + 10
+
+    def test_abort(self, s3_client):
+        """Test que abort cancela la subida en S3"""
+        upload = S3MultipartUpload(s3_client, 'bucket', 'processed/1.mp4')
+        upload.write(b'datos')
+        upload.abort()
+
+        s3_client.abort_multipart_upload.assert_called_once_with(
+            Bucket='bucket', Key='processed/1.mp4', UploadId='up-1'
+        )
+        s3_client.complete_multipart_upload.assert_not_called()
@@ -6,6 +6,7 @@ from datetime import datetime, timezone
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
+from config import config
 from models import Video, VideoStatus
 from utils.video_processing import VideoProcessingError
 from tasks.video_processor import (
@@ -73,8 +74,41 @@ class TestProcessVideoTask:
         assert result["status"] == "success"
         assert mock_video.status == VideoStatus.processed
         assert mock_video.processed_url == "http://localhost:80/api/videos/processed/123"
+        # El dueño entra al ranking (player_scores) en la misma transacción
+        assert "player_scores" in str(mock_db_session.execute.call_args[0][0])
         mock_db_session.commit.assert_called_once()
 
+    @patch("tasks.video_processor.get_db_session")
+    @patch("tasks.video_processor.get_storage_backend")
+    @patch("tasks.video_processor.bumper_cache")
+    @patch("tasks.video_processor.video_processor")
+    @patch("os.path.exists", return_value=True)
+    def test_stream_output_concats_cached_bumpers(
+        self, mock_exists, mock_processor, mock_bumper_cache, mock_get_storage,
+        mock_get_db, mock_db_session
+    ):
+        """Test que con STREAM_OUTPUT y cache de cortinillas se codifica solo el principal y se sube el concat"""
+        mock_get_db.return_value = mock_db_session
+        storage = mock_get_storage.return_value
+        storage.get_file_size.return_value = 1024 * 1024
+        upload_stream = storage.open_upload_stream.return_value
+        mock_processor.get_video_info.return_value = {"duration": 35, "size_bytes": 1024 * 1024}
+
+        with patch.object(config, "STREAM_OUTPUT", True), \
+                patch.object(config, "BUMPER_CACHE_ENABLED", True), \
+                patch.object(config, "VIDEO_SINGLE_PASS", True):
+            result = process_video.run(123)
+
+        assert result["status"] == "success"
+        encode_kwargs = mock_processor.process_video_single_pass.call_args.kwargs
+        assert encode_kwargs["include_bumpers"] is False
+        assert "sink" not in encode_kwargs
+        concat_kwargs = mock_bumper_cache.concat_with_bumpers.call_args.kwargs
+        assert concat_kwargs["video_path"] == encode_kwargs["output_path"]
+        assert concat_kwargs["sink"] is upload_stream
+        upload_stream.complete.assert_called_once()
+        storage.upload_file.assert_not_called()
+
     @patch("tasks.video_processor.get_db_session")
     @patch("os.path.exists", return_value=False)
     def test_process_video_file_not_found(
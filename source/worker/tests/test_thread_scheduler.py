@@ -0,0 +1,76 @@
+"""
+Tests unitarios para la asignación adaptativa de threads de FFmpeg
+"""
+import os
+import pytest
+from unittest.mock import patch
+from utils.thread_scheduler import ThreadScheduler
+from utils.video_processing import VideoProcessor
+
+
+class TestThreadScheduler:
+    """Tests para ThreadScheduler"""
+
+    @pytest.fixture
+    def scheduler(self, tmp_path):
+        return ThreadScheduler(state_dir=str(tmp_path / 'active'), cores=4)
+
+    def test_single_task_uses_all_cores(self, scheduler):
+        """Test que una tarea sola usa todos los cores"""
+        allocation = scheduler.allocate(active=1)
+        assert allocation['threads'] == 4
+        assert allocation['filter_threads'] == 4
+        assert allocation['lookahead_threads'] == 1
+
+    def test_saturated_node_does_not_oversubscribe(self, scheduler):
+        """Test que con más tareas que cores se usa 1 thread por tarea"""
+        assert scheduler.allocate(active=4)['threads'] == 1
+        assert scheduler.allocate(active=8)['threads'] == 1
+
+    def test_cores_split_between_tasks(self, scheduler):
+        """Test que los cores se reparten entre las tareas activas"""
+        assert scheduler.allocate(active=2)['threads'] == 2
+
+    def test_active_tasks_counts_markers(self, scheduler):
+        """Test que task_started/task_finished actualizan el conteo"""
+        assert scheduler.active_tasks() == 1  # mínimo 1 (sin directorio)
+
+        scheduler.task_started()
+        with open(os.path.join(scheduler.state_dir, f"{os.getppid()}.active"), 'w'):
+            pass
+        assert scheduler.active_tasks() == 2
+
+        scheduler.task_finished()
+        assert scheduler.active_tasks() == 1
+
+    def test_stale_markers_are_removed(self, scheduler):
+        """Test que marcadores de procesos muertos se ignoran y se eliminan"""
+        os.makedirs(scheduler.state_dir)
+        stale = os.path.join(scheduler.state_dir, "999999999.active")
+        open(stale, 'w').close()
+
+        with patch('os.kill', side_effect=ProcessLookupError):
+            assert scheduler.active_tasks() == 1
+        assert not os.path.exists(stale)
+
+
+class TestVideoProcessorThreadOptions:
+    """Tests para las opciones de threads del output de FFmpeg"""
+
+    @patch('utils.video_processing.config')
+    def test_fixed_single_thread_when_disabled(self, mock_config):
+        """Test que sin modo adaptativo se usa 1 thread"""
+        mock_config.FFMPEG_ADAPTIVE_THREADS = False
+        assert VideoProcessor()._thread_options() == {"threads": 1}
+
+    @patch('utils.video_processing.thread_scheduler')
+    def test_adaptive_options(self, mock_scheduler):
+        """Test que las opciones vienen del scheduler"""
+        mock_scheduler.allocate.return_value = {
+            "threads": 6, "filter_threads": 6, "lookahead_threads": 1
+        }
+        options = VideoProcessor()._thread_options()
+
+        assert options["threads"] == 6
+        assert options["filter_complex_threads"] == 6
+        assert options["x264-params"] == "lookahead-threads=1"
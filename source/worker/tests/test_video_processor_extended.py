@@ -173,7 +173,7 @@ class TestProcessVideoExtended:
         # Input y logo existen siempre, output existe después de ffmpeg.run
         mock_exists.side_effect = lambda path: 'input' in path or 'logo' in path or 'output' in path
 
-        # Mock get_video_info para ser llamado dos veces: antes y después del procesamiento
+        # Mock get_video_info (el segundo valor ya no se usa: el encode reporta sus stats)
         mock_get_info.side_effect = [
             {
                 'duration': 25,
@@ -209,8 +209,8 @@ class TestProcessVideoExtended:
             )
 
         assert result == '/fake/output.mp4'
-        # Debe llamar a get_video_info dos veces: antes y después del procesamiento
-        assert mock_get_info.call_count == 2
+        # Solo se prueba el input: las stats de salida las reporta el encode (-progress)
+        assert mock_get_info.call_count == 1
         # Debe llamar a input dos veces: video y logo
         assert mock_input.call_count >= 2
 
@@ -435,6 +435,271 @@ class TestAddIntroOutroExtended:
         assert call_kwargs.get('a') == 0
 
 
+class TestProcessVideoSinglePass:
+    """Tests para el modo single-pass (un solo encode con cortinillas)"""
+
+    @pytest.fixture
+    def processor(self):
+        return VideoProcessor()
+
+    @pytest.fixture
+    def video_info(self):
+        return {
+            'duration': 45,
+            'width': 1920,
+            'height': 1080,
+            'codec': 'h264',
+            'fps': 30.0,
+            'size_bytes': 5242880
+        }
+
+    @patch('ffmpeg.run')
+    @patch('ffmpeg.output')
+    @patch('ffmpeg.concat')
+    @patch('ffmpeg.input')
+    @patch('os.makedirs')
+    @patch('os.path.exists', return_value=True)
+    def test_single_pass_concat_and_one_encode(
+        self, mock_exists, mock_makedirs, mock_input, mock_concat,
+        mock_output, mock_run, processor, video_info
+    ):
+        """Test que intro + principal + outro se codifican en un solo ffmpeg.run"""
+        mock_stream = MagicMock()
+        mock_stream.filter.return_value = mock_stream
+        mock_stream.overlay.return_value = mock_stream
+        mock_input.return_value = mock_stream
+        mock_concat.return_value = mock_stream
+        mock_output.return_value = mock_stream
+
+        with patch.object(processor, 'get_video_info', return_value=video_info) as mock_info:
+            result = processor.process_video_single_pass(
+                '/fake/input.mp4',
+                '/fake/output.mp4',
+                intro_path='/fake/intro.mp4',
+                outro_path='/fake/outro.mp4'
+            )
+
+        assert result == '/fake/output.mp4'
+        mock_run.assert_called_once()
+        mock_output.assert_called_once()
+        # Solo se hace probe del input (sin re-probe del intermedio)
+        mock_info.assert_called_once_with('/fake/input.mp4')
+        args, kwargs = mock_concat.call_args
+        assert len(args) == 3
+        assert kwargs == {'v': 1, 'a': 0}
+        # Frame rate, perfil y nivel fijos (los mismos que las cortinillas cacheadas)
+        output_kwargs = mock_output.call_args.kwargs
+        assert (output_kwargs['r'], output_kwargs['profile:v'], output_kwargs['level']) == (30, 'high', '4.0')
+
+    @patch('ffmpeg.run')
+    @patch('ffmpeg.output')
+    @patch('ffmpeg.concat')
+    @patch('ffmpeg.input')
+    @patch('os.makedirs')
+    @patch('os.path.exists')
+    def test_single_pass_without_bumpers(
+        self, mock_exists, mock_makedirs, mock_input, mock_concat,
+        mock_output, mock_run, processor, video_info
+    ):
+        """Test que sin cortinillas no se usa concat"""
+        mock_exists.side_effect = lambda path: 'input' in path or 'output' in path
+        mock_stream = MagicMock()
+        mock_stream.filter.return_value = mock_stream
+        mock_input.return_value = mock_stream
+        mock_output.return_value = mock_stream
+
+        with patch.object(processor, 'get_video_info', return_value=video_info):
+            processor.process_video_single_pass('/fake/input.mp4', '/fake/output.mp4')
+
+        mock_concat.assert_not_called()
+        mock_run.assert_called_once()
+
+    @patch('ffmpeg.run')
+    @patch('ffmpeg.output')
+    @patch('ffmpeg.concat')
+    @patch('ffmpeg.input')
+    @patch('os.makedirs')
+    @patch('os.path.exists', return_value=True)
+    def test_single_pass_excludes_cached_bumpers(
+        self, mock_exists, mock_makedirs, mock_input, mock_concat,
+        mock_output, mock_run, processor, video_info
+    ):
+        """Test que con include_bumpers=False solo se codifica el video principal"""
+        mock_stream = MagicMock()
+        mock_stream.filter.return_value = mock_stream
+        mock_stream.overlay.return_value = mock_stream
+        mock_input.return_value = mock_stream
+        mock_output.return_value = mock_stream
+
+        with patch.object(processor, 'get_video_info', return_value=video_info):
+            processor.process_video_single_pass(
+                '/fake/input.mp4', '/fake/output.mp4', include_bumpers=False
+            )
+
+        mock_concat.assert_not_called()
+        mock_run.assert_called_once()
+
+    @patch('ffmpeg.run')
+    @patch('ffmpeg.output')
+    @patch('ffmpeg.input')
+    @patch('os.makedirs')
+    @patch('os.path.exists')
+    def test_single_pass_remote_input(
+        self, mock_exists, mock_makedirs, mock_input, mock_output, mock_run, processor, video_info
+    ):
+        """Test que una URL prefirmada se lee en streaming con reconexión HTTP"""
+        url = 'https://bucket.s3.amazonaws.com/original/1.mp4?X-Amz-Signature=abc'
+        mock_exists.side_effect = lambda path: 'output' in path
+        mock_stream = MagicMock()
+        mock_stream.filter.return_value = mock_stream
+        mock_input.return_value = mock_stream
+        mock_output.return_value = mock_stream
+
+        with patch.object(processor, 'get_video_info', return_value=video_info):
+            processor.process_video_single_pass(url, '/fake/output.mp4', add_logo=False)
+
+        args, kwargs = mock_input.call_args
+        assert args[0] == url
+        assert kwargs['t'] == processor.max_duration
+        assert kwargs['reconnect'] == 1
+
+    @patch('os.path.exists', return_value=False)
+    def test_single_pass_input_not_found(self, mock_exists, processor):
+        """Test que falla si el input no existe"""
+        with pytest.raises(FileNotFoundError):
+            processor.process_video_single_pass('/fake/input.mp4', '/fake/output.mp4')
+
+
+class TestProbeCache:
+    """Tests para el cache de ffprobe por tarea y las stats de -progress"""
+
+    @pytest.fixture
+    def processor(self):
+        return VideoProcessor()
+
+    @pytest.fixture
+    def video_file(self, tmp_path):
+        path = tmp_path / 'video.mp4'
+        path.write_bytes(b'0' * 2048)
+        return str(path)
+
+    @pytest.fixture
+    def probe_result(self):
+        return {
+            'streams': [{
+                'codec_type': 'video',
+                'width': 1280,
+                'height': 720,
+                'codec_name': 'h264',
+                'r_frame_rate': '30/1'
+            }],
+            'format': {'duration': '30.0', 'size': '2048'}
+        }
+
+    @patch('ffmpeg.probe')
+    def test_same_file_probed_once(self, mock_probe, processor, video_file, probe_result):
+        """Test que el mismo archivo (path, size, mtime) se prueba una sola vez"""
+        mock_probe.return_value = probe_result
+
+        first = processor.get_video_info(video_file)
+        second = processor.get_video_info(video_file)
+
+        assert first == second
+        mock_probe.assert_called_once()
+
+    @patch('ffmpeg.probe')
+    def test_modified_file_probed_again(self, mock_probe, processor, video_file, probe_result):
+        """Test que un cambio de tamaño invalida la entrada del cache"""
+        mock_probe.return_value = probe_result
+        processor.get_video_info(video_file)
+
+        with open(video_file, 'ab') as f:
+            f.write(b'mas datos')
+        processor.get_video_info(video_file)
+
+        assert mock_probe.call_count == 2
+
+    @patch('ffmpeg.probe')
+    def test_reset_probe_cache(self, mock_probe, processor, video_file, probe_result):
+        """Test que reset_probe_cache fuerza un nuevo probe"""
+        mock_probe.return_value = probe_result
+        processor.get_video_info(video_file)
+        processor.reset_probe_cache()
+        processor.get_video_info(video_file)
+
+        assert mock_probe.call_count == 2
+
+    @patch('ffmpeg.probe')
+    @patch('ffmpeg.run')
+    def test_run_with_progress_registers_output_stats(
+        self, mock_run, mock_probe, processor, video_file
+    ):
+        """Test que las stats de -progress evitan el ffprobe posterior al encode"""
+        mock_run.return_value = (
+            b"frame=450\nout_time_us=15000000\nprogress=continue\n"
+            b"frame=900\nout_time_us=30000000\nprogress=end\n",
+            b""
+        )
+
+        info = processor.run_with_progress(MagicMock(), video_file)
+
+        assert info['duration'] == 30.0
+        assert info['fps'] == 30.0
+        assert info['codec'] == 'h264'
+        assert info['size_bytes'] == 2048
+        assert processor.get_video_info(video_file) == info
+        assert processor.validate_video(video_file) is True
+        mock_probe.assert_not_called()
+
+    @patch('ffmpeg.run', return_value=(b"frame=10\nprogress=continue\n", b""))
+    def test_run_with_progress_incomplete(self, mock_run, processor, video_file):
+        """Test que sin progress=end no se registran stats"""
+        assert processor.run_with_progress(MagicMock(), video_file) is None
+        assert processor._probe_cache == {}
+
+
+class TestRunToSink:
+    """Tests para la salida en streaming (FFmpeg -> sink)"""
+
+    @pytest.fixture
+    def processor(self):
+        return VideoProcessor()
+
+    @patch('ffmpeg.run_async')
+    def test_output_written_to_sink_with_stats(self, mock_run_async, processor):
+        """Test que stdout va al sink y las stats quedan en el cache de probe"""
+        import io
+        process = MagicMock()
+        process.stdout = io.BytesIO(b'fragmento-1fragmento-2')
+        process.stderr = io.BytesIO(b"frame=900\nout_time_us=30000000\nprogress=end\n")
+        process.returncode = 0
+        mock_run_async.return_value = process
+        sink = MagicMock()
+
+        info = processor.run_to_sink(MagicMock(), 's3://bucket/processed/1.mp4', sink)
+
+        written = b''.join(c.args[0] for c in sink.write.call_args_list)
+        assert written == b'fragmento-1fragmento-2'
+        assert info['size_bytes'] == len(written)
+        assert info['duration'] == 30.0
+        assert processor.get_video_info('s3://bucket/processed/1.mp4') == info
+        assert processor.validate_video('s3://bucket/processed/1.mp4') is True
+
+    @patch('ffmpeg.run_async')
+    def test_ffmpeg_failure_raises(self, mock_run_async, processor):
+        """Test que un código de salida != 0 lanza ffmpeg.Error"""
+        import io
+        import ffmpeg as ffmpeg_module
+        process = MagicMock()
+        process.stdout = io.BytesIO(b'')
+        process.stderr = io.BytesIO(b'Invalid data found')
+        process.returncode = 1
+        mock_run_async.return_value = process
+
+        with pytest.raises(ffmpeg_module.Error):
+            processor.run_to_sink(MagicMock(), 's3://bucket/processed/1.mp4', MagicMock())
+
+
 class TestValidateVideoExtended:
     """Tests extendidos para validación de videos"""
 
@@ -0,0 +1,226 @@
+"""
+Cache de cortinillas (intro/outro) pre-codificadas
+Las cortinillas se codifican una sola vez con los mismos parámetros del encode
+principal y se concatenan al video procesado con stream copy (sin re-encode)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+import ffmpeg
+from config import config
+from utils.video_processing import (
+    FRAGMENTED_MOVFLAGS,
+    VideoProcessor,
+    VideoProcessingError,
+    video_processor,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BumperCache:
+    """
+    Cache en disco de cortinillas pre-codificadas
+
+    Cada cortinilla se guarda como {cache_dir}/bumper_{hash}.mp4, donde el hash
+    combina el contenido del asset, la duración máxima y los parámetros del
+    encoder (incluidos frame rate, timebase, pix_fmt, perfil y nivel). Si cambia
+    el asset o la configuración de encode, cambia la clave y se genera un nuevo
+    segmento compatible.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, processor: Optional[VideoProcessor] = None):
+        self.cache_dir = cache_dir or os.path.join(config.CACHE_DIR, 'bumpers')
+        self.processor = processor or video_processor
+        # Memoiza el hash por (path, mtime, size) para no releer el asset en cada tarea
+        self._asset_hashes: Dict[Tuple[str, float, int], str] = {}
+
+    def encoder_settings(self) -> Dict:
+        """
+        Parámetros de encode que deben coincidir con el video principal
+        para que la concatenación con -c copy sea válida
+        """
+        return {
+            **self.processor.encode_options(),
+            "width": self.processor.width,
+            "height": self.processor.height,
+        }
+
+    def _asset_hash(self, asset_path: str) -> str:
+        """Hash SHA-256 del contenido del asset (memoizado por mtime/size)"""
+        stat = os.stat(asset_path)
+        memo_key = (os.path.abspath(asset_path), stat.st_mtime, stat.st_size)
+        if memo_key not in self._asset_hashes:
+            digest = hashlib.sha256()
+            with open(asset_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+            self._asset_hashes[memo_key] = digest.hexdigest()
+        return self._asset_hashes[memo_key]
+
+    def cache_key(self, asset_path: str, max_duration: float) -> str:
+        """
+        Clave de cache: hash del asset + duración + parámetros del encoder
+
+        Args:
+            asset_path: Ruta del video de intro/outro
+            max_duration: Duración máxima de la cortinilla
+
+        Returns:
+            Clave hexadecimal
+        """
+        payload = json.dumps(
+            {
+                "asset": self._asset_hash(asset_path),
+                "max_duration": max_duration,
+                "encoder": self.encoder_settings(),
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+    def get_segment(self, asset_path: str, max_duration: float) -> Optional[str]:
+        """
+        Obtiene la cortinilla pre-codificada, codificándola si no está en cache
+
+        Args:
+            asset_path: Ruta del video de intro/outro
+            max_duration: Duración máxima de la cortinilla
+
+        Returns:
+            Ruta del segmento cacheado, o None si el asset no existe
+
+        Raises:
+            VideoProcessingError: Si falla el encode de la cortinilla
+        """
+        if not os.path.exists(asset_path):
+            return None
+
+        segment_path = os.path.join(
+            self.cache_dir, f"bumper_{self.cache_key(asset_path, max_duration)}.mp4"
+        )
+        if os.path.exists(segment_path):
+            return segment_path
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Escribir a un archivo temporal y renombrar: otros procesos nunca ven un segmento a medias
+        tmp_path = f"{segment_path}.{uuid.uuid4().hex}.tmp"
+
+        try:
+            stream = ffmpeg.input(asset_path, t=max_duration)
+            stream = stream.filter("scale", self.processor.width, self.processor.height)
+            stream = stream.filter("setsar", 1)
+            stream = ffmpeg.output(
+                stream,
+                tmp_path,
+                **self.processor.encode_options(),
+                format="mp4",
+                an=None,
+                movflags="+faststart",
+            )
+            ffmpeg.run(stream, overwrite_output=True, quiet=True)
+            os.replace(tmp_path, segment_path)
+            logger.info(f"✅ Cortinilla cacheada: {asset_path} -> {segment_path}")
+            return segment_path
+
+        except ffmpeg.Error as e:
+            error_output = e.stderr.decode()[:500] if hasattr(e, 'stderr') and e.stderr else str(e)
+            logger.error(f"❌ FFmpeg falló codificando cortinilla: {error_output}")
+            raise VideoProcessingError(f"Error codificando cortinilla: {error_output}")
+
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def warm_up(self) -> Dict[str, Optional[str]]:
+        """
+        Pre-codifica intro y outro configurados (se llama al arrancar el worker)
+
+        Returns:
+            Diccionario {"intro": path|None, "outro": path|None}
+        """
+        return {
+            "intro": self.get_segment(config.INTRO_VIDEO_PATH, config.MAX_INTRO_DURATION),
+            "outro": self.get_segment(config.OUTRO_VIDEO_PATH, config.MAX_OUTRO_DURATION),
+        }
+
+    def concat_with_bumpers(
+        self,
+        video_path: str,
+        output_path: str,
+        intro_path: Optional[str] = None,
+        outro_path: Optional[str] = None,
+        sink=None,
+    ) -> str:
+        """
+        Concatena intro + video + outro con el concat demuxer y -c copy
+
+        El video principal debe haberse codificado con encoder_settings()
+        (VideoProcessor.encode_options, que usan todos los encodes).
+
+        Args:
+            video_path: Video principal (ya procesado)
+            output_path: Ruta de salida
+            intro_path: Video de intro (usa config si no se especifica)
+            outro_path: Video de outro (usa config si no se especifica)
+            sink: Si se especifica (objeto con write(bytes)), la salida se escribe
+                como MP4 fragmentado a sink y output_path solo identifica la
+                ubicación final (p.ej. s3://bucket/key)
+
+        Returns:
+            Ruta del video con cortinillas, o video_path si no hay cortinillas
+            (sin sink; con sink el video se copia igual al sink)
+
+        Raises:
+            VideoProcessingError: Si falla la concatenación
+        """
+        intro = self.get_segment(intro_path or config.INTRO_VIDEO_PATH, config.MAX_INTRO_DURATION)
+        outro = self.get_segment(outro_path or config.OUTRO_VIDEO_PATH, config.MAX_OUTRO_DURATION)
+
+        segments: List[str] = [p for p in (intro, video_path, outro) if p]
+        if len(segments) == 1 and sink is None:
+            logger.debug("ℹ️ No se encontraron cortinillas, se omite este paso")
+            return video_path
+
+        # Con sink output_path no es local (p.ej. s3://...): la lista va junto al video principal
+        list_path = f"{output_path if sink is None else video_path}.concat.txt"
+        try:
+            with open(list_path, 'w') as f:
+                for segment in segments:
+                    escaped = os.path.abspath(segment).replace("'", "'\\''")
+                    f.write(f"file '{escaped}'\n")
+
+            stream = ffmpeg.input(list_path, format="concat", safe=0)
+            # Con sink: MP4 fragmentado a stdout (un pipe no admite el seek de faststart)
+            stream = ffmpeg.output(
+                stream,
+                "pipe:1" if sink is not None else output_path,
+                c="copy",
+                format="mp4",
+                movflags=FRAGMENTED_MOVFLAGS if sink is not None else "+faststart",
+            )
+            # Registra las stats de salida en el cache de probe (sin ffprobe posterior)
+            if sink is not None:
+                self.processor.run_to_sink(stream, output_path, sink)
+            else:
+                self.processor.run_with_progress(stream, output_path)
+            logger.debug(f"✅ Cortinillas concatenadas sin re-encode ({len(segments)} segmentos)")
+            return output_path
+
+        except ffmpeg.Error as e:
+            error_output = e.stderr.decode()[:500] if hasattr(e, 'stderr') and e.stderr else str(e)
+            logger.error(f"❌ FFmpeg falló concatenando cortinillas: {error_output}")
+            raise VideoProcessingError(f"Error concatenando cortinillas: {error_output}")
+
+        finally:
+            if os.path.exists(list_path):
+                os.remove(list_path)
+
+
+# Singleton instance
+bumper_cache = BumperCache()
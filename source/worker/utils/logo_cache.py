@@ -0,0 +1,128 @@
+"""
+Cache del logo pre-escalado para la marca de agua
+El PNG se rasteriza una sola vez por (resolución, posición, margen) a un buffer
+RGBA premultiplicado listo para el filtro overlay de FFmpeg
+"""
+
+import hashlib
+import logging
+import os
+import uuid
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from PIL import Image
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class PreparedLogo(NamedTuple):
+    """Logo rasterizado listo para overlay"""
+
+    path: str  # Buffer RGBA premultiplicado (rawvideo)
+    width: int
+    height: int
+    x: int  # Posición absoluta en el frame de salida
+    y: int
+
+
+class LogoCache:
+    """
+    Cache del logo rasterizado (memoria + disco)
+
+    La clave es (logo, resolución de salida, posición, margen). La entrada se
+    invalida cuando cambia el mtime del PNG original.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or os.path.join(config.CACHE_DIR, 'logos')
+        self._entries: Dict[Tuple[str, int, int, str, int], Tuple[float, PreparedLogo]] = {}
+
+    @staticmethod
+    def _position(
+        frame_w: int, frame_h: int, logo_w: int, logo_h: int, position: str, margin: int
+    ) -> Tuple[int, int]:
+        """Coordenadas absolutas equivalentes a VideoProcessor._get_logo_position"""
+        positions = {
+            "top-left": (margin, margin),
+            "top-right": (frame_w - logo_w - margin, margin),
+            "bottom-left": (margin, frame_h - logo_h - margin),
+            "bottom-right": (frame_w - logo_w - margin, frame_h - logo_h - margin),
+            "center": ((frame_w - logo_w) // 2, (frame_h - logo_h) // 2),
+        }
+        return positions.get(position, positions["top-right"])
+
+    def get(
+        self,
+        logo_path: str,
+        width: int,
+        height: int,
+        position: Optional[str] = None,
+        margin: Optional[int] = None,
+    ) -> Optional[PreparedLogo]:
+        """
+        Obtiene el logo rasterizado para la resolución de salida
+
+        Args:
+            logo_path: Ruta del PNG original
+            width: Ancho del video de salida
+            height: Alto del video de salida
+            position: Posición del logo (usa config si no se especifica)
+            margin: Margen en píxeles (usa config si no se especifica)
+
+        Returns:
+            PreparedLogo, o None si el logo no existe
+        """
+        if not os.path.exists(logo_path):
+            return None
+
+        position = position or config.LOGO_POSITION
+        margin = config.LOGO_MARGIN if margin is None else margin
+        key = (os.path.abspath(logo_path), width, height, position, margin)
+        mtime = os.path.getmtime(logo_path)
+
+        cached = self._entries.get(key)
+        if cached and cached[0] == mtime and os.path.exists(cached[1].path):
+            return cached[1]
+
+        prepared = self._rasterize(logo_path, mtime, width, height, position, margin)
+        self._entries[key] = (mtime, prepared)
+        return prepared
+
+    def _rasterize(
+        self, logo_path: str, mtime: float, width: int, height: int, position: str, margin: int
+    ) -> PreparedLogo:
+        """Escala y premultiplica el logo, y lo guarda como buffer RGBA crudo"""
+        with Image.open(logo_path) as img:
+            logo = img.convert("RGBA")
+
+        # El logo está diseñado para 720p: escalar proporcionalmente a la altura de salida
+        scale = height / config.LOGO_DESIGN_HEIGHT
+        if scale != 1:
+            logo = logo.resize(
+                (max(1, round(logo.width * scale)), max(1, round(logo.height * scale))),
+                Image.LANCZOS,
+            )
+
+        # 'RGBa' = RGBA con alpha premultiplicado (overlay con alpha=premultiplied)
+        buffer = logo.convert("RGBa").tobytes()
+        x, y = self._position(width, height, logo.width, logo.height, position, margin)
+
+        digest = hashlib.sha256(
+            f"{os.path.abspath(logo_path)}:{mtime}:{width}x{height}:{position}:{margin}".encode()
+        ).hexdigest()[:32]
+        raw_path = os.path.join(self.cache_dir, f"logo_{digest}.rgba")
+
+        if not os.path.exists(raw_path):
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{raw_path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(buffer)
+            os.replace(tmp_path, raw_path)
+
+        logger.debug(f"🖼️ Logo rasterizado: {logo.width}x{logo.height} en ({x}, {y}) -> {raw_path}")
+        return PreparedLogo(path=raw_path, width=logo.width, height=logo.height, x=x, y=y)
+
+
+# Singleton instance
+logo_cache = LogoCache()
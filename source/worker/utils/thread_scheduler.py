@@ -0,0 +1,113 @@
+"""
+Asignación adaptativa de threads para FFmpeg
+Reparte los cores del nodo entre las tareas activas en ese momento
+"""
+
+import logging
+import os
+from typing import Dict, Optional
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class ThreadScheduler:
+    """
+    Calcula threads de encoder, de filtros y de lookahead por tarea
+
+    Celery (prefork) ejecuta cada tarea en un proceso hijo distinto, así que
+    las tareas activas se cuentan con un archivo marcador por PID en un
+    directorio local del nodo. Los marcadores de procesos muertos se ignoran
+    y se eliminan.
+
+    - 1 tarea activa en 4 cores -> 4 threads
+    - 4 tareas activas en 4 cores -> 1 thread cada una
+    - 8 tareas activas en 4 cores -> 1 thread (nunca sobre-suscribe más)
+    """
+
+    def __init__(self, state_dir: Optional[str] = None, cores: Optional[int] = None):
+        self.state_dir = state_dir or config.THREAD_STATE_DIR
+        self._cores = cores
+
+    @property
+    def cores(self) -> int:
+        """Cores disponibles para este proceso (respeta affinity/cgroups de CPU)"""
+        if self._cores is None:
+            try:
+                self._cores = len(os.sched_getaffinity(0))
+            except AttributeError:
+                self._cores = os.cpu_count() or 1
+        return self._cores
+
+    def _marker(self, pid: int) -> str:
+        return os.path.join(self.state_dir, f"{pid}.active")
+
+    def task_started(self) -> None:
+        """Marca una tarea activa para el proceso actual"""
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            with open(self._marker(os.getpid()), 'w'):
+                pass
+        except OSError as e:
+            logger.warning(f"⚠️ No se pudo registrar la tarea activa: {e}")
+
+    def task_finished(self) -> None:
+        """Desmarca la tarea activa del proceso actual"""
+        try:
+            os.remove(self._marker(os.getpid()))
+        except OSError:
+            pass
+
+    def active_tasks(self) -> int:
+        """Número de tareas activas en el nodo (mínimo 1: la tarea que pregunta)"""
+        active = 0
+        try:
+            names = os.listdir(self.state_dir)
+        except OSError:
+            return 1
+
+        for name in names:
+            if not name.endswith(".active"):
+                continue
+            try:
+                pid = int(name.split(".", 1)[0])
+                os.kill(pid, 0)
+                active += 1
+            except ValueError:
+                continue
+            except ProcessLookupError:
+                # Proceso muerto (p.ej. worker_lost): limpiar marcador huérfano
+                try:
+                    os.remove(os.path.join(self.state_dir, name))
+                except OSError:
+                    pass
+            except PermissionError:
+                # El proceso existe pero pertenece a otro usuario
+                active += 1
+
+        return max(1, active)
+
+    def allocate(self, active: Optional[int] = None) -> Dict[str, int]:
+        """
+        Calcula la asignación de threads para un encode
+
+        Args:
+            active: Tareas activas (se detecta si no se especifica)
+
+        Returns:
+            Diccionario con threads (encoder), filter_threads y lookahead_threads
+        """
+        active = active or self.active_tasks()
+        per_task = max(1, self.cores // active)
+
+        return {
+            "threads": per_task,
+            "filter_threads": per_task,
+            # Mismo criterio que x264 (threads/6), mínimo 1
+            "lookahead_threads": max(1, per_task // 6),
+        }
+
+
+# Singleton instance
+thread_scheduler = ThreadScheduler()
@@ -5,13 +5,19 @@ Implementa todas las transformaciones requeridas según especificación ANB
 
 import logging
 import os
+import threading
 from typing import Dict, Optional, Tuple
 
 import ffmpeg
 from config import config
+from utils.logo_cache import logo_cache
+from utils.thread_scheduler import thread_scheduler
 
 logger = logging.getLogger(__name__)
 
+# MP4 fragmentado para salida por pipe: moov vacío al inicio + fragmentos por keyframe
+FRAGMENTED_MOVFLAGS = "frag_keyframe+empty_moov+default_base_moof"
+
 
 class VideoProcessingError(Exception):
     """Excepción personalizada para errores de procesamiento"""
@@ -39,11 +45,51 @@ class VideoProcessor:
         self.preset = config.VIDEO_PRESET
         self.crf = config.VIDEO_CRF
         self.tune = config.VIDEO_TUNE
+        self.fps = config.VIDEO_FPS
+        self.pix_fmt = config.VIDEO_PIX_FMT
+        self.profile = config.VIDEO_PROFILE
+        self.level = config.VIDEO_LEVEL
+        # Cache de resultados de ffprobe por (path, size, mtime); se reinicia en cada tarea
+        self._probe_cache: Dict[Tuple[str, int, float], Dict] = {}
+
+    def reset_probe_cache(self) -> None:
+        """Vacía el cache de probe (llamar al inicio/fin de cada tarea)"""
+        self._probe_cache.clear()
+
+    @staticmethod
+    def is_remote(video_path: str) -> bool:
+        """
+        True si el video no es un archivo local: URL prefirmada de S3 (input en
+        streaming) o URI s3:// (output subido en streaming)
+        """
+        return video_path.startswith(("http://", "https://", "s3://"))
+
+    @staticmethod
+    def _probe_key(video_path: str) -> Optional[Tuple[str, int, float]]:
+        """Clave de cache (path, size, mtime), o None si no se puede hacer stat"""
+        if VideoProcessor.is_remote(video_path):
+            # La URL prefirmada es única dentro de la tarea
+            return (video_path, 0, 0.0)
+        try:
+            stat = os.stat(video_path)
+        except OSError:
+            return None
+        return (os.path.abspath(video_path), stat.st_size, stat.st_mtime)
+
+    def _remember_info(self, video_path: str, info: Dict) -> None:
+        """Registra info de un video en el cache de probe"""
+        key = self._probe_key(video_path)
+        if key:
+            self._probe_cache[key] = info
 
     def get_video_info(self, video_path: str) -> Dict:
         """
         Obtiene información del video usando ffprobe
 
+        El resultado se cachea por (path, size, mtime): un mismo archivo no se
+        vuelve a probar dentro de la tarea, y los encodes registran sus stats
+        de salida directamente (ver run_with_progress).
+
         Args:
             video_path: Ruta del video
 
@@ -54,9 +100,20 @@ class VideoProcessor:
             FileNotFoundError: Si el archivo no existe
             VideoProcessingError: Si no se puede leer el video
         """
-        if not os.path.exists(video_path):
+        if not self.is_remote(video_path) and not os.path.exists(video_path):
             raise FileNotFoundError(f"Video no encontrado: {video_path}")
 
+        key = self._probe_key(video_path)
+        if key in self._probe_cache:
+            return dict(self._probe_cache[key])
+
+        info = self._probe(video_path)
+        if key:
+            self._probe_cache[key] = info
+        return dict(info)
+
+    def _probe(self, video_path: str) -> Dict:
+        """Ejecuta ffprobe y extrae la info del stream de video"""
         try:
             probe = ffmpeg.probe(video_path)
             video_info = next(
@@ -96,6 +153,120 @@ class VideoProcessor:
             logger.error(f"❌ Error inesperado: {e}")
             raise VideoProcessingError(f"Error procesando video info: {e}")
 
+    @staticmethod
+    def _parse_progress(output: bytes) -> Dict[str, str]:
+        """Parsea la salida key=value de -progress (los últimos valores prevalecen)"""
+        progress = {}
+        for line in (output or b"").decode(errors="ignore").splitlines():
+            key, sep, value = line.partition("=")
+            if sep:
+                progress[key.strip()] = value.strip()
+        return progress
+
+    def run_with_progress(self, stream, output_path: str, codec: Optional[str] = None) -> Optional[Dict]:
+        """
+        Ejecuta FFmpeg con -progress y obtiene las stats del archivo de salida
+
+        Evita un ffprobe posterior al encode: duración y frames salen del
+        reporte de progreso, resolución y codec del propio grafo, y el tamaño
+        de un stat del archivo. Las stats quedan en el cache de probe.
+
+        Args:
+            stream: Stream de ffmpeg con el output ya definido
+            output_path: Ruta del archivo de salida
+            codec: Codec de salida (usa el del encoder si no se especifica)
+
+        Returns:
+            Diccionario con el mismo formato que get_video_info, o None si
+            FFmpeg no reportó progreso completo
+
+        Raises:
+            ffmpeg.Error: Si FFmpeg falla
+        """
+        stream = stream.global_args("-progress", "pipe:1", "-nostats")
+        result = ffmpeg.run(stream, overwrite_output=True, quiet=True)
+        stdout = result[0] if isinstance(result, tuple) else b""
+
+        progress = self._parse_progress(stdout)
+        if progress.get("progress") != "end":
+            return None
+
+        try:
+            info = self._output_info(progress, os.path.getsize(output_path), codec)
+        except (ValueError, OSError):
+            return None
+
+        self._remember_info(output_path, info)
+        return info
+
+    def _output_info(self, progress: Dict[str, str], size_bytes: int, codec: Optional[str] = None) -> Dict:
+        """Arma la info de salida (formato get_video_info) desde el reporte de -progress"""
+        duration = float(progress.get("out_time_us", 0)) / 1_000_000
+        frames = int(progress.get("frame", 0))
+        codec_name = codec or self.codec
+        return {
+            "duration": duration,
+            "width": self.width,
+            "height": self.height,
+            "codec": {"libx264": "h264", "libx265": "hevc"}.get(codec_name, codec_name),
+            "fps": frames / duration if duration else 0.0,
+            "size_bytes": size_bytes,
+        }
+
+    def run_to_sink(self, stream, output_path: str, sink, codec: Optional[str] = None) -> Dict:
+        """
+        Ejecuta FFmpeg escribiendo la salida a stdout y la pasa a sink.write()
+
+        Permite subir el resultado mientras se codifica (p.ej. multipart a S3).
+        El stream debe tener como output "pipe:1" en un formato que no requiera
+        seek (MP4 fragmentado). El progreso se lee de stderr en un thread para
+        que ningún pipe se llene y bloquee a FFmpeg.
+
+        Args:
+            stream: Stream de ffmpeg con output "pipe:1"
+            output_path: Ubicación final (clave para el cache de probe, p.ej. s3://...)
+            sink: Objeto con write(bytes)
+            codec: Codec de salida (usa el del encoder si no se especifica)
+
+        Returns:
+            Diccionario con el mismo formato que get_video_info
+
+        Raises:
+            ffmpeg.Error: Si FFmpeg falla
+        """
+        stream = stream.global_args("-progress", "pipe:2", "-nostats", "-loglevel", "error")
+        process = ffmpeg.run_async(stream, pipe_stdout=True, pipe_stderr=True, overwrite_output=True)
+
+        stderr_chunks = []
+        reader = threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True)
+        reader.start()
+
+        bytes_written = 0
+        try:
+            for chunk in iter(lambda: process.stdout.read(1024 * 1024), b""):
+                sink.write(chunk)
+                bytes_written += len(chunk)
+        except Exception:
+            process.kill()
+            raise
+        finally:
+            process.wait()
+            reader.join()
+
+        stderr = b"".join(stderr_chunks)
+        if process.returncode != 0:
+            raise ffmpeg.Error("ffmpeg", b"", stderr)
+
+        progress = self._parse_progress(stderr)
+        try:
+            info = self._output_info(progress, bytes_written, codec)
+        except ValueError:
+            info = self._output_info({}, bytes_written, codec)
+
+        # Sin archivo local: se registra bajo la ubicación final para validate_video/métricas
+        self._remember_info(output_path, info)
+        return info
+
     def process_video(
         self,
         input_path: str,
@@ -128,7 +299,7 @@ class VideoProcessor:
             VideoProcessingError: Si falla el procesamiento
         """
         # Validar archivo de entrada antes del try
-        if not os.path.exists(input_path):
+        if not self.is_remote(input_path) and not os.path.exists(input_path):
             raise FileNotFoundError(f"Video de entrada no encontrado: {input_path}")
 
         try:
@@ -143,49 +314,27 @@ class VideoProcessor:
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
             # ===== CONSTRUIR PIPELINE DE PROCESAMIENTO OPTIMIZADO =====
-            # Optimización: ss=0 + t=30 + accurate_seek = solo lee primeros 30s del archivo
-            # Crítico para videos largos (1-2 horas): evita decodificar todo el video
-            stream = ffmpeg.input(
-                input_path,
-                ss=0,  # Desde el inicio
-                t=self.max_duration,  # Solo 30 segundos
-                accurate_seek=None  # Seek preciso y eficiente
-            )
+            stream = self._trimmed_input(input_path)
             stream = stream.filter("scale", self.width, self.height)
             stream = stream.filter("setsar", 1)
 
             if add_logo:
-                logo_file = logo_path or config.LOGO_PATH
-                if os.path.exists(logo_file):
-                    logo = ffmpeg.input(logo_file)
-                    position = self._get_logo_position()
-                    stream = stream.overlay(logo, x=position[0], y=position[1])
-                    logger.debug(f"✅ Logo agregado en posición: {config.LOGO_POSITION}")
-                else:
-                    logger.warning(f"⚠️ Logo no encontrado: {logo_file}, se omite")
+                stream = self._apply_logo(stream, logo_path or config.LOGO_PATH)
 
             # Output con configuración optimizada
             stream = ffmpeg.output(
                 stream,
                 output_path,
-                vcodec=self.codec,
-                preset=self.preset,
-                crf=self.crf,
-                tune=self.tune,  # Optimización para contenido de video (film)
-                threads=1,  # 1 thread por worker (concurrency=2, 2 CPUs total)
+                **self.encode_options(),  # Igual a cortinillas cacheadas
+                **self._thread_options(),  # Threads según cores y tareas activas
                 format="mp4",
                 an=None,  # Elimina el audio
                 movflags="+faststart",  # Optimizado para streaming web
-                pix_fmt="yuv420p",  # Máxima compatibilidad
             )
 
             # Ejecutar FFmpeg (silencioso, solo muestra errores)
             try:
-                ffmpeg.run(
-                    stream,
-                    overwrite_output=True,
-                    quiet=True  # Silenciar output normal de FFmpeg
-                )
+                processed_info = self.run_with_progress(stream, output_path)
             except ffmpeg.Error as e:
                 # Solo mostrar error si falla, limitado a primeros 500 caracteres
                 error_output = e.stderr.decode()[:500] if hasattr(e, 'stderr') and e.stderr else str(e)
@@ -198,13 +347,13 @@ class VideoProcessor:
                     f"No se generó el video procesado: {output_path}"
                 )
 
-            # Obtener info del video procesado
-            processed_info = self.get_video_info(output_path)
-            logger.debug(
-                f"✅ Video procesado: {processed_info['duration']:.2f}s, "
-                f"{processed_info['width']}x{processed_info['height']}, "
-                f"{processed_info['size_bytes'] / (1024 * 1024):.2f}MB"
-            )
+            # Stats del video procesado (reportadas por el encode, sin ffprobe)
+            if processed_info:
+                logger.debug(
+                    f"✅ Video procesado: {processed_info['duration']:.2f}s, "
+                    f"{processed_info['width']}x{processed_info['height']}, "
+                    f"{processed_info['size_bytes'] / (1024 * 1024):.2f}MB"
+                )
 
             return output_path
 
@@ -216,6 +365,116 @@ class VideoProcessor:
             logger.error(f"❌ Error procesando video: {e}")
             raise VideoProcessingError(f"Error en procesamiento: {e}")
 
+    def encode_options(self) -> Dict:
+        """
+        Parámetros del encode de salida compartidos por todos los segmentos
+
+        Las cortinillas cacheadas se codifican con estos mismos valores para que
+        la concatenación con -c copy sea válida: frame rate, timebase, formato de
+        pixel, perfil y nivel deben coincidir entre el video principal y ellas.
+
+        Returns:
+            kwargs para ffmpeg.output
+        """
+        options = {
+            "vcodec": self.codec,
+            "preset": self.preset,
+            "crf": self.crf,
+            "tune": self.tune,  # Optimización para contenido de video (film)
+            "r": self.fps,  # Frame rate constante
+            "pix_fmt": self.pix_fmt,
+            "video_track_timescale": config.VIDEO_TRACK_TIMESCALE,
+        }
+        if self.codec == "libx264":
+            options["profile:v"] = self.profile
+            options["level"] = self.level
+        return options
+
+    def _trimmed_input(self, input_path: str):
+        """
+        Input de FFmpeg limitado a los primeros max_duration segundos
+
+        Optimización: ss=0 + t=30 + accurate_seek = solo lee primeros 30s del archivo.
+        Crítico para videos largos (1-2 horas): evita decodificar todo el video.
+        Con una URL (S3 prefirmada) FFmpeg lee por HTTP Range: solo descarga el
+        moov y los bytes de esos 30s, sin copia local del original.
+        """
+        options = {}
+        if self.is_remote(input_path):
+            # Reintentar conexiones HTTP cortadas en vez de fallar la tarea
+            options = {"reconnect": 1, "reconnect_streamed": 1, "reconnect_delay_max": 5}
+
+        return ffmpeg.input(
+            input_path,
+            ss=0,  # Desde el inicio
+            t=self.max_duration,  # Solo 30 segundos
+            accurate_seek=None,  # Seek preciso y eficiente
+            **options
+        )
+
+    def _thread_options(self) -> Dict:
+        """
+        Opciones de threads para el output de FFmpeg
+
+        Con FFMPEG_ADAPTIVE_THREADS reparte los cores detectados entre las
+        tareas activas del nodo: una tarea sola usa todos los cores y un nodo
+        saturado baja a 1 thread por tarea sin sobre-suscribir.
+
+        Returns:
+            kwargs para ffmpeg.output (threads, filter_complex_threads, x264-params)
+        """
+        if not config.FFMPEG_ADAPTIVE_THREADS:
+            return {"threads": 1}
+
+        allocation = thread_scheduler.allocate()
+        options = {
+            "threads": allocation["threads"],
+            # ffmpeg-python siempre genera -filter_complex (opción global, válida en cualquier posición)
+            "filter_complex_threads": allocation["filter_threads"],
+        }
+        if self.codec == "libx264":
+            options["x264-params"] = f"lookahead-threads={allocation['lookahead_threads']}"
+
+        logger.debug(f"🧵 Threads FFmpeg: {allocation}")
+        return options
+
+    def _apply_logo(self, stream, logo_file: str):
+        """
+        Agrega el logo al stream con overlay
+
+        Usa el logo pre-rasterizado (RGBA premultiplicado) del cache si está
+        habilitado; si no, o si el cache falla, usa el PNG original.
+
+        Args:
+            stream: Stream de video ya escalado a la resolución de salida
+            logo_file: Ruta del PNG del logo
+
+        Returns:
+            Stream con el logo (o el mismo stream si el logo no existe)
+        """
+        if not os.path.exists(logo_file):
+            logger.warning(f"⚠️ Logo no encontrado: {logo_file}, se omite")
+            return stream
+
+        if config.LOGO_CACHE_ENABLED:
+            try:
+                prepared = logo_cache.get(logo_file, self.width, self.height)
+                logo = ffmpeg.input(
+                    prepared.path,
+                    format="rawvideo",
+                    pix_fmt="rgba",
+                    s=f"{prepared.width}x{prepared.height}",
+                )
+                logger.debug(f"✅ Logo (cache) agregado en posición: {config.LOGO_POSITION}")
+                return stream.overlay(logo, x=prepared.x, y=prepared.y, alpha="premultiplied")
+            except Exception as e:
+                logger.warning(f"⚠️ Cache de logo no disponible, se usa el PNG: {e}")
+
+        logo = ffmpeg.input(logo_file)
+        position = self._get_logo_position()
+        logger.debug(f"✅ Logo agregado en posición: {config.LOGO_POSITION}")
+        return stream.overlay(logo, x=position[0], y=position[1])
+
     def _get_logo_position(self) -> Tuple[str, str]:
         """
         Calcula la posición del logo según configuración
@@ -288,21 +547,13 @@ class VideoProcessor:
                 output = ffmpeg.output(
                     joined,
                     output_path,
-                    vcodec=self.codec,
-                    preset=self.preset,
-                    crf=self.crf,
-                    tune=self.tune,
-                    threads=1,
+                    **self.encode_options(),
+                    **self._thread_options(),
                     movflags="+faststart",
-                    pix_fmt="yuv420p",
                 )
                 # Ejecutar FFmpeg para concatenación (silencioso)
                 try:
-                    ffmpeg.run(
-                        output,
-                        overwrite_output=True,
-                        quiet=True  # Silenciar output de FFmpeg
-                    )
+                    self.run_with_progress(output, output_path)
                 except ffmpeg.Error as e:
                     error_output = e.stderr.decode()[:500] if hasattr(e, 'stderr') and e.stderr else str(e)
                     logger.error(f"❌ FFmpeg falló en cortinillas: {error_output}")
@@ -319,6 +570,140 @@ class VideoProcessor:
             logger.error(f"❌ Error agregando cortinillas: {e}")
             raise VideoProcessingError(f"Error en cortinillas: {e}")
 
+    def process_video_single_pass(
+        self,
+        input_path: str,
+        output_path: str,
+        add_logo: bool = True,
+        logo_path: Optional[str] = None,
+        intro_path: Optional[str] = None,
+        outro_path: Optional[str] = None,
+        sink=None,
+        include_bumpers: bool = True,
+    ) -> str:
+        """
+        Procesa el video y agrega cortinillas en una sola pasada de FFmpeg
+
+        Construye un único filter graph (trim + scale + setsar + overlay + concat)
+        de forma que cada video requiere un solo encode libx264 en lugar de dos
+        (process_video + add_intro_outro), sin archivo intermedio en disco.
+        Con include_bumpers=False solo se codifica el video principal (las
+        cortinillas cacheadas se concatenan después con -c copy).
+
+        Args:
+            input_path: Ruta del video original
+            output_path: Ruta donde guardar el video final
+            add_logo: Si agregar logo ANB
+            logo_path: Ruta del logo (usa config si no se especifica)
+            intro_path: Video de intro (usa config si no se especifica)
+            outro_path: Video de outro (usa config si no se especifica)
+            sink: Si se especifica (objeto con write(bytes)), la salida se escribe
+                como MP4 fragmentado a sink mientras se codifica y output_path
+                solo identifica la ubicación final (p.ej. s3://bucket/key)
+            include_bumpers: Si incluir intro/outro en el grafo de encode
+
+        Returns:
+            Ruta del video procesado
+
+        Raises:
+            FileNotFoundError: Si el archivo de entrada no existe
+            VideoProcessingError: Si falla el procesamiento
+        """
+        if not self.is_remote(input_path) and not os.path.exists(input_path):
+            raise FileNotFoundError(f"Video de entrada no encontrado: {input_path}")
+
+        try:
+            info = self.get_video_info(input_path)
+            logger.debug(
+                f"📹 Video original: {info['duration']:.2f}s, "
+                f"{info['width']}x{info['height']}, "
+                f"{info['size_bytes'] / (1024 * 1024):.2f}MB"
+            )
+
+            if sink is None:
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+            # ===== VIDEO PRINCIPAL: recorte + escala + logo =====
+            main = self._trimmed_input(input_path)
+            main = main.filter("scale", self.width, self.height)
+            main = main.filter("setsar", 1)
+
+            if add_logo:
+                main = self._apply_logo(main, logo_path or config.LOGO_PATH)
+
+            # ===== CORTINILLAS: misma resolución/SAR que el principal (requisito de concat) =====
+            segments = []
+
+            intro_file = intro_path or config.INTRO_VIDEO_PATH
+            if include_bumpers and os.path.exists(intro_file):
+                segments.append(self._bumper_stream(intro_file, config.MAX_INTRO_DURATION))
+                logger.debug(f"📽️ Intro agregado: {intro_file}")
+
+            segments.append(main)
+
+            outro_file = outro_path or config.OUTRO_VIDEO_PATH
+            if include_bumpers and os.path.exists(outro_file):
+                segments.append(self._bumper_stream(outro_file, config.MAX_OUTRO_DURATION))
+                logger.debug(f"📽️ Outro agregado: {outro_file}")
+
+            if len(segments) > 1:
+                stream = ffmpeg.concat(*segments, v=1, a=0)
+            else:
+                stream = main
+
+            # Un solo encode para todo el grafo
+            # Con sink: MP4 fragmentado a stdout (moov vacío al inicio, reproducible
+            # progresivamente como con faststart; un pipe no admite el seek de faststart)
+            stream = ffmpeg.output(
+                stream,
+                "pipe:1" if sink is not None else output_path,
+                **self.encode_options(),
+                **self._thread_options(),
+                format="mp4",
+                an=None,
+                movflags=FRAGMENTED_MOVFLAGS if sink is not None else "+faststart",
+            )
+
+            try:
+                if sink is not None:
+                    self.run_to_sink(stream, output_path, sink)
+                else:
+                    self.run_with_progress(stream, output_path)
+            except ffmpeg.Error as e:
+                error_output = e.stderr.decode()[:500] if hasattr(e, 'stderr') and e.stderr else str(e)
+                logger.error(f"❌ FFmpeg falló (single-pass): {error_output}")
+                raise VideoProcessingError(f"Error en FFmpeg: {error_output}")
+
+            if sink is None and not os.path.exists(output_path):
+                raise VideoProcessingError(
+                    f"No se generó el video procesado: {output_path}"
+                )
+
+            logger.debug(f"✅ Video procesado en una pasada ({len(segments)} segmentos)")
+            return output_path
+
+        except VideoProcessingError:
+            raise
+
+        except Exception as e:
+            logger.error(f"❌ Error procesando video (single-pass): {e}")
+            raise VideoProcessingError(f"Error en procesamiento: {e}")
+
+    def _bumper_stream(self, path: str, max_duration: float):
+        """
+        Stream de cortinilla normalizado a la resolución de salida
+
+        Args:
+            path: Ruta del video de intro/outro
+            max_duration: Duración máxima en segundos
+
+        Returns:
+            Stream de ffmpeg listo para concat
+        """
+        stream = ffmpeg.input(path, t=max_duration)
+        stream = stream.filter("scale", self.width, self.height)
+        return stream.filter("setsar", 1)
+
     def validate_video(self, video_path: str) -> bool:
         """
         Valida que el video procesado cumple con los requisitos
@@ -343,7 +728,7 @@ class VideoProcessor:
                     info["height"] == self.height,
                     f"Alto {info['height']} != {self.height}",
                 ),
-                (os.path.exists(video_path), "Archivo no existe"),
+                (self.is_remote(video_path) or os.path.exists(video_path), "Archivo no existe"),
             ]
 
             all_valid = True